@@ -1,3 +1,6 @@
+import time
+_import_started = time.perf_counter()
+
 from flask import Flask, request
 from flask_sqlalchemy import SQLAlchemy
 from flask_smorest import Api
@@ -14,9 +17,13 @@ db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
 
-def create_app():
+def create_app(config=None):
+    """config: settings applied over Config before any extension reads them (e.g. a benchmark database)."""
+    started = time.perf_counter()
     app = Flask(__name__)
     app.config.from_object(Config)
+    if config:
+        app.config.update(config)
     db.init_app(app)
     app.config['API_TITLE'] = 'AI Productivity Assistant API'
     app.config['API_VERSION'] = 'v1'
@@ -31,10 +38,27 @@ def create_app():
     app.config['JWT_SECRET_KEY'] = app.config['SECRET_KEY'] 
     app.config['JWT_TOKEN_LOCATION'] = ['headers']
 
-    CORS(app, resources={r"/*": {"origins": ["http://localhost:5173"]}}, supports_credentials=True, methods=["GET", "POST", "PATCH", "OPTIONS"])
+    CORS(app, resources={r"/*": {"origins": ["http://localhost:5173"]}}, supports_credentials=True, methods=["GET", "POST", "PATCH", "OPTIONS"], expose_headers=["X-Next-Cursor", "X-Next-Page", "ETag"])
     migrate.init_app(app, db)
     jwt.init_app(app)
 
+    @jwt.token_verification_loader
+    def stream_tokens_only_open_the_stream(jwt_header, jwt_data):
+        return jwt_data.get("scope") != "stream" or request.endpoint == "tasks.TaskStream"
+
+    from app.utils.suggestion_queue import suggestion_queue
+    suggestion_queue.init_app(app)
+    from app.utils.reprioritize import reprioritizer
+    reprioritizer.init_app(app)
+    from app.utils.events import event_hub
+    event_hub.init_app(app)
+    from app.utils.metrics import metrics
+    metrics.init_app(app)
+    from app.utils.profiler import profiler
+    profiler.init_app(app)
+    from app.utils.nlp_workers import nlp_pool
+    nlp_pool.init_app(app)
+
     @app.after_request
     def after_request(response):
         # Remove manual addition of Access-Control-Allow-Origin to avoid duplicates
@@ -68,5 +92,19 @@ def create_app():
     api.register_blueprint(TaskBlueprint)
     api.register_blueprint(AnalyticsDashboardBlueprint)
 
+    from app.commands import register_commands
+    register_commands(app)
+
+    # Preload the lazily imported NLP/ML dependencies, e.g. before a pre-forking
+    # server (gunicorn --preload) forks, so workers share them copy-on-write
+    app.config.setdefault('WARMUP_MODELS', False)
+    app.config.setdefault('WARMUP_GC_FREEZE', False)
+    from app.utils.lazy import load_report, warmup
+    report = warmup(freeze=app.config['WARMUP_GC_FREEZE']) if app.config['WARMUP_MODELS'] else load_report()
+    report['create_app_seconds'] = round(time.perf_counter() - started, 3)
+    report['seconds_since_import'] = round(time.perf_counter() - _import_started, 3)
+    app.extensions['startup_report'] = report
+    app.logger.info("Startup: %s", report)
+
     return app
 __all__ = ['create_app', 'db']  
\ No newline at end of file
@@ -0,0 +1,61 @@
+import click
+from flask.cli import AppGroup
+
+recommendations_cli = AppGroup("recommendations", help="Maintain the task co-occurrence index.")
+analytics_cli = AppGroup("analytics", help="Maintain the analytics rollups.")
+tasks_cli = AppGroup("tasks", help="Maintenance jobs over stored tasks.")
+
+
+@recommendations_cli.command("rebuild")
+def rebuild_recommendations():
+    """Rebuild task_title_index from every user's tasks (cold start / repair)."""
+    from app.utils.recommendation_engine import rebuild_index
+
+    cells = rebuild_index()
+    click.echo(f"Indexed {cells} user/title pairs.")
+
+
+@recommendations_cli.command("embed")
+def embed_titles():
+    """Embed every distinct task title into the embedding index (EMBEDDING_INDEX_DIR)."""
+    from app.utils.embedding_index import embed_all_titles
+
+    rows = embed_all_titles()
+    click.echo(f"Embedding index holds {rows} titles.")
+
+
+@analytics_cli.command("backfill")
+def backfill_analytics():
+    """Recompute task_daily_rollup from every task."""
+    from app.utils.analytics_rollup import backfill
+
+    rows = backfill()
+    click.echo(f"Wrote {rows} daily rollup rows.")
+
+
+@tasks_cli.command("reprioritize")
+@click.option("--chunk-size", default=100000, show_default=True, help="Open tasks loaded per pass.")
+def reprioritize_tasks(chunk_size):
+    """Recompute priority and urgency of open tasks from their due dates."""
+    from app.utils.reprioritize import reprioritize
+
+    stats = reprioritize(chunk_size)
+    click.echo(
+        f"Scanned {stats['open_tasks']} open tasks, updated {stats['updated']} "
+        f"({stats['sentiments_computed']} sentiments computed) in {stats['seconds']}s."
+    )
+
+
+@tasks_cli.command("reindex-search")
+def reindex_search():
+    """Create (if missing) and rebuild the SQLite full-text index over task titles."""
+    from app.utils.task_search import rebuild_index
+
+    rows = rebuild_index()
+    click.echo(f"Indexed {rows} task titles for search.")
+
+
+def register_commands(app):
+    app.cli.add_command(recommendations_cli)
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(tasks_cli)
@@ -11,6 +11,13 @@ from app import db
 from datetime import datetime
 
 class Task(db.Model):
+    __table_args__ = (
+        # Back the filters and keyset sort orders of GET /tasks/
+        db.Index('ix_task_user_id_status', 'user_id', 'status'),
+        db.Index('ix_task_user_id_due_date', 'user_id', 'due_date'),
+        db.Index('ix_task_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     due_date = db.Column(db.DateTime, nullable=True)
@@ -18,9 +25,12 @@ class Task(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime, nullable=True)  # Nullable for pending tasks
     priority = db.Column(db.Integer, default= 0)
-    suggestions = db.Column(db.PickleType, nullable=True)  # Store suggestions as a list
+    sentiment = db.Column(db.Float, nullable=True)  # Title polarity, cached for the reprioritize job
+    # JSON lists, deferred so list/analytics queries only load them when they are dumped
+    suggestions = db.deferred(db.Column(db.JSON, nullable=True), group='suggestions')
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # Foreign key to User
-    complimentary_tasks = db.Column(db.PickleType, nullable=True)  # Store complimentary tasks as a list
+    complimentary_tasks = db.deferred(db.Column(db.JSON, nullable=True), group='suggestions')
+    suggestions_status = db.Column(db.String(20), default='ready')  # 'pending' while the background queue fills them in
     
     def __repr__(self):
         return f'<Task {self.title}>'
@@ -37,11 +47,35 @@ class Task(db.Model):
             "priority": self.priority,
         }
 
+class TaskTitleIndex(db.Model):
+    """One non-zero cell of the sparse user x title co-occurrence matrix."""
+    __tablename__ = 'task_title_index'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    title_key = db.Column(db.String(100), primary_key=True, index=True)  # Normalized title
+    title = db.Column(db.String(100), nullable=False)  # Title as first written, for display
+    task_count = db.Column(db.Integer, nullable=False, default=1)
+
+    def __repr__(self):
+        return f'<TaskTitleIndex {self.user_id}:{self.title_key}>'
+
+class TaskDailyRollup(db.Model):
+    """Per-user, per-day task counters backing the analytics charts."""
+    __tablename__ = 'task_daily_rollup'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    created = db.Column(db.Integer, nullable=False, default=0)  # Tasks created that day
+    completed = db.Column(db.Integer, nullable=False, default=0)  # Tasks completed that day
+    overdue = db.Column(db.Integer, nullable=False, default=0)  # Tasks due that day and not completed on time
+
+    def __repr__(self):
+        return f'<TaskDailyRollup {self.user_id}:{self.day}>'
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(50), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Bumped on every write to the user's tasks
     
     tasks = db.relationship('Task', backref='user', lazy=True) # One-to-many relationship with Task
     
@@ -3,15 +3,51 @@ from flask_smorest import Blueprint, abort
 from flask import request, jsonify
 from app.models import Task, User
 from app import db
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, time
+from sqlalchemy import and_, case, func, or_
+from app.schemas import AnalyticsOverviewQuerySchema, AnalyticsSeriesQuerySchema
+from app.utils.analytics_rollup import series
+from app.utils.pagination import keyset_page, InvalidCursor
+from app.utils.response_cache import cached_response, time_bucket
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
+MAX_SERIES_DAYS = 3660  # Checked after start/end defaults are filled in
+OVERVIEW_CACHE_SECONDS = 60  # Longest an overview may lag the clock while the user's data is unchanged
+
 blp = Blueprint("AnalyticsDashboard", "analytics_dashboard", url_prefix='/analytics', description="Operations on analytics dashboard")
 
+@blp.route("/")
+class AnalyticsSeries(MethodView):
+    @jwt_required()
+    @blp.arguments(AnalyticsSeriesQuerySchema, location="query")
+    def get(self, args):
+        """Created/completed/overdue counts per day, week or month, served from the daily rollups"""
+        user_id = get_jwt_identity()
+        if not user_id:
+            abort(401, message="User not authenticated.")
+
+        end = args.get("end") or datetime.utcnow().date()
+        start = args.get("start") or end - timedelta(days=29)
+        if start > end:
+            abort(400, message="start must not be after end.")
+        if (end - start).days > MAX_SERIES_DAYS:
+            abort(400, message="Range is limited to 10 years.")
+        buckets = series(user_id, start, end, args["granularity"])
+        totals = {field: sum(bucket[field] for bucket in buckets) for field in ("created", "completed", "overdue")}
+        return jsonify({
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "granularity": args["granularity"],
+            "buckets": buckets,
+            "totals": totals,
+        }), 200
+
 @blp.route("/overview")
 class AnalyticsDashboard(MethodView):
     @jwt_required()
-    def get(self):
+    @cached_response(vary=time_bucket(OVERVIEW_CACHE_SECONDS))  # overdue and the 7-day window move with the clock
+    @blp.arguments(AnalyticsOverviewQuerySchema, location="query")
+    def get(self, args):
         user_id = get_jwt_identity()
         if not user_id:
             abort(401, message="User not authenticated.")
@@ -24,32 +60,32 @@ class AnalyticsDashboard(MethodView):
             user_id = get_jwt_identity()
             user = User.query.get(user_id)
         
-        tasks = Task.query.filter_by(user_id=user_id).all()
-        if not tasks:
+        # Counts and the 7-day distribution in one aggregate query, no ORM rows loaded
+        now = datetime.utcnow()
+        today = now.date()
+        day_starts = [datetime.combine(today - timedelta(days=i), time.min) for i in range(6, -2, -1)]
+        not_completed = or_(Task.status.is_(None), Task.status != 'completed')
+        columns = [
+            func.count(Task.id),
+            func.sum(case((Task.status == 'completed', 1), else_=0)),
+            func.sum(case((and_(Task.due_date < now, not_completed), 1), else_=0)),
+        ] + [
+            func.sum(case((and_(Task.created_at >= start, Task.created_at < end), 1), else_=0))
+            for start, end in zip(day_starts, day_starts[1:])
+        ]
+        total_tasks, completed_tasks, overdue_tasks, *daily = db.session.query(*columns).filter(
+            Task.user_id == user_id
+        ).one()
+        if not total_tasks:
             return jsonify({"message": "No tasks found for this user."}), 404
-        
+
         # Calculate task statistics
-        total_tasks = len(tasks)
-        completed_tasks = sum(1 for task in tasks if task.status == 'completed')
+        completed_tasks = completed_tasks or 0
         pending_tasks = total_tasks - completed_tasks
-        overdue_tasks = sum(1 for task in tasks if task.due_date and task.due_date < datetime.utcnow() and task.status != 'completed')
-        today = datetime.utcnow().date()
-        past_7_days = today - timedelta(days=6)
-
-        last_week_tasks = Task.query.filter(
-            Task.user_id == user_id,
-            Task.created_at >= past_7_days
-        ).all()
-
         day_counts = {}
-        for i in range(7):
-            date = today - timedelta(days=i)
-            day_counts[date.strftime("%Y-%m-%d")] = 0
+        for start, count in reversed(list(zip(day_starts, daily))):
+            day_counts[start.strftime("%Y-%m-%d")] = count or 0
 
-        for task in last_week_tasks:
-            day = task.created_at.date().strftime("%Y-%m-%d")
-            if day in day_counts:
-                day_counts[day] += 1
         # Prepare the response data
         response_data = {
             "username": user.username if user else "Unknown User",
@@ -58,9 +94,26 @@ class AnalyticsDashboard(MethodView):
             "total_tasks": total_tasks,
             "completed_tasks": completed_tasks,
             "pending_tasks": pending_tasks,
-            "overdue_tasks": overdue_tasks,
+            "overdue_tasks": overdue_tasks or 0,
             "weekly_task_distribution": day_counts,
-            "tasks": [task.to_dict() for task in tasks]
         }
+
+        # The full task list is opt-in and paginated, newest first; pass X-Next-Cursor back as `after`
+        headers = {}
+        if args["include_tasks"]:
+            try:
+                tasks, next_cursor = keyset_page(
+                    Task.query.filter_by(user_id=user_id), Task, "created_at", "desc", args["limit"], args.get("after")
+                )
+            except InvalidCursor as e:
+                abort(400, message=str(e))
+            response_data["tasks"] = [task.to_dict() for task in tasks]
+            response_data["tasks_pagination"] = {
+                "limit": args["limit"],
+                "total": total_tasks,
+                "next_cursor": next_cursor,
+            }
+            if next_cursor:
+                headers["X-Next-Cursor"] = next_cursor
         
-        return jsonify(response_data), 200
\ No newline at end of file
+        return jsonify(response_data), 200, headers
@@ -27,16 +27,15 @@ headers = {
     "Authorization": f"Bearer {JWT_TOKEN}",
     "content-type": "application/json"
 }
-URL = "http://localhost:5000/tasks/"
+URL = "http://localhost:5000/tasks/bulk"
 
-for title in tasks:
-    data = {
-        "title": title,
-        "status": "pending"
-    }
-    
-    response = requests.post(URL, json=data, headers=headers)
-    print(f"Task: {title}")
-    print("Status:", response.status_code)
-    print("Response:", response.json())
+# One request for the whole list: the server parses the titles as a batch,
+# fetches suggestions concurrently and commits everything in one transaction.
+response = requests.post(URL, json=[{"title": title, "status": "pending"} for title in tasks], headers=headers)
+print("Status:", response.status_code)
+body = response.json()
+for result in body.get("results", []):
+    print(f"Task: {tasks[result['index']]}")
+    print("Result:", result.get("task") or result.get("errors"))
     print("------")
+print(f"Created {body.get('created', 0)}, failed {body.get('failed', 0)}")
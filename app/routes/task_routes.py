@@ -1,31 +1,94 @@
+import json
+from flask import Response, current_app, jsonify, request, stream_with_context
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
 from sqlalchemy.exc import SQLAlchemyError
 from app.models import db, Task, User
-from app.schemas import TaskSchema, TaskCreateSchema, TaskUpdateSchema
-from app.utils.nlp_parser import parse_user_input
+from app.schemas import (
+    TaskSchema, TaskCreateSchema, TaskUpdateSchema, TaskSuggestionsSchema,
+    TaskRecommendationQuerySchema, TaskRecommendationSchema, TaskListQuerySchema, TaskExportQuerySchema,
+    TaskSearchQuerySchema,
+)
+from app.utils.nlp_parser import parse_user_input, parse_user_inputs
+from app.utils.nlp_workers import NLPWorkerError
 from datetime import timedelta
-from app.utils.gemini_suggester import get_suggestions, task_suggestions
-from app.utils.local_suggester import get_local_suggestions
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, get_jwt, get_jwt_identity, get_jwt_request_location, jwt_required
 from app.utils.content_recommender import recommend_similar_tasks
-from app.utils.recommendation_engine import build_user_task_matrix, get_similar_tasks
+from app.utils.suggestion_queue import suggestion_queue, build_suggestions, build_suggestions_batch
+from app.utils.suggestion_cache import suggestion_cache
+from app.utils.gemini_suggester import client as gemini_client
+from app.utils import task_hooks
+from app.utils.events import event_hub
+from app.utils.metrics import span
+from app.utils.pagination import keyset_page, InvalidCursor
+from app.utils.response_cache import cached_response
+from app.utils.task_search import search_tasks
+from app.utils.task_transfer import export_csv, export_ndjson, import_tasks
 from datetime import datetime
+from marshmallow import ValidationError
 
 blp = Blueprint("tasks", "tasks", url_prefix="/tasks", description="Operations on tasks")
 
 
+def _new_task(user_id, task_data, parsed, suggestions, complimentary_tasks, suggestions_status):
+    """Build (but don't add) a Task from the request data and its parse_user_input result."""
+    due_date = parsed["due_date"]  # ISO format string if exists
+    # Convert ISO string to datetime object if due_date exists
+    if due_date:
+        due_date = datetime.fromisoformat(due_date)
+    status = task_data.get("status", "pending")
+    if due_date:
+        now = datetime.now()
+        if due_date - now <= timedelta(days=1):
+            status = "urgent"
+    created_at = task_data.get("created_at", datetime.now())
+    return Task(
+        title=parsed["cleaned_task"],
+        due_date=due_date,
+        status=status,
+        priority=parsed["priority"],
+        sentiment=parsed.get("sentiment"),
+        suggestions = suggestions,
+        complimentary_tasks = complimentary_tasks,
+        suggestions_status = suggestions_status,
+        created_at = created_at,
+        user_id = user_id
+    )
+
+
 @blp.route("/")
 class TasksList(MethodView):
     
     @jwt_required()
+    @cached_response
+    @blp.arguments(TaskListQuerySchema, location="query")
     @blp.response(200, TaskSchema(many=True))
-    def get(self):
-        """Get all tasks for the logged-in user"""
+    def get(self, args):
+        """
+        Get the logged-in user's tasks, one page at a time.
+        Pass the X-Next-Cursor response header back as `after` to get the next page.
+        Send the ETag back in If-None-Match to get a 304 while nothing has changed.
+        """
         user_id = get_jwt_identity()
         if not user_id:
             abort(401, message="User not authenticated.")
-        return Task.query.filter_by(user_id=user_id).all()
+        query = Task.query.filter_by(user_id=user_id).options(db.undefer_group("suggestions"))
+        if "status" in args:
+            query = query.filter(Task.status == args["status"])
+        if "priority" in args:
+            query = query.filter(Task.priority == args["priority"])
+        if "due_after" in args:
+            query = query.filter(Task.due_date >= args["due_after"])
+        if "due_before" in args:
+            query = query.filter(Task.due_date < args["due_before"])
+        try:
+            tasks, next_cursor = keyset_page(
+                query, Task, args["sort"], args["order"], args["limit"], args.get("after")
+            )
+        except InvalidCursor as e:
+            abort(400, message=str(e))
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return tasks, 200, headers
     
     @jwt_required()
     @blp.arguments(TaskCreateSchema)
@@ -33,89 +96,286 @@ class TasksList(MethodView):
     def post(self, task_data):
         user_id = get_jwt_identity()
         user_input = task_data.get("title")
-        print(f"Received user_input: '{user_input}'")  # Debug print to check input before parsing
         if not user_input:
             abort(400, message="Title is required.")
 
         # Use NLP parser to extract due date
-        parsed = parse_user_input(user_input)
-        print(f"parse_user_input output: {parsed}")  # Debug print to check due_date
+        try:
+            parsed = parse_user_input(user_input)
+        except NLPWorkerError as e:
+            abort(503, message=str(e))
         task_title = parsed["cleaned_task"]
-        due_date = parsed["due_date"]  # ISO format string if exists
-        priority = parsed["priority"]
-        
-        # Convert ISO string to datetime object if due_date exists
-        if due_date:
-            from datetime import datetime
-            due_date = datetime.fromisoformat(due_date)
-            
-        
-        # Get suggestions from OpenAI (Gemini)
-        suggestions = get_suggestions(task_title)
-        if not suggestions:
-            suggestions = get_local_suggestions(task_title)
         
         # ideal_task_suggestions = recommend_similar_tasks(user_id, task_title)
         # if not ideal_task_suggestions:
         #     ideal_task_suggestions = task_suggestions(task_title)    
-        complimentary_tasks = get_similar_tasks(user_id, task_title)
-        if not complimentary_tasks:
-            complimentary_tasks = task_suggestions(task_title)
-        status = task_data.get("status", "pending")
-        if due_date:
-            now = datetime.now()
-            if due_date - now <= timedelta(days=1):
-                status = "urgent"
-        created_at = task_data.get("created_at", datetime.now())
-        # Create Task object
-        new_task = Task(
-            title=task_title,
-            due_date=due_date,
-            status=status,
-            priority=priority,
-            suggestions = suggestions,
-            complimentary_tasks = complimentary_tasks,
-            created_at = created_at,
-            user_id = user_id
-        )
+        if suggestion_queue.enabled:
+            # Filled in by the background queue once the task is committed
+            suggestions, complimentary_tasks = None, None
+            suggestions_status = "pending"
+        else:
+            suggestions, complimentary_tasks = build_suggestions(user_id, task_title)
+            suggestions_status = "ready"
+        new_task = _new_task(user_id, task_data, parsed, suggestions, complimentary_tasks, suggestions_status)
          
         try:
-            db.session.add(new_task)
-            db.session.commit()
+            with span("commit"):
+                db.session.add(new_task)
+                task_hooks.task_created(new_task)
+                db.session.commit()
         except Exception as e:
             db.session.rollback()
             import traceback
             traceback.print_exc()
             abort(500, message=f"An error occurred while creating the task: {str(e)}")
+        if suggestions_status == "pending":
+            suggestion_queue.enqueue(new_task.id)
         # Ensure due_date is a datetime object before serialization
-        from datetime import datetime
         if new_task.due_date and isinstance(new_task.due_date, str):
             new_task.due_date = datetime.fromisoformat(new_task.due_date)
         
         return new_task, 201
 
-# @blp.route("/recommendations")
-# class TaskRecommendations(MethodView):
+@blp.route("/bulk")
+class TasksBulk(MethodView):
+
+    @jwt_required()
+    def post(self):
+        """
+        Create many tasks in one request.
+
+        The body is a JSON array or NDJSON (Content-Type: application/x-ndjson); each
+        item is a title string or an object shaped like the POST /tasks/ body.
+        Titles are parsed as one batch, identical LLM prompts are sent once and the
+        valid tasks are inserted in a single transaction. The response has one
+        result per item, in input order.
+        """
+        user_id = get_jwt_identity()
+        if not user_id:
+            abort(401, message="User not authenticated.")
+        items = _read_bulk_items()
+        max_tasks = current_app.config.get("BULK_MAX_TASKS", 1000)
+        if len(items) > max_tasks:
+            abort(413, message=f"At most {max_tasks} tasks per request.")
+
+        results = [None] * len(items)
+        accepted = []  # (index, task_data)
+        schema = TaskCreateSchema()
+        for index, item in enumerate(items):
+            if isinstance(item, str):
+                item = {"title": item}
+            try:
+                task_data = schema.load(item)
+            except ValidationError as e:
+                results[index] = {"index": index, "status": "error", "errors": e.messages}
+                continue
+            if not task_data["title"].strip():
+                results[index] = {"index": index, "status": "error", "errors": {"title": ["Title is required."]}}
+                continue
+            accepted.append((index, task_data))
+
+        try:
+            parsed = parse_user_inputs([task_data["title"] for _, task_data in accepted])
+        except NLPWorkerError as e:
+            abort(503, message=str(e))
+        titles = [p["cleaned_task"] for p in parsed]
+        if suggestion_queue.enabled:
+            built = [(None, None)] * len(accepted)
+            suggestions_status = "pending"
+        else:
+            built = build_suggestions_batch(
+                user_id, titles, current_app.config.get("BULK_SUGGESTION_CONCURRENCY", 8)
+            )
+            suggestions_status = "ready"
+
+        new_tasks = [
+            _new_task(user_id, task_data, p, suggestions, complimentary_tasks, suggestions_status)
+            for (_, task_data), p, (suggestions, complimentary_tasks) in zip(accepted, parsed, built)
+        ]
+        try:
+            with span("commit"):
+                db.session.add_all(new_tasks)
+                db.session.flush()  # One multi-row INSERT where the driver supports it
+                task_hooks.tasks_created(new_tasks)
+                db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            abort(500, message=f"An error occurred while creating the tasks: {str(e)}")
+
+        task_schema = TaskSchema()
+        for (index, _), task in zip(accepted, new_tasks):
+            if suggestions_status == "pending":
+                suggestion_queue.enqueue(task.id)
+            results[index] = {"index": index, "status": "created", "task": task_schema.dump(task)}
+        return jsonify({
+            "created": len(new_tasks),
+            "failed": len(items) - len(new_tasks),
+            "results": results,
+        }), 201 if new_tasks else 400
+
+
+def _read_bulk_items():
+    """The list of items in a bulk request body, or abort(400)."""
+    if request.mimetype == "application/x-ndjson":
+        items = []
+        for line_number, line in enumerate(request.get_data(as_text=True).splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                abort(400, message=f"Invalid JSON on line {line_number}.")
+        return items
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        abort(400, message="Expected a JSON array of tasks.")
+    return items
+
+
+@blp.route("/export")
+class TasksExport(MethodView):
+
+    @jwt_required()
+    @blp.arguments(TaskExportQuerySchema, location="query")
+    def get(self, args):
+        """Stream all of the user's tasks as NDJSON (default) or CSV"""
+        user_id = get_jwt_identity()
+        if not user_id:
+            abort(401, message="User not authenticated.")
+        if args["format"] == "csv":
+            rows, mimetype = export_csv(user_id), "text/csv"
+        else:
+            rows, mimetype = export_ndjson(user_id), "application/x-ndjson"
+        return Response(
+            stream_with_context(rows),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f"attachment; filename=tasks.{args['format']}"},
+        )
+
+
+@blp.route("/import")
+class TasksImport(MethodView):
+
+    @jwt_required()
+    def post(self):
+        """
+        Create tasks from an NDJSON or CSV upload (Content-Type text/csv), as produced by /tasks/export.
+        The body is read incrementally and committed IMPORT_BATCH_SIZE rows at a time.
+        """
+        user_id = get_jwt_identity()
+        if not user_id:
+            abort(401, message="User not authenticated.")
+        fmt = "csv" if request.mimetype == "text/csv" else "ndjson"
+        summary = import_tasks(
+            int(user_id), request.stream, fmt, current_app.config.get("IMPORT_BATCH_SIZE", 500)
+        )
+        return jsonify(summary), 201 if summary["imported"] else 400
+
+
+@blp.route("/search")
+class TaskSearch(MethodView):
+
+    @jwt_required()
+    @blp.arguments(TaskSearchQuerySchema, location="query")
+    @blp.response(200, TaskSchema(many=True))
+    def get(self, args):
+        """
+        Search the user's task titles, best match first; the last word also matches as a prefix.
+        X-Next-Page is set when there are more results.
+        """
+        user_id = get_jwt_identity()
+        if not user_id:
+            abort(401, message="User not authenticated.")
+        tasks, has_more = search_tasks(user_id, args["q"], args["page"], args["per_page"])
+        headers = {"X-Next-Page": str(args["page"] + 1)} if has_more else {}
+        return tasks, 200, headers
+
+
+@blp.route("/stream/token")
+class TaskStreamToken(MethodView):
+
+    @jwt_required()
+    def post(self):
+        """
+        A short-lived token for GET /tasks/stream?jwt=<token>, since EventSource can't
+        send an Authorization header. It opens the stream and nothing else; it is only
+        checked when the stream connects, so fetch a new one to reconnect after it expires.
+        """
+        user_id = get_jwt_identity()
+        if not user_id:
+            abort(401, message="User not authenticated.")
+        expires_in = current_app.config["SSE_TOKEN_EXPIRES"]
+        token = create_access_token(
+            identity=user_id, expires_delta=timedelta(seconds=expires_in), additional_claims={"scope": "stream"},
+        )
+        return {"token": token, "expires_in": expires_in}, 201
+
+
+@blp.route("/stream")
+class TaskStream(MethodView):
+
+    @jwt_required(locations=["headers", "query_string"])
+    def get(self):
+        """
+        Server-sent events for the user's task changes: task.created, task.updated,
+        task.deleted, tasks.changed (a large batch; refetch) and reset (events were
+        missed; refetch). Reconnect with Last-Event-ID to resume where the stream left off.
+        Authenticates with the usual header or a POST /tasks/stream/token token in ?jwt=.
+        """
+        user_id = get_jwt_identity()
+        if not user_id:
+            abort(401, message="User not authenticated.")
+        # Only stream tokens go in URLs, where proxies and logs may keep them
+        if get_jwt_request_location() == "query_string" and get_jwt().get("scope") != "stream":
+            abort(401, message="Use a token from POST /tasks/stream/token in the query string.")
+        last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+        stream = event_hub.subscribe(int(user_id), last_event_id, current_app.config["SSE_HEARTBEAT"])
+        # No stream_with_context: the generator needs no request state, and idle streams shouldn't hold a session
+        return Response(stream, mimetype="text/event-stream", headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Don't let nginx buffer the stream
+        })
+
+
+@blp.route("/recommendations")
+class TaskRecommendations(MethodView):
     
-#     @jwt_required()
-#     @blp.arguments(TaskCreateSchema)
-#     @blp.response(200, TaskSchema(many=True))
-#     def post(self, task_data):
-#         """Get task recommendations based on a given task title"""
-#         user_id = get_jwt_identity()
-#         if not user_id:
-#             abort(401, message="User not authenticated.")
-        
-#         task_title = task_data.get("title")
-#         if not task_title:
-#             abort(400, message="Title is required for recommendations.")
+    @jwt_required()
+    @blp.arguments(TaskRecommendationQuerySchema)
+    @blp.response(200, TaskRecommendationSchema)
+    def post(self, query):
+        """Get the user's existing tasks most similar to a given task title"""
+        user_id = get_jwt_identity()
+        if not user_id:
+            abort(401, message="User not authenticated.")
         
-#         # Get recommendations from the content recommender
-#         recommendations = recommend_similar_tasks(task_title)
-#         if not recommendations:
-#             abort(404, message="No recommendations found.")
+        task_title = query["title"].strip()
+        if not task_title:
+            abort(400, message="Title is required for recommendations.")
         
-#         return recommendations, 200
+        # Only the new title is vectorized; the user's TF-IDF model is cached and kept up to date
+        recommendations = recommend_similar_tasks(user_id, task_title, query["top_n"])
+        return {"title": task_title, "recommendations": recommendations}
+
+
+@blp.route("/suggestions/cache")
+class SuggestionCacheStats(MethodView):
+
+    @jwt_required()
+    def get(self):
+        """Hit/miss counters of the LLM suggestion cache, for sizing it, and the Gemini circuit breaker state"""
+        return {**suggestion_cache.stats(), "gemini": gemini_client.stats()}, 200
+
+
+@blp.route("/<int:task_id>/suggestions")
+class TaskSuggestions(MethodView):
+
+    @jwt_required()
+    @blp.response(200, TaskSuggestionsSchema)
+    def get(self, task_id):
+        """Get a task's suggestions; suggestions_status stays 'pending' until the background job has filled them in"""
+        user_id = get_jwt_identity()
+        return Task.query.filter_by(id=task_id, user_id=user_id).options(db.undefer_group("suggestions")).first_or_404()
 
 
 @blp.route("/<int:task_id>")
@@ -126,7 +386,7 @@ class TaskDetail(MethodView):
     def get(self, task_id):
         """Get a task by ID"""
         user_id = get_jwt_identity()
-        task = Task.query.get_or_404(task_id)
+        task = Task.query.options(db.undefer_group("suggestions")).get_or_404(task_id)
         return task
     
     @jwt_required()
@@ -136,11 +396,17 @@ class TaskDetail(MethodView):
         """Update a task"""
         user_id = get_jwt_identity()
         task = Task.query.get_or_404(task_id)
+        previous = task_hooks.snapshot(task)
         task.title = task_data.get("title", task.title)
         task.due_date = task_data.get("due_date", task.due_date)
         task.status = task_data.get("status", task.status)
+        if task.status == "completed" and previous["status"] != "completed":
+            task.completed_at = datetime.utcnow()
+        elif task.status != "completed":
+            task.completed_at = None
         task.created_at = task_data.get("created_at", task.created_at)  
         try:
+            task_hooks.task_updated(task, previous)
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
@@ -157,6 +423,7 @@ class TaskDetail(MethodView):
         task = Task.query.get_or_404(task_id)
         try:
             db.session.delete(task)
+            task_hooks.task_deleted(task)
             db.session.commit()
         except SQLAlchemyError:
             db.session.rollback()
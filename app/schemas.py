@@ -1,5 +1,14 @@
-from marshmallow import Schema, fields, post_dump
-from datetime import datetime
+from marshmallow import EXCLUDE, Schema, fields, post_dump, validate, validates_schema, ValidationError
+from datetime import datetime, timezone
+
+class UTCDateTime(fields.DateTime):
+    """DateTime loaded as naive UTC, like the stored columns; "...Z" and "+02:00" inputs are converted."""
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        loaded = super()._deserialize(value, attr, data, **kwargs)
+        if loaded.tzinfo is not None:
+            loaded = loaded.astimezone(timezone.utc).replace(tzinfo=None)
+        return loaded
 
 class TaskSchema(Schema):
     id = fields.Int(dump_only=True)
@@ -10,6 +19,7 @@ class TaskSchema(Schema):
     priority = fields.Integer(dump_only = True)  # Added priority field to output schema
     suggestions = fields.List(fields.Str(), dump_only=True)  # Added suggestions field for output
     complimentary_tasks = fields.List(fields.String(), dump_only=True)
+    suggestions_status = fields.Str(dump_only=True)  # 'pending', 'ready' or 'failed'
     created_at = fields.DateTime(dump_only=True)
     completed_at = fields.DateTime(dump_only=True)  # Nullable for pending tasks
    
@@ -40,19 +50,81 @@ class TaskSchema(Schema):
         except Exception:
             return value  # Return as is if conversion fails
 
+class TaskImportSchema(TaskSchema):
+    """One row of a POST /tasks/import upload: an exported TaskSchema row, with the dump-only fields loadable."""
+    class Meta:
+        unknown = EXCLUDE  # id, suggestions_status and other export-only columns are ignored
+
+    title = fields.Str(required=True, validate=validate.Length(min=1, max=100))
+    due_date = UTCDateTime(allow_none=True, load_default=None)
+    status = fields.Str(load_default="pending")
+    priority = fields.Integer(allow_none=True, load_default=0)
+    suggestions = fields.List(fields.Str(), allow_none=True, load_default=None)
+    complimentary_tasks = fields.List(fields.Str(), allow_none=True, load_default=None)
+    created_at = UTCDateTime(allow_none=True, load_default=None)
+    completed_at = UTCDateTime(allow_none=True, load_default=None)
+
+class TaskExportQuerySchema(Schema):
+    format = fields.Str(load_default="ndjson", validate=validate.OneOf(["ndjson", "csv"]))
+
+class TaskListQuerySchema(Schema):
+    limit = fields.Integer(load_default=100, validate=validate.Range(min=1, max=500))
+    after = fields.Str(required=False)  # Cursor from the previous page's X-Next-Cursor header
+    status = fields.Str(required=False)
+    priority = fields.Integer(required=False)
+    due_after = fields.DateTime(required=False)
+    due_before = fields.DateTime(required=False)
+    sort = fields.Str(load_default="created_at", validate=validate.OneOf(["created_at", "due_date", "priority"]))
+    order = fields.Str(load_default="asc", validate=validate.OneOf(["asc", "desc"]))
+
+class TaskSearchQuerySchema(Schema):
+    q = fields.Str(required=True, validate=validate.Length(min=1, max=200))
+    page = fields.Integer(load_default=1, validate=validate.Range(min=1))
+    per_page = fields.Integer(load_default=20, validate=validate.Range(min=1, max=100))
+
+class TaskSuggestionsSchema(Schema):
+    id = fields.Int(dump_only=True)
+    suggestions_status = fields.Str(dump_only=True)
+    suggestions = fields.List(fields.Str(), dump_only=True)
+    complimentary_tasks = fields.List(fields.String(), dump_only=True)
+
+class TaskRecommendationQuerySchema(Schema):
+    title = fields.Str(required=True)
+    top_n = fields.Integer(load_default=3, validate=validate.Range(min=1, max=20))
+
+class TaskRecommendationSchema(Schema):
+    title = fields.Str()
+    recommendations = fields.List(fields.Str())
+
 class TaskCreateSchema(Schema):
     title = fields.Str(required=True)
-    due_date = fields.DateTime(required=False)
+    due_date = UTCDateTime(required=False)
     status = fields.Str(load_default='pending')
     priority = fields.Integer(required=False)
     created_at = fields.DateTime(dump_only=True)
     
 class TaskUpdateSchema(Schema):
     title = fields.Str()
-    due_date = fields.DateTime(required=False)
+    due_date = UTCDateTime(required=False)
     status = fields.Str()
     priority = fields.Integer(required=False)
     
+class AnalyticsOverviewQuerySchema(Schema):
+    include_tasks = fields.Boolean(load_default=False)  # Embed the task list (paginated)
+    limit = fields.Integer(load_default=50, validate=validate.Range(min=1, max=200))
+    after = fields.Str(required=False)  # Cursor from the previous page's X-Next-Cursor header
+    
+class AnalyticsSeriesQuerySchema(Schema):
+    start = fields.Date(required=False)  # Defaults to 29 days before end
+    end = fields.Date(required=False)  # Defaults to today (UTC)
+    granularity = fields.Str(load_default="day", validate=validate.OneOf(["day", "week", "month"]))
+
+    @validates_schema
+    def validate_range(self, data, **kwargs):
+        start, end = data.get("start"), data.get("end")
+        if start and end and start > end:
+            raise ValidationError("start must not be after end.", "start")
+
 class UserRegisterSchema(Schema):
     username = fields.Str(required=True)
     email = fields.Email(required=True)
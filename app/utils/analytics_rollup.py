@@ -0,0 +1,156 @@
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from sqlalchemy import Date, case, cast, func
+from app import db
+from app.models import Task, TaskDailyRollup
+from app.utils.counters import add_counts
+
+ROLLUP_FIELDS = ("created", "completed", "overdue")
+GRANULARITIES = ("day", "week", "month")
+
+
+def contributions(task):
+    """
+    The (day, counter) increments a task accounts for, given a Task or a task_hooks snapshot.
+
+    created:   the day it was created
+    completed: the day it was completed
+    overdue:   its due day, unless it was completed by then. Booked when the task is
+               written, but series() only reports it once that day has passed.
+    """
+    get = task.get if isinstance(task, dict) else lambda field: getattr(task, field)
+    result = Counter()
+    created_at, completed_at, due_date = get("created_at"), get("completed_at"), get("due_date")
+    completed = get("status") == "completed"
+    if created_at:
+        result[(created_at.date(), "created")] += 1
+    if completed and completed_at:
+        result[(completed_at.date(), "completed")] += 1
+    if due_date and (not completed or (completed_at and completed_at > due_date)):
+        result[(due_date.date(), "overdue")] += 1
+    return result
+
+
+def apply(user_id, delta):
+    """Add a contributions() delta to the user's rollup rows, atomically. Call before the task's commit."""
+    user_id = int(user_id)
+    by_day = defaultdict(lambda: dict.fromkeys(ROLLUP_FIELDS, 0))
+    for (day, field), amount in delta.items():
+        if amount:
+            by_day[day][field] += amount
+    add_counts(
+        TaskDailyRollup,
+        [{"user_id": user_id, "day": day, **counts} for day, counts in sorted(by_day.items())],
+        keys=("user_id", "day"),
+        counters=ROLLUP_FIELDS,
+    )
+
+
+def tasks_created(tasks):
+    deltas = defaultdict(Counter)
+    for task in tasks:
+        deltas[int(task.user_id)].update(contributions(task))
+    for user_id, delta in deltas.items():
+        apply(user_id, delta)
+
+
+def task_created(task):
+    tasks_created([task])
+
+
+def task_updated(task, previous):
+    delta = contributions(task)
+    delta.subtract(contributions(previous))
+    apply(task.user_id, delta)
+
+
+def task_deleted(task):
+    delta = Counter()
+    delta.subtract(contributions(task))
+    apply(task.user_id, delta)
+
+
+def backfill():
+    """Rebuild task_daily_rollup from the task table. Returns the number of rows written."""
+    totals = defaultdict(Counter)
+    columns = (Task.user_id, Task.status, Task.created_at, Task.completed_at, Task.due_date)
+    for user_id, status, created_at, completed_at, due_date in db.session.query(*columns).yield_per(10000):
+        state = {"status": status, "created_at": created_at, "completed_at": completed_at, "due_date": due_date}
+        for (day, field), amount in contributions(state).items():
+            totals[(int(user_id), day)][field] += amount
+
+    TaskDailyRollup.query.delete()
+    db.session.bulk_insert_mappings(TaskDailyRollup, [
+        {"user_id": user_id, "day": day, **{field: counts[field] for field in ROLLUP_FIELDS}}
+        for (user_id, day), counts in totals.items()
+    ])
+    db.session.commit()
+    return len(totals)
+
+
+def _bucket_start(day, granularity):
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(start, granularity):
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+
+def _bucket_column(dialect, granularity):
+    """SQL expression for the first day of each row's bucket; plain days where the dialect has no date functions we use."""
+    day = TaskDailyRollup.day
+    if granularity == "day":
+        return day
+    if dialect == "sqlite":
+        # "weekday 0" moves to the coming Sunday (or stays on one), six days back is its Monday
+        modifiers = ("weekday 0", "-6 days") if granularity == "week" else ("start of month",)
+        return func.date(day, *modifiers, type_=Date)
+    if dialect == "postgresql":
+        return cast(func.date_trunc(granularity, day), Date)
+    return day
+
+
+def series(user_id, start, end, granularity="day"):
+    """
+    Counters per bucket between start and end (inclusive), read from the rollups only.
+
+    Weeks start on Monday; the first and last buckets are clipped to the range.
+    Every bucket in the range is present, with zeros where nothing happened.
+    Overdue counts from today (UTC) on are left out: those tasks aren't late yet.
+    """
+    today = datetime.utcnow().date()
+    bucket = _bucket_column(db.session.connection().dialect.name, granularity).label("bucket")
+    sums = [
+        func.sum(case((TaskDailyRollup.day < today, TaskDailyRollup.overdue), else_=0)) if field == "overdue"
+        else func.sum(getattr(TaskDailyRollup, field))
+        for field in ROLLUP_FIELDS
+    ]
+    rows = db.session.query(bucket, *sums).filter(
+        TaskDailyRollup.user_id == user_id,
+        TaskDailyRollup.day >= start,
+        TaskDailyRollup.day <= end,
+    ).group_by(bucket)
+
+    buckets = {}
+    period = _bucket_start(start, granularity)
+    while period <= end:
+        buckets[period] = dict.fromkeys(ROLLUP_FIELDS, 0)
+        period = _next_bucket(period, granularity)
+
+    for period, *counts in rows:
+        counts_in = buckets[_bucket_start(period, granularity)]
+        for field, count in zip(ROLLUP_FIELDS, counts):
+            counts_in[field] += count or 0
+
+    return [
+        {"period": max(period, start).isoformat(), **counts}
+        for period, counts in buckets.items()
+    ]
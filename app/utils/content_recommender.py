@@ -1,25 +1,192 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import math
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from sqlalchemy import inspect
 from app.models import Task
 from app import db
+from app.utils.lazy import lazy
+from app.utils.metrics import timed
+from app.utils.response_cache import data_version
 
+# Same tokenization as TfidfVectorizer(stop_words='english')
+_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+MAX_CACHED_USERS = 1000
+
+
+@lazy("sklearn")
+def _stop_words():
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+    return ENGLISH_STOP_WORDS
+
+
+def tokenize(title):
+    stop_words = _stop_words()
+    return [token for token in _TOKEN_RE.findall(title.lower()) if token not in stop_words]
+
+
+class TfidfModel:
+    """
+    Incrementally maintained TF-IDF model over one user's task titles.
+
+    Keeps the vocabulary's document frequencies, each title's term counts and an
+    inverted index (term -> {task_id: tf}). Adding or removing a title only touches
+    its own terms; a query vectorizes the new title and does one sparse
+    matrix-vector product over the postings of its terms. IDF is smoothed like
+    scikit-learn's default: ln((1 + n) / (1 + df)) + 1.
+
+    version is the owner's User.data_version the model reflects.
+    """
+
+    def __init__(self, version=None):
+        self.version = version
+        self.df = Counter()
+        self.docs = {}
+        self.postings = defaultdict(dict)
+        self._norms = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, task_id, title):
+        with self._lock:
+            if task_id in self.docs:
+                self.remove(task_id)
+            counts = Counter(tokenize(title))
+            self.docs[task_id] = (title, counts)
+            for term, tf in counts.items():
+                self.df[term] += 1
+                self.postings[term][task_id] = tf
+            self._norms.clear()  # IDF moved, cached norms are stale
+
+    def remove(self, task_id):
+        with self._lock:
+            doc = self.docs.pop(task_id, None)
+            if doc is None:
+                return
+            for term in doc[1]:
+                self.df[term] -= 1
+                self.postings[term].pop(task_id, None)
+                if self.df[term] <= 0:
+                    del self.df[term]
+                    del self.postings[term]
+            self._norms.clear()
+
+    def idf(self, term):
+        return math.log((1 + len(self.docs)) / (1 + self.df.get(term, 0))) + 1
+
+    def _norm(self, task_id):
+        norm = self._norms.get(task_id)
+        if norm is None:
+            counts = self.docs[task_id][1]
+            norm = math.sqrt(sum((tf * self.idf(term)) ** 2 for term, tf in counts.items()))
+            self._norms[task_id] = norm
+        return norm
+
+    def most_similar(self, title, top_n=3):
+        """Titles most similar to title by TF-IDF cosine, best first; no zero-score matches."""
+        with self._lock:
+            query = {term: tf * self.idf(term) for term, tf in Counter(tokenize(title)).items()}
+            query_norm = math.sqrt(sum(weight ** 2 for weight in query.values()))
+            if not query_norm:
+                return []
+
+            scores = defaultdict(float)
+            for term, weight in query.items():
+                idf = self.idf(term)
+                for task_id, tf in self.postings.get(term, {}).items():
+                    scores[task_id] += weight * tf * idf
+
+            suggestions = []
+            ranked = sorted(scores.items(), key=lambda item: item[1] / self._norm(item[0]), reverse=True)
+            for task_id, _ in ranked:
+                doc_title = self.docs[task_id][0]
+                if doc_title not in suggestions:
+                    suggestions.append(doc_title)
+                if len(suggestions) == top_n:
+                    break
+            return suggestions
+
+
+_models = OrderedDict()
+_models_lock = threading.Lock()
+
+
+def _get_model(user_id):
+    """
+    The user's model, built from their titles on first use and then kept up to date.
+
+    This process's commits are applied as they happen. Another worker process's
+    writes leave the user's data_version ahead of the model's, and it is rebuilt.
+    """
+    user_id = int(user_id)
+    version = data_version(user_id)
+    with _models_lock:
+        model = _models.get(user_id)
+        if model is not None and model.version == version:
+            _models.move_to_end(user_id)
+            return model
+
+    # Version read first: the titles loaded now are at least that new
+    model = TfidfModel(version)
+    for task_id, title in db.session.query(Task.id, Task.title).filter(Task.user_id == user_id):
+        if title:
+            model.add(task_id, title)
+
+    with _models_lock:
+        current = _models.get(user_id)
+        if current is not None and current.version == version:
+            model = current
+        _models[user_id] = model
+        _models.move_to_end(user_id)
+        while len(_models) > MAX_CACHED_USERS:
+            _models.popitem(last=False)
+    return model
+
+
+def _cached_model(user_id):
+    with _models_lock:
+        return _models.get(int(user_id))
+
+
+def task_added(task):
+    """Register a new task's title. Call before the task's commit."""
+    from app.utils.task_hooks import after_commit
+
+    user_id, title = task.user_id, task.title
+
+    def apply():
+        model = _cached_model(user_id)
+        if model is not None:
+            model.add(inspect(task).identity[0], title)
+    after_commit(apply)
+
+
+def task_removed(user_id, task_id):
+    """Forget a task's title. Call before the delete is committed."""
+    from app.utils.task_hooks import after_commit
+
+    def apply():
+        model = _cached_model(user_id)
+        if model is not None:
+            model.remove(task_id)
+    after_commit(apply)
+
+
+def versions_committed(versions):
+    """
+    This process committed {user_id: (data_version before, after)} and has applied
+    those changes to the cached models: models at `before` are current at `after`.
+    """
+    with _models_lock:
+        for user_id, (before, after) in versions.items():
+            model = _models.get(user_id)
+            if model is not None and model.version == before:
+                model.version = after
+
+
+@timed("recommend")
 def recommend_similar_tasks(user_id, task_title, top_n = 3):
-    user_tasks = Task.query.filter_by(user_id=user_id).all()
-    task_titles = [task.title for task in user_tasks if task.title]
-    
-    if not task_titles:
-        return []
-    
-    task_titles.append(task_title)  # Add the new task title for comparison
-    
-    vectorizer = TfidfVectorizer(stop_words='english')
-    # Create TF-IDF matrix and compute cosine similarity
-     # Fit the vectorizer on the task titles
-    tfidf_matrix = vectorizer.fit_transform(task_titles)
-    similarity_scores = cosine_similarity(tfidf_matrix[-1], tfidf_matrix[:-1])
-     # Get indices of top N similar tasks
-     
-    top_indices = similarity_scores[0].argsort()[::-1][:top_n]
-    suggestions = [task_titles[i] for i in top_indices]
-    
-    return suggestions
\ No newline at end of file
+    return _get_model(user_id).most_similar(task_title, top_n)
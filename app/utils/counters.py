@@ -0,0 +1,47 @@
+"""
+Atomic counter upserts for the derived tables (daily rollups, title index): the database
+does the increment, so concurrent writers neither lose counts nor collide on first insert.
+"""
+from sqlalchemy import bindparam, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from app import db
+
+_UPSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def add_counts(model, rows, keys, counters):
+    """
+    Add each row's counter amounts to model's row with the same key, in the session's transaction.
+
+    rows:     dicts holding the key columns, the counter amounts and any other columns
+              a missing row is created with (the amounts become its initial counts)
+    keys:     primary key column names
+    counters: names of the columns to increment
+    """
+    if not rows:
+        return
+    table = model.__table__
+    connection = db.session.connection()
+    upsert = _UPSERTS.get(connection.dialect.name)
+    if upsert is not None:
+        statement = upsert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={name: table.c[name] + statement.excluded[name] for name in counters},
+        )
+        db.session.execute(statement, rows)
+        return
+
+    increment = update(table).where(
+        *(table.c[name] == bindparam(f"key_{name}") for name in keys)
+    ).values({name: table.c[name] + bindparam(f"add_{name}") for name in counters})
+    for row in rows:
+        params = {**{f"key_{name}": row[name] for name in keys}, **{f"add_{name}": row[name] for name in counters}}
+        if db.session.execute(increment, params).rowcount:
+            continue
+        try:
+            with db.session.begin_nested():
+                db.session.execute(table.insert().values(**row))
+        except IntegrityError:
+            db.session.execute(increment, params)  # Another transaction created it first
@@ -0,0 +1,292 @@
+"""
+Local sentence-embedding search over task titles, for complementary tasks. Titles are
+embedded on CPU once each and kept int8-quantized in memory-mapped files under
+EMBEDDING_INDEX_DIR/<model name>, shared by every worker on the host. Off unless that is set.
+"""
+import functools
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from app import db
+from app.models import TaskTitleIndex
+from app.utils.lazy import get_numpy, lazy
+from app.utils.metrics import timed
+from app.utils.suggestion_cache import cache_key
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+EMBEDDING_INDEX_DIR = os.getenv("EMBEDDING_INDEX_DIR") or None
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+EMBEDDING_MIN_SCORE = float(os.getenv("EMBEDDING_MIN_SCORE", "0.5"))
+EMBEDDING_ALL_USERS = os.getenv("EMBEDDING_ALL_USERS", "false").lower() in ("1", "true", "yes")
+EMBEDDING_ROW_CACHE_SIZE = int(os.getenv("EMBEDDING_ROW_CACHE_SIZE", "100000"))
+
+
+@functools.lru_cache(maxsize=None)  # Loaded through get_index(), so warmup skips it when disabled
+def _encoder():
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(EMBEDDING_MODEL)
+    model = AutoModel.from_pretrained(EMBEDDING_MODEL).eval()
+    return torch, tokenizer, model
+
+
+def embed(titles, batch_size=EMBEDDING_BATCH_SIZE):
+    """Unit-length float32 embeddings of titles, shape (len(titles), dim), computed batch_size at a time."""
+    np = get_numpy()
+    torch, tokenizer, model = _encoder()
+    batches = []
+    with torch.inference_mode():
+        for start in range(0, len(titles), batch_size):
+            encoded = tokenizer(
+                titles[start:start + batch_size], padding=True, truncation=True, max_length=64, return_tensors="pt"
+            )
+            hidden = model(**encoded).last_hidden_state
+            mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            batches.append(torch.nn.functional.normalize(pooled, dim=1).numpy())
+    if not batches:
+        return np.zeros((0, model.config.hidden_size), dtype=np.float32)
+    return np.concatenate(batches).astype(np.float32, copy=False)
+
+
+def quantize(vectors):
+    """Symmetric per-row int8 quantization: vectors ~= q * scale[:, None]."""
+    np = get_numpy()
+    scale = np.abs(vectors).max(axis=1) / 127.0
+    scale[scale == 0] = 1.0
+    q = np.clip(np.rint(vectors / scale[:, None]), -127, 127).astype(np.int8)
+    return q, scale.astype(np.float32)
+
+
+def title_key(title):
+    return cache_key(title, namespace="embedding")
+
+
+class EmbeddingIndex:
+    """
+    One int8 embedding row per distinct title hash, in memory-mapped files.
+
+    path/vectors.i8    capacity x dim int8 rows
+    path/scales.f4     capacity float32 per-row scales
+    path/titles.jsonl  one {"key", "title"} line per row, in row order
+
+    A row becomes visible once its titles.jsonl line is written, after its vector.
+    Appends take an exclusive flock, so several processes can share the directory.
+    Each process picks up the others' rows by reading the file tail. The files
+    double in size when they fill up.
+    """
+
+    def __init__(self, path, dim, embed_fn=embed, initial_capacity=1024, row_cache_size=EMBEDDING_ROW_CACHE_SIZE):
+        self.path = path
+        self.dim = dim
+        self.embed_fn = embed_fn
+        self._vectors_path = os.path.join(path, "vectors.i8")
+        self._scales_path = os.path.join(path, "scales.f4")
+        self._titles_path = os.path.join(path, "titles.jsonl")
+        self._keys = {}
+        self._titles = []
+        self._row_by_title = OrderedDict()  # LRU of exact title -> row, skips hashing on repeat lookups
+        self.row_cache_size = row_cache_size
+        self._offset = 0
+        self._vectors = self._scales = None
+        self._lock = threading.RLock()
+
+        os.makedirs(path, exist_ok=True)
+        with self._file_lock():
+            if not os.path.exists(self._titles_path):
+                open(self._titles_path, "ab").close()
+            self._grow_files(initial_capacity)
+        self._refresh()
+
+    def __len__(self):
+        return len(self._titles)
+
+    @contextmanager
+    def _file_lock(self):
+        with open(os.path.join(self.path, ".lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _capacity(self):
+        return os.path.getsize(self._vectors_path) // self.dim if os.path.exists(self._vectors_path) else 0
+
+    def _grow_files(self, capacity):
+        if self._capacity() >= capacity:
+            return
+        with open(self._vectors_path, "ab") as f:
+            f.truncate(capacity * self.dim)
+        with open(self._scales_path, "ab") as f:
+            f.truncate(capacity * 4)
+
+    def _map(self):
+        np = get_numpy()
+        capacity = self._capacity()
+        if self._vectors is None or len(self._vectors) != capacity:
+            self._vectors = np.memmap(self._vectors_path, dtype=np.int8, mode="r+", shape=(capacity, self.dim))
+            self._scales = np.memmap(self._scales_path, dtype=np.float32, mode="r+", shape=(capacity,))
+
+    def _refresh(self):
+        """Read rows appended since the last refresh (by this or another process)."""
+        with self._lock:
+            with open(self._titles_path, "rb") as f:
+                f.seek(self._offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Another process is still writing this line
+                    entry = json.loads(line)
+                    self._keys[entry["key"]] = len(self._titles)
+                    self._titles.append(entry["title"])
+                    self._offset += len(line)
+            self._map()
+
+    def _append(self, titles_by_key, vectors):
+        with self._lock, self._file_lock():
+            self._refresh()
+            new = [(key, title, i) for i, (key, title) in enumerate(titles_by_key.items()) if key not in self._keys]
+            if not new:
+                return
+            start = len(self._titles)
+            capacity = self._capacity()
+            while capacity < start + len(new):
+                capacity *= 2
+            self._grow_files(capacity)
+            self._map()
+
+            q, scale = quantize(vectors[[i for _, _, i in new]])
+            self._vectors[start:start + len(new)] = q
+            self._scales[start:start + len(new)] = scale
+            self._vectors.flush()
+            self._scales.flush()
+            with open(self._titles_path, "ab") as f:
+                f.write("".join(
+                    json.dumps({"key": key, "title": title}) + "\n" for key, title, _ in new
+                ).encode("utf-8"))
+            self._refresh()
+
+    def rows(self, titles):
+        """Row numbers of titles, embedding (in batches) the ones not stored yet."""
+        found = {}
+        with self._lock:
+            for title in titles:
+                row = self._row_by_title.get(title)
+                if row is not None:
+                    self._row_by_title.move_to_end(title)
+                    found[title] = row
+        unseen = [title for title in dict.fromkeys(titles) if title not in found]
+        if unseen:
+            self._refresh()
+            keys = [title_key(title) for title in unseen]
+            with self._lock:
+                missing = {}
+                for key, title in zip(keys, unseen):
+                    if key not in self._keys:
+                        missing.setdefault(key, title)
+            if missing:
+                # Embedded outside the lock; _append skips rows another caller stored meanwhile
+                self._append(missing, self.embed_fn(list(missing.values())))
+            with self._lock:
+                for key, title in zip(keys, unseen):
+                    found[title] = self._row_by_title[title] = self._keys[key]
+                while len(self._row_by_title) > self.row_cache_size:
+                    self._row_by_title.popitem(last=False)
+        return [found[title] for title in titles]
+
+    def search(self, title, top_n=3, candidate_titles=None, min_score=0.0):
+        """
+        Stored titles most similar to title by cosine, best first.
+
+        Searches candidate_titles (embedding any that are new), or every stored
+        title when it is None. Never returns title itself.
+        """
+        np = get_numpy()
+        query_row = self.rows([title])[0]
+        candidates = None if candidate_titles is None else np.unique(self.rows(candidate_titles))
+        with self._lock:
+            query = self._vectors[query_row].astype(np.float32) * self._scales[query_row]
+            # einsum dequantizes block by block instead of materializing a float32 copy
+            if candidates is not None:
+                candidates = candidates[candidates != query_row]
+                scores = np.einsum("ij,j->i", self._vectors[candidates], query) * self._scales[candidates]
+                rows = candidates
+            else:
+                count = len(self._titles)
+                scores = np.einsum("ij,j->i", self._vectors[:count], query) * self._scales[:count]
+                scores[query_row] = -np.inf
+                rows = np.arange(count)
+
+            if len(scores) > top_n:
+                best = np.argpartition(-scores, top_n)[:top_n]
+            else:
+                best = np.arange(len(scores))
+            best = best[np.argsort(-scores[best])]
+            return [
+                self._titles[rows[i]] for i in best
+                if scores[i] >= min_score and self._titles[rows[i]] != title
+            ]
+
+
+def enabled():
+    return EMBEDDING_INDEX_DIR is not None
+
+
+def _index_dir():
+    return os.path.join(EMBEDDING_INDEX_DIR, re.sub(r"[^\w.-]+", "_", EMBEDDING_MODEL))
+
+
+@lazy("embedding_index")
+def get_index():
+    """The shared EmbeddingIndex, or None when EMBEDDING_INDEX_DIR isn't set."""
+    if not EMBEDDING_INDEX_DIR:
+        return None
+    _, _, model = _encoder()
+    return EmbeddingIndex(_index_dir(), model.config.hidden_size)
+
+
+@timed("embedding")
+def similar_tasks(user_id, task_title, top_n=3, all_users=EMBEDDING_ALL_USERS):
+    """
+    Titles from the user's task history (or everyone's, with all_users) closest to task_title.
+    Returns [] when the index is disabled or nothing scores EMBEDDING_MIN_SCORE.
+    """
+    index = get_index()
+    if index is None:
+        return []
+    candidates = None
+    if not all_users:
+        candidates = [
+            title for (title,) in
+            db.session.query(TaskTitleIndex.title).filter(TaskTitleIndex.user_id == int(user_id))
+        ]
+        if not candidates:
+            return []
+    return index.search(task_title, top_n, candidates, EMBEDDING_MIN_SCORE)
+
+
+def embed_all_titles(batch_size=1000):
+    """Embed every distinct title in task_title_index (cold start). Returns the index size."""
+    index = get_index()
+    if index is None:
+        raise RuntimeError("EMBEDDING_INDEX_DIR is not set.")
+    batch = []
+    for (title,) in db.session.query(TaskTitleIndex.title).distinct().yield_per(batch_size):
+        batch.append(title)
+        if len(batch) == batch_size:
+            index.rows(batch)
+            batch = []
+    if batch:
+        index.rows(batch)
+    return len(index)
@@ -0,0 +1,164 @@
+"""
+Per-user change feed behind GET /tasks/stream. Each user's channel keeps the last
+SSE_BUFFER_SIZE events for Last-Event-ID resumes, in process ("local") or in a Redis
+stream shared by all workers ("redis", see SSE_BACKEND).
+"""
+import json
+import threading
+from collections import deque
+
+
+class LocalBackend:
+    """Ring buffers in this process; event ids are increasing integers."""
+
+    def __init__(self, buffer_size=1000):
+        self.buffer_size = buffer_size
+        self._channels = {}
+        self._lock = threading.Lock()
+        self._last_id = 0
+
+    def _channel(self, name):
+        with self._lock:
+            channel = self._channels.get(name)
+            if channel is None:
+                channel = self._channels[name] = _Channel(self.buffer_size)
+            return channel
+
+    def publish(self, name, data):
+        with self._lock:
+            self._last_id += 1
+            event_id = self._last_id
+        self._channel(name).append(event_id, data)
+        return str(event_id)
+
+    def resume(self, name, last_id):
+        """(cursor, gap): where to read from after last_id, and whether events after it were dropped."""
+        channel = self._channel(name)
+        latest = str(self._last_id)
+        if last_id is None:
+            return latest, False
+        try:
+            last_id = int(last_id)
+        except ValueError:
+            return latest, True
+        # An id from before a restart or eviction can't be resumed from
+        if last_id > self._last_id or last_id < channel.dropped_through:
+            return latest, True
+        return str(last_id), False
+
+    def read(self, name, cursor, timeout):
+        """Events after cursor as [(id, data)], waiting up to timeout seconds for the first one."""
+        return [(str(event_id), data) for event_id, data in self._channel(name).after(int(cursor), timeout)]
+
+
+class _Channel:
+
+    def __init__(self, buffer_size):
+        self.events = deque(maxlen=buffer_size)
+        self.dropped_through = 0  # Id of the newest event evicted from the buffer
+        self.condition = threading.Condition()
+
+    def append(self, event_id, data):
+        with self.condition:
+            if len(self.events) == self.events.maxlen:
+                self.dropped_through = self.events[0][0]
+            self.events.append((event_id, data))
+            self.condition.notify_all()
+
+    def after(self, cursor, timeout):
+        with self.condition:
+            if not self.events or self.events[-1][0] <= cursor:
+                self.condition.wait(timeout)
+            return [event for event in self.events if event[0] > cursor]
+
+
+class RedisBackend:
+    """One capped Redis stream per channel; event ids are stream entry ids."""
+
+    def __init__(self, url, buffer_size=1000, prefix="task-events:"):
+        import redis
+
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self.buffer_size = buffer_size
+        self.prefix = prefix
+
+    def publish(self, name, data):
+        return self.redis.xadd(
+            self.prefix + name, {"data": json.dumps(data)}, maxlen=self.buffer_size, approximate=True
+        )
+
+    def resume(self, name, last_id):
+        key = self.prefix + name
+        newest = self.redis.xrevrange(key, count=1)
+        latest = newest[0][0] if newest else "0-0"
+        if last_id is None:
+            return latest, False
+        oldest = self.redis.xrange(key, count=1)
+        try:
+            gap = bool(oldest) and _stream_id(oldest[0][0]) > _stream_id(last_id)
+        except ValueError:
+            return latest, True
+        return (latest, True) if gap else (last_id, False)
+
+    def read(self, name, cursor, timeout):
+        response = self.redis.xread({self.prefix + name: cursor}, count=100, block=int(timeout * 1000))
+        return [
+            (event_id, json.loads(fields["data"]))
+            for _, entries in response for event_id, fields in entries
+        ]
+
+
+def _stream_id(value):
+    milliseconds, _, sequence = value.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+class EventHub:
+    """
+    Publish/subscribe of task events by user, over a pluggable backend.
+
+    init_app picks the backend from SSE_BACKEND; assign hub.backend directly to plug
+    in another one (any object with publish/resume/read).
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or LocalBackend()
+
+    def init_app(self, app):
+        app.config.setdefault('SSE_BACKEND', 'local')
+        app.config.setdefault('SSE_BUFFER_SIZE', 1000)
+        app.config.setdefault('SSE_HEARTBEAT', 15.0)
+        app.config.setdefault('SSE_TOKEN_EXPIRES', 60)  # Seconds a POST /tasks/stream/token token can connect for
+        app.config.setdefault('REDIS_URL', 'redis://localhost:6379/0')
+        if app.config['SSE_BACKEND'] == 'redis':
+            self.backend = RedisBackend(app.config['REDIS_URL'], app.config['SSE_BUFFER_SIZE'])
+        else:
+            self.backend = LocalBackend(app.config['SSE_BUFFER_SIZE'])
+        app.extensions['event_hub'] = self
+
+    def publish(self, user_id, event):
+        return self.backend.publish(str(user_id), event)
+
+    def subscribe(self, user_id, last_event_id=None, heartbeat=15.0):
+        """
+        Yield SSE-formatted strings for user_id's events, forever.
+
+        Starts after last_event_id when given (sending a reset event if the events
+        after it are gone), else with the next event published. Sends a comment
+        line every heartbeat seconds without events, so dead connections get noticed.
+        """
+        name = str(user_id)
+        cursor, gap = self.backend.resume(name, last_event_id)
+        yield "retry: 3000\n\n"
+        if gap:
+            yield f"id: {cursor}\nevent: reset\ndata: {{}}\n\n"
+        while True:
+            events = self.backend.read(name, cursor, heartbeat)
+            if not events:
+                yield ": keep-alive\n\n"
+            for event_id, data in events:
+                cursor = event_id
+                yield f"id: {event_id}\nevent: {data['type']}\ndata: {json.dumps(data)}\n\n"
+
+
+event_hub = EventHub()
@@ -0,0 +1,46 @@
+"""
+Offline stand-in for the Gemini client, with optional latency and failure rate.
+Enabled with GEMINI_FAKE=1, or assign an instance to gemini_suggester.model.
+"""
+import json
+import random
+import re
+import threading
+import time
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """
+    latency:       seconds per call, or a (low, high) range drawn uniformly
+    failure_rate:  fraction of calls raising RuntimeError
+    seed:          makes latencies and failures reproducible
+    """
+
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.calls += 1
+            latency = self.latency if not isinstance(self.latency, tuple) else self._random.uniform(*self.latency)
+            fail = self._random.random() < self.failure_rate
+        if latency:
+            time.sleep(latency)
+        if fail:
+            raise RuntimeError("Simulated Gemini failure")
+
+        match = re.search(r'Given the task: "(.*)":', prompt)
+        title = match.group(1) if match else "this task"
+        return FakeResponse(json.dumps({
+            "subtasks": [f"Outline the steps for {title}", f"Set aside time for {title}", f"Review {title} when done"],
+            "similar_tasks": [f"Plan a follow-up to {title}", "Take a short break"],
+        }))
@@ -1,47 +1,137 @@
+import functools
 import os
-import google.generativeai as genai
+import json
 from dotenv import load_dotenv
+from app.utils.lazy import lazy
+from app.utils.metrics import count, span
+from app.utils.resilience import CircuitBreaker, CircuitOpen, RateLimited, ResilienceError, ResilientClient
+from app.utils.suggestion_cache import suggestion_cache, cache_key
 
 load_dotenv()
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-try:
-    model = genai.GenerativeModel("gemini-1.5-flash")  # Full model path is required
-except Exception as e:
-    print("Failed to initialize Gemini model:", e)
-    # Optional: List models if needed
-    models = genai.list_models()
-    print("Available models:")
-    for m in models:
-        print("-", m.name)
-    raise SystemExit("Exiting due to incorrect model configuration.")
+# Assign any object with generate_content(prompt) to replace the Gemini client (e.g. in benchmarks)
+model = None
 
-def get_suggestions(task_title):
+GEMINI_FAKE = os.getenv("GEMINI_FAKE", "false").lower() in ("1", "true", "yes")
+GEMINI_RATE_PER_MINUTE = float(os.getenv("GEMINI_RATE_PER_MINUTE", "15"))  # Free tier quota for gemini-1.5-flash
+GEMINI_BURST = int(os.getenv("GEMINI_BURST", "5"))
+GEMINI_RATE_WAIT = float(os.getenv("GEMINI_RATE_WAIT", "0.5"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "6"))  # Below SUGGESTION_LLM_TIMEOUT
+GEMINI_HEDGE_AFTER = float(os.getenv("GEMINI_HEDGE_AFTER", "0")) or None
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_BREAKER_FAILURES = int(os.getenv("GEMINI_BREAKER_FAILURES", "5"))
+GEMINI_BREAKER_SLOW_SECONDS = float(os.getenv("GEMINI_BREAKER_SLOW_SECONDS", "4"))
+GEMINI_BREAKER_RESET = float(os.getenv("GEMINI_BREAKER_RESET", "30"))
+SUGGESTION_FAILURE_TTL = float(os.getenv("SUGGESTION_FAILURE_TTL", "60"))  # How long a failed title isn't retried
+
+
+@lazy("gemini")
+def _gemini_model():
+    import google.generativeai as genai
+
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
     try:
-        prompt = f"""You are a productivity Guru for the last 10 years. 
-        Given the task: "{task_title}", suggest exactly 3 short,key and practical subtasks or tips (each under 20 words) to help complete it.
-        Respond ONLY with a numbered list. No intros(self-introductions), no explanations. Make sure to use a friendly and encouraging tone."""
-        
-        response = model.generate_content(prompt)
-        text = response.text.strip()
-        suggestions = [line.strip("-• ") for line in text.split("\n") if line.strip()]
-        return suggestions[:3] if suggestions else None
+        return genai.GenerativeModel("gemini-1.5-flash")  # Full model path is required
     except Exception as e:
-        print(f"Gemini Error: {e}")
-        return None
-    
-def task_suggestions(task_title):
+        print("Failed to initialize Gemini model:", e)
+        # Optional: List models if needed
+        models = genai.list_models()
+        print("Available models:")
+        for m in models:
+            print("-", m.name)
+        raise RuntimeError("Incorrect Gemini model configuration.") from e
+
+
+@functools.lru_cache(maxsize=None)
+def _fake_model():
+    from app.utils.fake_gemini import FakeGeminiModel
+
+    return FakeGeminiModel(
+        latency=float(os.getenv("GEMINI_FAKE_LATENCY", "0")),
+        failure_rate=float(os.getenv("GEMINI_FAKE_FAILURE_RATE", "0")),
+    )
+
+
+def get_model():
+    if model is not None:
+        return model
+    return _fake_model() if GEMINI_FAKE else _gemini_model()
+
+
+# Every Gemini call goes through here: over quota, past the deadline or with the
+# circuit open, get_combined_suggestions returns None and callers use local_suggester.
+client = ResilientClient(
+    get_model,
+    rate_per_minute=GEMINI_RATE_PER_MINUTE,
+    burst=GEMINI_BURST,
+    rate_wait=GEMINI_RATE_WAIT,
+    timeout=GEMINI_TIMEOUT,
+    hedge_after=GEMINI_HEDGE_AFTER,
+    max_concurrency=GEMINI_MAX_CONCURRENCY,
+    breaker=CircuitBreaker(GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_SLOW_SECONDS, GEMINI_BREAKER_RESET),
+)
+
+
+def _parse_combined(text):
+    """Parse the JSON object returned for the combined prompt."""
+    # Tolerate ```json fences and stray prose around the object
+    data = json.loads(text[text.find("{"):text.rfind("}") + 1])
+    subtasks = [str(item).strip() for item in data.get("subtasks", []) if str(item).strip()]
+    similar = [str(item).strip() for item in data.get("similar_tasks", []) if str(item).strip()]
+    return {"subtasks": subtasks[:3], "similar_tasks": similar[:2]}
+
+
+def get_combined_suggestions(task_title):
+    """
+    Fetch subtasks and complementary tasks for a title with a single Gemini call.
+
+    Results are cached by normalized title (see suggestion_cache), so repeated task
+    titles cost no LLM round-trip at all. Returns None if Gemini fails, or is
+    skipped by the rate limiter or circuit breaker (see client). A failed or empty
+    answer is cached too, as {}, for SUGGESTION_FAILURE_TTL seconds.
+    """
+    key = cache_key(task_title)
+    cached = suggestion_cache.get(key)
+    if cached is not None:
+        return cached or None
     try:
-        task_help = f"""You are a productivity Guru for the last 10 years.
-        Given the task: "{task_title}", suggest exactly 2 similar tasks (no more than 6-10 words) that can be done in contrast with the task in hand, which would be beneficial as a whole.
-        Respond ONLY with a numbered list. No intros(self-introductions), no explanations."""
-        response = model.generate_content(task_help)
-        text = response.text.strip()
-        suggestion = [line.strip("-• ") for line in text.split("\n") if line.strip()]
-        return suggestion[:2] if suggestion else None
-    
+        prompt = f"""You are a productivity Guru for the last 10 years.
+        Given the task: "{task_title}":
+        1. suggest exactly 3 short,key and practical subtasks or tips (each under 20 words) to help complete it, using a friendly and encouraging tone;
+        2. suggest exactly 2 similar tasks (no more than 6-10 words) that can be done in contrast with the task in hand, which would be beneficial as a whole.
+        Respond ONLY with a JSON object of the form {{"subtasks": ["...", "...", "..."], "similar_tasks": ["...", "..."]}}. No intros(self-introductions), no explanations."""
+        with span("llm"):
+            response = client.generate_content(prompt)
+        result = _parse_combined(response.text)
+    except (CircuitOpen, RateLimited) as e:
+        count("app_llm_calls_total", outcome=type(e).__name__)
+        return None  # Nothing was sent; the title may be retried right away
+    except ResilienceError as e:
+        count("app_llm_calls_total", outcome=type(e).__name__)
+        suggestion_cache.put(key, {}, ttl=SUGGESTION_FAILURE_TTL)
+        return None
     except Exception as e:
+        count("app_llm_calls_total", outcome="error")
         print(f"Gemini Error: {e}")
+        suggestion_cache.put(key, {}, ttl=SUGGESTION_FAILURE_TTL)
+        return None
+    count("app_llm_calls_total", outcome="ok")
+    if not result["subtasks"] and not result["similar_tasks"]:
+        suggestion_cache.put(key, {}, ttl=SUGGESTION_FAILURE_TTL)
+        return None
+    suggestion_cache.put(key, result)
+    return result
+
+
+def get_suggestions(task_title):
+    combined = get_combined_suggestions(task_title)
+    if not combined:
+        return None
+    return combined["subtasks"] or None
+
+
+def task_suggestions(task_title):
+    combined = get_combined_suggestions(task_title)
+    if not combined:
         return None
-    
-    
+    return combined["similar_tasks"] or None
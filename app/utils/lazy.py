@@ -0,0 +1,94 @@
+"""
+Deferred loading of the heavy NLP/ML dependencies: a @lazy("name") loader runs once, on
+first call. warmup() runs them ahead of a pre-forking server's fork (WARMUP_MODELS).
+"""
+import functools
+import gc
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_loaders = {}
+_load_seconds = {}
+_load_errors = {}
+_lock = threading.RLock()
+
+
+def lazy(name):
+    """Register fn as the loader for `name`; fn runs once, on the first call."""
+    def decorator(fn):
+        sentinel = object()
+        result = sentinel
+
+        @functools.wraps(fn)
+        def load():
+            nonlocal result
+            if result is sentinel:
+                with _lock:
+                    if result is sentinel:
+                        start = time.perf_counter()
+                        value = fn()
+                        _load_seconds[name] = round(time.perf_counter() - start, 3)
+                        result = value
+            return result
+
+        _loaders[name] = load
+        return load
+    return decorator
+
+
+def warmup(names=None, freeze=False):
+    """
+    Load the named dependencies (all registered ones by default) now.
+
+    With freeze=True, gc.freeze() afterwards moves everything allocated so far into
+    the permanent generation, so garbage collections in forked workers don't
+    touch (and un-share) those pages. Loaders that fail are reported, not raised.
+    Returns load_report().
+    """
+    # Registration happens when the owning module is imported
+    import app.utils.content_recommender  # noqa: F401
+    import app.utils.embedding_index  # noqa: F401
+    import app.utils.gemini_suggester  # noqa: F401
+    import app.utils.local_suggester  # noqa: F401
+    import app.utils.nlp_parser  # noqa: F401
+    import app.utils.priority  # noqa: F401
+
+    for name in names if names is not None else list(_loaders):
+        try:
+            _loaders[name]()
+        except Exception as e:  # A missing optional model shouldn't stop the server from starting
+            _load_errors[name] = f"{type(e).__name__}: {e}"
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    return load_report()
+
+
+def max_rss_mb():
+    """Peak resident set size of this process in MB (None where it can't be read)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def load_report():
+    """Seconds each dependency took to load, and which ones are still unloaded."""
+    return {
+        "loaded": dict(_load_seconds),
+        "not_loaded": sorted(set(_loaders) - set(_load_seconds)),
+        "errors": dict(_load_errors),
+        "max_rss_mb": max_rss_mb(),
+    }
+
+
+@lazy("numpy")
+def get_numpy():
+    import numpy
+    return numpy
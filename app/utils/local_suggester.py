@@ -1,29 +1,179 @@
-def get_local_suggestions(task_title):
-    keywords = {
-        "meeting": ["Prepare agenda", "Send calendar invite", "Book conference room"],
-        "report": ["Gather data", "Draft report", "Review with team"],
-        "email": ["Draft email", "Send follow-up", "Attach documents"],
-        "presentation": ["Create slides", "Practice delivery", "Check equipment"],
-    }
+"""
+Offline suggestions from the keyword rules in LOCAL_SUGGESTIONS_FILE, matched in one
+pass by an Aho-Corasick automaton over lemmatized words. The file is re-read when it
+changes; an invalid file leaves the previous rules in use.
+"""
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from app.utils.lazy import lazy
+from app.utils.metrics import timed
 
-    suggestions = []
-    for keyword, tasks in keywords.items():
-        if keyword in task_title.lower():
-            suggestions.extend(tasks)
+LOCAL_SUGGESTIONS_FILE = os.getenv(
+    "LOCAL_SUGGESTIONS_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "local_suggestions.json"),
+)
+LOCAL_SUGGESTIONS_RELOAD_INTERVAL = float(os.getenv("LOCAL_SUGGESTIONS_RELOAD_INTERVAL", "5"))
 
-    return suggestions if suggestions else ["No specific suggestions available."]
+_WORD_RE = re.compile(r"\w+")
 
 
-def extra_suggestions(task_title):
-    lowered = task_title.lower()
-    if "assignment" in lowered:
-        return "1. Research topic\n2. Draft answers\n3. Proofread\n4. Submit"
+@lazy("local_suggester_lemmatizer")
+def _lemmatizer():
+    """spaCy's lemmatizer when the model is installed, else a plural-stripping fallback."""
+    try:
+        from app.utils.nlp_parser import get_nlp
+        nlp = get_nlp()
+    except (ImportError, OSError):
+        return _strip_plurals
+
+    def lemmas(text):
+        return [t.lemma_.lower() for t in nlp(text, disable=["parser", "ner"]) if not (t.is_punct or t.is_space)]
+    return lemmas
+
+
+def _strip_plural(word):
+    if len(word) <= 3 or word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("ches", "shes", "sses", "xes", "zes")):
+        return word[:-2]
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def _strip_plurals(text):
+    return [_strip_plural(word) for word in _WORD_RE.findall(text.lower())]
+
+
+def lemmatize(text):
+    return _lemmatizer()(text)
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton whose alphabet is lemmatized words.
+
+    Built from (keyword, value) pairs; matches(text) returns the values of every
+    keyword occurring in text as a whole-word sequence, each value once, in
+    the order of the pairs.
+    """
+
+    def __init__(self, pairs):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._values = []
+        for keyword, value in pairs:
+            words = lemmatize(keyword)
+            if not words:
+                continue
+            self._values.append(value)
+            node = 0
+            for word in words:
+                next_node = self._goto[node].get(word)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][word] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = next_node
+            self._out[node].append(len(self._values) - 1)
+        self._link()
+
+    def _link(self):
+        """Breadth-first failure links; outputs of each failure target are merged in."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for word, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(word, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
 
-    if "email" in lowered:
-        return "1. Draft message\n2. Add recipient\n3. Attach files\n4. Send"
+    def matches(self, text):
+        found = set()
+        node = 0
+        for word in lemmatize(text):
+            while node and word not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(word, 0)
+            found.update(self._out[node])
+        return [self._values[index] for index in sorted(found)]
 
-    if "meeting" in lowered:
-        return "1. Prepare agenda\n2. Book time slot\n3. Notify attendees"
 
-    return "1. Break down into subtasks\n2. Prioritize\n3. Schedule on calendar"
+class RuleSet:
+    """Compiled rules from one version of the data file."""
 
+    def __init__(self, data):
+        self.suggestion_matcher = KeywordMatcher(
+            (keyword, rule["suggestions"]) for rule in data["suggestions"] for keyword in rule["keywords"]
+        )
+        self.extra_matcher = KeywordMatcher(
+            (keyword, rule["text"]) for rule in data["extras"] for keyword in rule["keywords"]
+        )
+        self.default_extra = data["default_extra"]
+        self.no_match = data["no_match"]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+
+class _Rules:
+    """The current RuleSet, reloaded when the file changes."""
+
+    def __init__(self, path, reload_interval):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._rules = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        now = time.monotonic()
+        if self._rules is not None and now - self._checked_at < self.reload_interval:
+            return self._rules
+        with self._lock:
+            if self._rules is None or now - self._checked_at >= self.reload_interval:
+                self._checked_at = now
+                try:
+                    mtime = os.path.getmtime(self.path)
+                    if self._rules is None or mtime != self._mtime:
+                        self._mtime = mtime  # A broken version is reported once, not on every check
+                        self._rules = RuleSet.load(self.path)
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    if self._rules is None:
+                        raise
+                    print(f"Keeping previous local suggestion rules, reload of {self.path} failed: {e}")
+        return self._rules
+
+
+_rules = _Rules(LOCAL_SUGGESTIONS_FILE, LOCAL_SUGGESTIONS_RELOAD_INTERVAL)
+
+
+@timed("local_suggestions")
+def get_local_suggestions(task_title):
+    rules = _rules.get()
+    suggestions = []
+    for rule_suggestions in rules.suggestion_matcher.matches(task_title):
+        suggestions.extend(s for s in rule_suggestions if s not in suggestions)
+
+    return suggestions if suggestions else list(rules.no_match)
+
+
+def extra_suggestions(task_title):
+    rules = _rules.get()
+    extras = rules.extra_matcher.matches(task_title)
+    return extras[0] if extras else rules.default_extra
@@ -0,0 +1,318 @@
+"""
+In-process timing spans and counters: `with span("parse"):` or @timed("parse").
+Spans feed latency histograms and the response's Server-Timing header. GET /metrics
+serves the registry in Prometheus text format to holders of METRICS_TOKEN.
+"""
+import bisect
+import contextlib
+import contextvars
+import functools
+import hmac
+import threading
+import time
+from collections import deque
+from flask import Response, abort, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+QUANTILES = (0.5, 0.95, 0.99)
+QUANTILE_WINDOW = 1024
+
+_enabled = False
+_request_spans = contextvars.ContextVar("request_spans", default=None)  # [(name, seconds)] of the current request
+_request_db = contextvars.ContextVar("request_db", default=None)  # [query count, seconds] of the current request
+_NOOP = contextlib.nullcontext()
+
+
+class Histogram:
+    """Cumulative bucket counts plus a window of recent samples for quantiles."""
+
+    def __init__(self, buckets, window=0):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=window) if window else None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if self.recent is not None:
+            self.recent.append(value)
+
+    def quantiles(self):
+        ordered = sorted(self.recent or ())
+        if not ordered:
+            return {}
+        return {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in QUANTILES}
+
+
+class Registry:
+    """Named counter and histogram families, keyed by label tuples."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+        self._collectors = []
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def inc(self, name, labels=(), amount=1):
+        with self._lock:
+            family = self._counters.setdefault(name, {})
+            family[labels] = family.get(labels, 0) + amount
+
+    def observe(self, name, labels, value, buckets=LATENCY_BUCKETS, window=0):
+        with self._lock:
+            family = self._histograms.setdefault(name, {})
+            histogram = family.get(labels)
+            if histogram is None:
+                histogram = family[labels] = Histogram(buckets, window)
+            histogram.observe(value)
+
+    def add_collector(self, collect):
+        """collect() -> iterable of (name, type, labels, value), evaluated on every scrape."""
+        self._collectors.append(collect)
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self):
+        lines = []
+
+        def header(name, kind):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for name, family in sorted(self._counters.items()):
+                header(name, "counter")
+                for labels, value in sorted(family.items()):
+                    lines.append(f"{name}{_labels(labels)} {value}")
+            for name, family in sorted(self._histograms.items()):
+                header(name, "histogram")
+                quantile_lines = []
+                for labels, histogram in sorted(family.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+                    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+                    for q, value in histogram.quantiles().items():
+                        quantile_lines.append(f"{name}_quantile{_labels(labels + (('quantile', str(q)),))} {value}")
+                if quantile_lines:
+                    lines.append(f"# TYPE {name}_quantile gauge")
+                    lines.extend(quantile_lines)
+
+        collected = {}
+        for collect in self._collectors:
+            try:
+                for name, kind, labels, value in collect():
+                    collected.setdefault((name, kind), []).append((labels, value))
+            except Exception as e:  # One broken collector shouldn't fail the scrape
+                lines.append(f"# collector {getattr(collect, '__name__', collect)} failed: {e}")
+        for (name, kind), samples in sorted(collected.items()):
+            header(name, kind)
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')) for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+registry = Registry()
+registry.describe("app_stage_duration_seconds", "Time spent in a hot-path stage.")
+registry.describe("app_request_duration_seconds", "Request handling time, excluding streamed bodies.")
+registry.describe("app_request_db_queries", "Database queries issued per request.")
+registry.describe("app_requests_total", "Requests handled, by endpoint and status.")
+registry.describe("app_llm_calls_total", "LLM requests by outcome.")
+
+
+class _Span:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.started
+        registry.observe("app_stage_duration_seconds", (("stage", self.name),), seconds, window=QUANTILE_WINDOW)
+        spans = _request_spans.get()
+        if spans is not None:
+            spans.append((self.name, seconds))
+        return False
+
+
+def span(name):
+    """Context manager timing one stage."""
+    return _Span(name) if _enabled else _NOOP
+
+
+def timed(name):
+    """Decorator form of span()."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, amount=1, **labels):
+    """Increment a counter family, e.g. count("app_llm_calls_total", outcome="ok")."""
+    if _enabled:
+        registry.inc(name, tuple(sorted(labels.items())), amount)
+
+
+def bind(fn):
+    """fn reporting its spans into the caller's request, for running on another thread (even several at once)."""
+    spans = _request_spans.get()
+    if spans is None:
+        return fn
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        token = _request_spans.set(spans)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _request_spans.reset(token)
+    return run
+
+
+def server_timing(spans, db=None, total=None):
+    """Server-Timing header value: spans summed by name, then db and total."""
+    by_name = {}
+    for name, seconds in spans:
+        calls, elapsed = by_name.get(name, (0, 0.0))
+        by_name[name] = (calls + 1, elapsed + seconds)
+    entries = [
+        f'{name};desc="x{calls}";dur={elapsed * 1000:.2f}' if calls > 1 else f"{name};dur={elapsed * 1000:.2f}"
+        for name, (calls, elapsed) in by_name.items()
+    ]
+    if db is not None:
+        entries.append(f'db;desc="{db[0]} queries";dur={db[1] * 1000:.2f}')
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_db.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    db = _request_db.get()
+    started = conn.info.get("query_started")
+    if db is not None and started:
+        db[0] += 1
+        db[1] += time.perf_counter() - started.pop()
+
+
+def _collect_caches():
+    from app.utils.gemini_suggester import client
+    from app.utils.response_cache import response_cache
+    from app.utils.suggestion_cache import suggestion_cache
+
+    suggestions = suggestion_cache.stats()
+    for result, key in (("hit", "hits"), ("disk_hit", "disk_hits"), ("miss", "misses")):
+        yield "app_suggestion_cache_lookups_total", "counter", (("result", result),), suggestions[key]
+    yield "app_suggestion_cache_entries", "gauge", (), suggestions["size"]
+    responses = response_cache.stats()
+    for result, key in (("hit", "hits"), ("not_modified", "not_modified"), ("miss", "misses")):
+        yield "app_response_cache_lookups_total", "counter", (("result", result),), responses[key]
+    gemini = client.stats()
+    for state in ("closed", "open", "half_open"):
+        yield "app_llm_circuit_state", "gauge", (("state", state),), int(gemini["state"] == state)
+
+
+class Metrics:
+    """Flask extension installing the request hooks, DB listeners and the /metrics route."""
+
+    def __init__(self, app=None):
+        self.token = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        global _enabled
+        app.config.setdefault('METRICS_ENABLED', True)
+        app.config.setdefault('METRICS_PATH', '/metrics')
+        app.config.setdefault('METRICS_TOKEN', None)
+        _enabled = app.config['METRICS_ENABLED']
+        if not _enabled:
+            return
+        if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.teardown_request(self._clear_request)
+        self.token = app.config['METRICS_TOKEN']
+        app.add_url_rule(app.config['METRICS_PATH'], 'metrics', self._metrics_view)
+        if _collect_caches not in registry._collectors:
+            registry.add_collector(_collect_caches)
+        app.extensions['metrics'] = registry
+
+    @staticmethod
+    def _start_request():
+        request.environ['metrics.started'] = time.perf_counter()
+        _request_spans.set([])
+        _request_db.set([0, 0.0])
+
+    @staticmethod
+    def _finish_request(response):
+        started = request.environ.get('metrics.started')
+        if started is None:
+            return response
+        total = time.perf_counter() - started
+        endpoint = request.endpoint or "unmatched"
+        db = _request_db.get() or [0, 0.0]
+        registry.observe("app_request_duration_seconds", (("endpoint", endpoint), ("method", request.method)), total)
+        registry.observe("app_request_db_queries", (("endpoint", endpoint),), db[0], buckets=QUERY_COUNT_BUCKETS)
+        registry.inc("app_requests_total", (
+            ("endpoint", endpoint), ("method", request.method), ("status", str(response.status_code)),
+        ))
+        response.headers["Server-Timing"] = server_timing(_request_spans.get() or (), db, total)
+        return response
+
+    @staticmethod
+    def _clear_request(exc):
+        _request_spans.set(None)
+        _request_db.set(None)
+
+    def _metrics_view(self):
+        if not self.token:
+            abort(404)
+        scheme, _, supplied = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.encode(), self.token.encode()):
+            abort(403)
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+
+metrics = Metrics()
@@ -1,30 +1,174 @@
-import spacy
-from dateparser.search import search_dates
-from app.utils.priority import calculate_priority
+import os
+import threading
+from collections import OrderedDict
+from app.utils.lazy import lazy
+from app.utils.metrics import timed
+from app.utils.nlp_workers import nlp_pool
+from app.utils.priority import calculate_priority, title_sentiment
 import re
-from datetime import datetime
+from datetime import datetime, timedelta
 
-nlp = spacy.load('en_core_web_sm')
 
-def parse_user_input(input_text):
+@lazy("spacy")
+def get_nlp():
+    """The spaCy pipeline, loaded on first use."""
+    import spacy
+    return spacy.load('en_core_web_sm')
+
+
+@lazy("dateparser")
+def _search_dates():
+    from dateparser.search import search_dates
+    return search_dates
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+_WEEKDAY_GROUP = "|".join(WEEKDAYS)
+
+# Precompiled once at import instead of 14 regexes per call
+_COMING_DAY_RE = re.compile(r'\bcoming\s+(' + _WEEKDAY_GROUP + r')\b', re.IGNORECASE)
+_WEEKDAY_RE = re.compile(r'\b(?:' + _WEEKDAY_GROUP + r")\b(?!['’])", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Any token dateparser could plausibly turn into an English date. If none of
+# these appear in the title we skip dateparser entirely.
+_CANDIDATE_TOKEN_RE = re.compile(
+    r"\d"
+    r"|\b(?:today|tonight|tomorrow|tmrw|yesterday|now|noon|midnight|morning|afternoon|evening|night"
+    r"|next|last|ago|weekend|fortnight"
+    r"|days?|weeks?|months?|years?|hours?|hrs?|minutes?|mins?|seconds?|secs?|am|pm|eod"
+    r"|mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun"
+    r"|jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec"
+    r"|january|february|march|april|june|july|august|september|october|november|december"
+    r"|" + _WEEKDAY_GROUP + r")\b",
+    re.IGNORECASE,
+)
+
+# Phrases the rule-based scanner resolves on its own. A leading "on" is part of the
+# phrase; possessives ("today's", "Monday's") are not dates.
+_FAST_PHRASE_RE = re.compile(
+    r"(?:\bon\s+)?(?:\b(?P<relday>today|tomorrow)\b(?!['’])"
+    r"|\b(?:(?:next|this)\s+)?(?P<weekday>" + _WEEKDAY_GROUP + r")\b(?!['’])"
+    r"|\b(?P<iso>\d{4}-\d{2}-\d{2})\b)"
+    r"|\bin\s+(?P<count>\d{1,3}|a|an|one)\s+(?P<unit>days?|weeks?)\b",
+    re.IGNORECASE,
+)
+
+_DATEPARSER_SETTINGS = {
+    'PREFER_DATES_FROM': 'future',  # Prefer future dates when ambiguous
+    'RETURN_AS_TIMEZONE_AWARE': False,  # Return naive datetime objects
+    'STRICT_PARSING': False,  # Disable strict parsing to allow relative dates like "tomorrow"
+}
+
+PARSE_CACHE_SIZE = int(os.getenv("NLP_PARSE_CACHE_SIZE", "2048"))
+
+
+class _ParseCache:
+    """Bounded LRU of parse results keyed by (normalized text, relative-base day).
+
+    Relative dates ("tomorrow", "in 3 days") are stored as an offset from the
+    relative base so a hit later the same day keeps the caller's time of day.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+_parse_cache = _ParseCache(PARSE_CACHE_SIZE)
+
+
+def parse_cache_info():
+    return _parse_cache.info()
+
+
+def clear_parse_cache():
+    _parse_cache.clear()
+
+
+def _fast_scan(input_text, relative_base):
+    """
+    Rule-based scanner for the common phrasings.
+
+    Returns (parsed_date, matched_phrase, is_relative), (None, None, False) when the
+    text has no date candidates at all, or None when dateparser has to decide.
+    """
+    candidates = [m.span() for m in _CANDIDATE_TOKEN_RE.finditer(input_text)]
+    if not candidates:
+        return None, None, False
+
+    matches = list(_FAST_PHRASE_RE.finditer(input_text))
+    if len(matches) != 1:
+        return None
+    match = matches[0]
+    start, end = match.span()
+    # Every candidate token must be explained by the phrase we recognized,
+    # otherwise ("at 5pm tomorrow", "in 2 months") leave it to dateparser.
+    if any(c_start < start or c_end > end for c_start, c_end in candidates):
+        return None
+
+    if match.group("relday"):
+        days = 1 if match.group("relday").lower() == "tomorrow" else 0
+        return relative_base + timedelta(days=days), match.group(0), True
+
+    if match.group("weekday"):
+        target = [d.lower() for d in WEEKDAYS].index(match.group("weekday").lower())
+        # Same semantics as dateparser with PREFER_DATES_FROM=future: the upcoming
+        # occurrence, a full week ahead when it is today, at midnight.
+        steps = (target - relative_base.weekday()) % 7 or 7
+        day = relative_base.date() + timedelta(days=steps)
+        return datetime.combine(day, datetime.min.time()), match.group(0), False
+
+    if match.group("unit"):
+        count = match.group("count").lower()
+        count = 1 if count in ("a", "an", "one") else int(count)
+        days = count * 7 if match.group("unit").lower().startswith("week") else count
+        return relative_base + timedelta(days=days), match.group(0), True
+
+    try:
+        parsed = datetime.strptime(match.group("iso"), "%Y-%m-%d")
+    except ValueError:
+        return None
+    return parsed, match.group(0), False
+
+
+def _search_dates_parse(input_text, relative_base):
+    """Full dateparser pass, used when the scanner can't resolve the text itself."""
     parsed_date = None
     cleaned_task = input_text
-    # Define weekdays
-    weekdays = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    
-    # Replace "coming <day>" with "next <day>" for better date parsing
-    for day in weekdays:
-        pattern = r'\bcoming\s+' + day + r'\b'
-        replacement = 'next ' + day
-        input_text = re.sub(pattern, replacement, input_text, flags=re.IGNORECASE)
-    
-    settings = {
-        'PREFER_DATES_FROM': 'future',  # Prefer future dates when ambiguous
-        'RELATIVE_BASE': datetime.now(),  # Use current date as base for relative dates
-        'RETURN_AS_TIMEZONE_AWARE': False,  # Return naive datetime objects
-        'STRICT_PARSING': False,  # Disable strict parsing to allow relative dates like "tomorrow"
-    }
-    results = search_dates(input_text, settings=settings)
+    settings = dict(_DATEPARSER_SETTINGS, RELATIVE_BASE=relative_base)
+    results = _search_dates()(input_text, settings=settings)
     if results:
         # Extract the first valid parsed date
         for phrase, date_obj in results:
@@ -34,15 +178,73 @@ def parse_user_input(input_text):
                 for phrase_to_remove, _ in results:
                     cleaned_task = re.sub(re.escape(phrase_to_remove), '', input_text, flags=re.IGNORECASE)
                 break
-    else:
-        cleaned_task = input_text
+    return parsed_date, cleaned_task
 
-    # Remove weekday names from cleaned_task to avoid leftover day names
-    for day in weekdays:
-        cleaned_task = re.sub(r'\b' + day + r'\b', '', cleaned_task, flags=re.IGNORECASE)
 
+def _clean_title(cleaned_task):
+    # Remove weekday names from cleaned_task to avoid leftover day names
+    cleaned_task = _WEEKDAY_RE.sub('', cleaned_task)
     # Remove extra whitespace and punctuation only
-    cleaned_task = re.sub(r'\s+', ' ', cleaned_task).strip(" ,.-")
+    return _WHITESPACE_RE.sub(' ', cleaned_task).strip(" ,.-")
+
+
+def _parse_uncached(input_text, relative_base):
+    fast = _fast_scan(input_text, relative_base)
+    if fast is None:
+        parsed_date, cleaned_task = _search_dates_parse(input_text, relative_base)
+        is_relative = parsed_date is not None and parsed_date.time() == relative_base.time()
+    else:
+        parsed_date, phrase, is_relative = fast
+        cleaned_task = input_text.replace(phrase, ' ', 1) if phrase else input_text
+
+    cleaned_task = _clean_title(cleaned_task)
+    sentiment = title_sentiment(cleaned_task)
+    priority = calculate_priority(cleaned_task, parsed_date.date() if parsed_date else None, sentiment)
+    return parsed_date, is_relative, cleaned_task, priority, sentiment
+
+
+def parse_entries(input_texts, relative_base):
+    """
+    Parse cache entries (stored_date, cleaned_task, priority, sentiment) for
+    normalized inputs, computed here. NLP worker processes run this.
+    """
+    entries = []
+    for input_text in input_texts:
+        parsed_date, is_relative, cleaned_task, priority, sentiment = _parse_uncached(input_text, relative_base)
+        stored_date = parsed_date - relative_base if is_relative else parsed_date
+        entries.append((stored_date, cleaned_task, priority, sentiment))
+    return entries
+
+
+def _normalize(input_text):
+    # Replace "coming <day>" with "next <day>" for better date parsing
+    return _COMING_DAY_RE.sub(r'next \1', input_text)
+
+
+def _cached_entries(input_texts, relative_base):
+    """Entries for normalized inputs, from the parse cache or else parsed (on the NLP workers when enabled)."""
+    keys = [(_WHITESPACE_RE.sub(' ', input_text).strip(), relative_base.date()) for input_text in input_texts]
+    entries = [_parse_cache.get(key) for key in keys]
+    missing = {}  # Cache key -> first input text with that key
+    for input_text, key, entry in zip(input_texts, keys, entries):
+        if entry is None:
+            missing.setdefault(key, input_text)
+    if missing:
+        texts = list(missing.values())
+        if nlp_pool.enabled:
+            computed = nlp_pool.parse(texts, relative_base, parse_entries)
+        else:
+            computed = parse_entries(texts, relative_base)
+        found = dict(zip(missing, computed))
+        for key, entry in found.items():
+            _parse_cache.put(key, entry)
+        entries = [entry if entry is not None else found[key] for key, entry in zip(keys, entries)]
+    return entries
+
+
+def _result(input_text, entry, relative_base):
+    stored_date, cleaned_task, priority, sentiment = entry
+    parsed_date = relative_base + stored_date if isinstance(stored_date, timedelta) else stored_date
 
     # Check for priority words
     # lowered = input_text.lower()
@@ -55,12 +257,34 @@ def parse_user_input(input_text):
     #     if any(word in lowered for word in words):
     #         priority = priority_level
     #         break
-    
-    priority = calculate_priority(cleaned_task, parsed_date.date() if parsed_date else None)
 
     return {
         "title": input_text,
         "cleaned_task": cleaned_task,
         "due_date": parsed_date.isoformat() if parsed_date else None,
-        "priority": priority
+        "priority": priority,
+        "sentiment": sentiment,
     }
+
+
+@timed("parse")
+def parse_user_input(input_text, relative_base=None):
+    """
+    Due date, cleaned title, priority and sentiment of a typed task.
+    With NLP workers enabled, may raise NLPBusy or NLPTimeout (app.utils.nlp_workers).
+    """
+    relative_base = relative_base or datetime.now()
+    input_text = _normalize(input_text)
+    return _result(input_text, _cached_entries([input_text], relative_base)[0], relative_base)
+
+
+@timed("parse_batch")
+def parse_user_inputs(input_texts, relative_base=None):
+    """
+    parse_user_input over a batch, against one shared relative_base.
+    Repeated inputs are parsed once; results come back in input order.
+    """
+    relative_base = relative_base or datetime.now()
+    input_texts = [_normalize(input_text) for input_text in input_texts]
+    entries = _cached_entries(input_texts, relative_base)
+    return [_result(input_text, entry, relative_base) for input_text, entry in zip(input_texts, entries)]
@@ -0,0 +1,172 @@
+"""
+Optional process pool (NLP_WORKERS) for the CPU-bound, GIL-holding part of parse_user_input.
+Cache misses go to spawned workers in batches; callers get NLPBusy past NLP_QUEUE_WAIT and
+NLPTimeout past NLP_TIMEOUT. Until the workers are up, or if the pool breaks, parsing
+happens in-process.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+from app.utils.metrics import count, span
+
+logger = logging.getLogger(__name__)
+
+
+class NLPWorkerError(RuntimeError):
+    """The worker pool couldn't parse a batch in time."""
+
+
+class NLPBusy(NLPWorkerError):
+    """Every pool slot stayed taken for NLP_QUEUE_WAIT seconds."""
+
+
+class NLPTimeout(NLPWorkerError):
+    """A batch took longer than NLP_TIMEOUT seconds."""
+
+
+def _init_worker():
+    from datetime import datetime
+    from app.utils.lazy import warmup
+    from app.utils.nlp_parser import parse_entries
+
+    warmup(["dateparser", "textblob"])
+    parse_entries(["warm up the parser tomorrow at 5pm"], datetime.now())
+
+
+def _ping():
+    return os.getpid()
+
+
+def _parse_batch(input_texts, relative_base):
+    from app.utils.nlp_parser import parse_entries
+
+    return parse_entries(input_texts, relative_base)
+
+
+class NLPWorkerPool:
+    """Flask extension owning the worker processes; disabled (in-process parsing) while workers == 0."""
+
+    def __init__(self, app=None):
+        self.workers = 0
+        self.max_pending = 0
+        self.queue_wait = 0.5
+        self.timeout = 5.0
+        self.chunk_size = 64
+        self._executor = None
+        self._pid = None
+        self._slots = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('NLP_WORKERS', 0)
+        app.config.setdefault('NLP_MAX_PENDING', 0)  # 0: four batches per worker
+        app.config.setdefault('NLP_QUEUE_WAIT', 0.5)
+        app.config.setdefault('NLP_TIMEOUT', 5.0)
+        app.config.setdefault('NLP_CHUNK_SIZE', 64)
+        self.shutdown()
+        self.workers = app.config['NLP_WORKERS']
+        self.max_pending = app.config['NLP_MAX_PENDING'] or 4 * self.workers
+        self.queue_wait = app.config['NLP_QUEUE_WAIT']
+        self.timeout = app.config['NLP_TIMEOUT']
+        self.chunk_size = app.config['NLP_CHUNK_SIZE']
+        app.extensions['nlp_workers'] = self
+
+    @property
+    def enabled(self):
+        return self.workers > 0
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # A pool inherited through fork belongs to the parent; start our own
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+                self._pid = os.getpid()
+                self._slots = threading.BoundedSemaphore(self.max_pending)
+                self._ready = threading.Event()
+                self._warm_up(self._executor, self._ready)
+            return self._executor, self._slots, self._ready
+
+    def _warm_up(self, executor, ready):
+        """Start every worker (each loads the models in its initializer); set ready once all have answered."""
+        pending = [self.workers]
+        lock = threading.Lock()
+
+        def answered(future):
+            if future.cancelled() or future.exception() is not None:
+                return  # Broken pool; the next parse() replaces it
+            with lock:
+                pending[0] -= 1
+                if pending[0] == 0:
+                    ready.set()
+
+        for _ in range(self.workers):
+            executor.submit(_ping).add_done_callback(answered)
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._pid == os.getpid():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def parse(self, input_texts, relative_base, fallback):
+        """
+        Parse cache entries for input_texts, computed by the workers; fallback(texts,
+        relative_base) is the in-process equivalent, used while the workers start
+        and if the pool breaks. Raises NLPBusy or NLPTimeout.
+        """
+        executor, slots, ready = self._pool()
+        if not ready.is_set():
+            count("app_nlp_pool_calls_total", outcome="starting")
+            return fallback(input_texts, relative_base)
+        deadline = time.monotonic() + self.timeout
+        chunk = max(1, min(self.chunk_size, -(-len(input_texts) // self.workers)))
+        futures = []
+        with span("nlp_pool"):
+            try:
+                for start in range(0, len(input_texts), chunk):
+                    if not slots.acquire(timeout=self.queue_wait):
+                        count("app_nlp_pool_calls_total", outcome="busy")
+                        raise NLPBusy(f"NLP workers busy: {self.max_pending} batches pending")
+                    try:
+                        future = executor.submit(_parse_batch, input_texts[start:start + chunk], relative_base)
+                    except BaseException:
+                        slots.release()
+                        raise
+                    future.add_done_callback(lambda _, slots=slots: slots.release())
+                    futures.append(future)
+                entries = []
+                for future in futures:
+                    entries.extend(future.result(timeout=max(0.0, deadline - time.monotonic())))
+            except FuturesTimeout:
+                count("app_nlp_pool_calls_total", outcome="timeout")
+                raise NLPTimeout(f"NLP workers didn't parse {len(input_texts)} titles within {self.timeout}s")
+            except BrokenProcessPool:
+                count("app_nlp_pool_calls_total", outcome="broken")
+                logger.warning("NLP worker pool broke; restarting it and parsing this batch in-process")
+                self._discard(executor)
+                return fallback(input_texts, relative_base)
+            finally:
+                for future in futures:
+                    future.cancel()  # Only stops batches that haven't started
+        count("app_nlp_pool_calls_total", outcome="ok")
+        return entries
+
+
+nlp_pool = NLPWorkerPool()
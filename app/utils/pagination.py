@@ -0,0 +1,76 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort, order, value, row_id):
+    """Opaque cursor pointing just past a row in the given sort order."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"s": sort, "o": order, "v": value, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, sort, order, is_datetime=False):
+    """Returns (value, row_id); raises InvalidCursor if it is malformed or from another sort order."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value, row_id = payload["v"], int(payload["id"])
+        if payload["s"] != sort or payload["o"] != order:
+            raise InvalidCursor("Cursor was issued for a different sort order.")
+        if value is not None and is_datetime:
+            value = datetime.fromisoformat(value)
+    except InvalidCursor:
+        raise
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor.") from e
+    return value, row_id
+
+
+def keyset_page(query, model, sort, order, limit, after=None):
+    """
+    One page of query in (sort, id) order, using keyset conditions instead of OFFSET.
+
+    Rows whose sort column is NULL come last, in id order. They are read by a second,
+    separate query so each query keeps a plain index-ordered scan.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    column, id_column = getattr(model, sort), model.id
+    descending = order == "desc"
+    is_datetime = getattr(column.type, "python_type", None) is datetime
+    value, row_id = decode_cursor(after, sort, order, is_datetime) if after else (None, None)
+
+    rows = []
+    in_null_tail = after is not None and value is None
+    if not in_null_tail:
+        ranked = query.filter(column.isnot(None))
+        if after is not None:
+            past = column < value if descending else column > value
+            tie = id_column < row_id if descending else id_column > row_id
+            ranked = ranked.filter(or_(past, and_(column == value, tie)))
+        ranked = ranked.order_by(
+            column.desc() if descending else column.asc(),
+            id_column.desc() if descending else id_column.asc(),
+        )
+        rows = ranked.limit(limit + 1).all()
+        row_id = None  # The NULL tail is read from its start
+
+    if len(rows) <= limit:
+        tail = query.filter(column.is_(None))
+        if row_id is not None:
+            tail = tail.filter(id_column < row_id if descending else id_column > row_id)
+        tail = tail.order_by(id_column.desc() if descending else id_column.asc())
+        rows += tail.limit(limit + 1 - len(rows)).all()
+
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort, order, getattr(last, sort), last.id)
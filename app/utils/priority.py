@@ -1,17 +1,22 @@
 from datetime import datetime
-from textblob import TextBlob
+from app.utils.lazy import lazy
+from app.utils.metrics import timed
+
+NO_DUE_DATE_DAYS = 9999  # days_left used for tasks without a due date
+
+
+@lazy("textblob")
+def _textblob():
+    from textblob import TextBlob
+    return TextBlob
 
-def calculate_priority(title, due_date):
-    sentiment = TextBlob(title).sentiment.polarity
-    if due_date is None:
-        days_left = 9999  # Assign a large number if no due date
-    else:
-        days_left = (due_date - datetime.utcnow().date()).days
 
-    print(f"Title: {title}")
-    print(f"Sentiment polarity: {sentiment}")
-    print(f"Days left: {days_left}")
+def title_sentiment(title):
+    """TextBlob polarity of a title, in [-1, 1]. Stored on Task.sentiment so it is computed once."""
+    return _textblob()(title).sentiment.polarity
 
+
+def priority_for(sentiment, days_left):
     if days_left <= 1 and sentiment < 0:
         return 1  # Urgent and negative sentiment
     elif days_left <= 3:
@@ -20,3 +25,14 @@ def calculate_priority(title, due_date):
         return 3
     else:
         return 4  # Low priority
+
+
+@timed("priority")
+def calculate_priority(title, due_date, sentiment=None):
+    if sentiment is None:
+        sentiment = title_sentiment(title)
+    if due_date is None:
+        days_left = NO_DUE_DATE_DAYS  # Assign a large number if no due date
+    else:
+        days_left = (due_date - datetime.utcnow().date()).days
+    return priority_for(sentiment, days_left)
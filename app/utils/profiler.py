@@ -0,0 +1,196 @@
+"""
+Opt-in sampling profiler for requests (PROFILE_ENABLED). A request is profiled on a
+PROFILE_SAMPLE_RATE coin flip or when it carries PROFILE_TOKEN in PROFILE_HEADER; its
+thread's stack is sampled every PROFILE_INTERVAL seconds. PROFILE_PATH serves the stacks
+in collapsed (flamegraph) format, or a summary with format=json.
+"""
+import hmac
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from flask import Response, abort, jsonify, request
+
+MAX_DEPTH = 128
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def collapse(frame):
+    """Root-first, ';'-joined frame names of a stack."""
+    names = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class Sampler:
+    """Samples the stacks of registered threads while any are registered."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self._active = {}  # Thread ident -> Counter of collapsed stacks
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self, ident):
+        with self._lock:
+            self._active[ident] = Counter()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, ident):
+        """The thread's stack counts, or None if it wasn't being sampled."""
+        with self._lock:
+            return self._active.pop(ident, None)
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            with self._lock:
+                idents = [ident for ident in self._active if ident != own]
+            if not idents:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            frames = sys._current_frames()
+            stacks = [(ident, collapse(frames[ident])) for ident in idents if ident in frames]
+            del frames
+            with self._lock:
+                for ident, stack in stacks:
+                    counts = self._active.get(ident)
+                    if counts is not None:
+                        counts[stack] += 1
+            time.sleep(self.interval)
+
+
+class Profiler:
+    """Flask extension deciding which requests to sample, keeping their profiles and serving them."""
+
+    def __init__(self, app=None):
+        self.sampler = Sampler()
+        self._profiles = {}  # Endpoint -> deque of finished profiles
+        self._lock = threading.Lock()
+        self.ring_size = 100
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PROFILE_ENABLED', False)
+        app.config.setdefault('PROFILE_SAMPLE_RATE', 0.0)
+        app.config.setdefault('PROFILE_HEADER', 'X-Profile-Token')
+        app.config.setdefault('PROFILE_TOKEN', None)
+        app.config.setdefault('PROFILE_INTERVAL', 0.005)
+        app.config.setdefault('PROFILE_RING_SIZE', 100)
+        app.config.setdefault('PROFILE_PATH', '/admin/profiles')
+        if not app.config['PROFILE_ENABLED']:
+            return
+        self.sampler.interval = app.config['PROFILE_INTERVAL']
+        self.ring_size = app.config['PROFILE_RING_SIZE']
+        self.sample_rate = app.config['PROFILE_SAMPLE_RATE']
+        self.header = app.config['PROFILE_HEADER']
+        self.token = app.config['PROFILE_TOKEN']
+        self.path = app.config['PROFILE_PATH']
+        app.before_request(self._start_request)
+        app.after_request(self._tag_response)
+        app.teardown_request(self._finish_request)
+        app.add_url_rule(self.path, 'profiles', self._profiles_view)
+        app.extensions['profiler'] = self
+
+    def _authorized(self):
+        supplied = request.headers.get(self.header)
+        return bool(self.token and supplied) and hmac.compare_digest(supplied.encode(), self.token.encode())
+
+    def _start_request(self):
+        if request.path == self.path:
+            return
+        if not (self._authorized() or (self.sample_rate and random.random() < self.sample_rate)):
+            return
+        request.environ['profile'] = {
+            "id": uuid.uuid4().hex[:16],
+            "thread": threading.get_ident(),
+            "started": time.time(),
+            "perf_started": time.perf_counter(),
+        }
+        self.sampler.start(threading.get_ident())
+
+    def _tag_response(self, response):
+        profile = request.environ.get('profile')
+        if profile is not None:
+            response.headers["X-Profile-Id"] = profile["id"]
+        return response
+
+    def _finish_request(self, exc):
+        profile = request.environ.pop('profile', None)
+        if profile is None:
+            return
+        stacks = self.sampler.stop(profile["thread"])
+        endpoint = request.endpoint or "unmatched"
+        record = {
+            "id": profile["id"],
+            "endpoint": endpoint,
+            "method": request.method,
+            "path": request.path,
+            "started": profile["started"],
+            "seconds": time.perf_counter() - profile["perf_started"],
+            "stacks": stacks or Counter(),
+        }
+        with self._lock:
+            ring = self._profiles.get(endpoint)
+            if ring is None:
+                ring = self._profiles[endpoint] = deque(maxlen=self.ring_size)
+            ring.append(record)
+
+    def profiles(self, window=None, endpoint=None):
+        """Finished profiles, oldest first, optionally only the last `window` seconds' or one endpoint's."""
+        since = time.time() - window if window else 0
+        with self._lock:
+            rings = [self._profiles.get(endpoint, ())] if endpoint else list(self._profiles.values())
+            found = [record for ring in rings for record in ring if record["started"] >= since]
+        return sorted(found, key=lambda record: record["started"])
+
+    @staticmethod
+    def collapsed(profiles):
+        """Merged stacks in collapsed format, each rooted at its endpoint."""
+        merged = Counter()
+        for record in profiles:
+            for stack, samples in record["stacks"].items():
+                merged[f"{record['endpoint']};{stack}"] += samples
+        return "".join(f"{stack} {samples}\n" for stack, samples in merged.most_common())
+
+    def _profiles_view(self):
+        if not self.token:
+            abort(404)
+        if not self._authorized():
+            abort(403)
+        try:
+            window = float(request.args.get("window", 300))
+        except ValueError:
+            abort(400)
+        found = self.profiles(window, request.args.get("endpoint"))
+        if request.args.get("format") == "json":
+            return jsonify([
+                {
+                    **{key: value for key, value in record.items() if key != "stacks"},
+                    "samples": sum(record["stacks"].values()),
+                    "top": [{"stack": stack, "samples": samples} for stack, samples in record["stacks"].most_common(5)],
+                }
+                for record in found
+            ])
+        return Response(
+            self.collapsed(found),
+            mimetype="text/plain",
+            headers={"Content-Disposition": "attachment; filename=profiles.collapsed"},
+        )
+
+
+profiler = Profiler()
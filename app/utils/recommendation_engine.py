@@ -1,32 +1,267 @@
-from sklearn.metrics.pairwise import cosine_similarity
-from app.models import Task, User
-import pandas as pd
-
-def build_user_task_matrix(user_id):          
-    # Get the user's tasks filtered by user_id
-    tasks = Task.query.filter_by(user_id=user_id).all()
-    data = [{"user_id": task.user_id, "task_title": task.title} for task in tasks]
-    
-    if not data:
-        # Return empty DataFrame with expected columns to avoid KeyError
-        return pd.DataFrame(columns=['user_id', 'task_title'])
-    
-    df = pd.DataFrame(data)
-    user_task_matrix = df.pivot_table(index='user_id', columns='task_title', aggfunc=lambda x: 1, fill_value=0)
-    
-    return user_task_matrix
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from app import db
+from sqlalchemy import delete, true, update
+from app.models import Task, TaskTitleIndex, User
+from app.utils.counters import add_counts
+from app.utils.metrics import timed
+from app.utils.response_cache import bump_data_versions
 
+REFRESH_SECONDS = float(os.getenv("TITLE_INDEX_REFRESH_SECONDS", "5"))
+REFRESH_CHUNK = 500
+# Distinct users a title needs before it's recommended to anyone
+MIN_USERS = int(os.getenv("TITLE_INDEX_MIN_USERS", "3"))
+
+
+def normalize_title(task_title):
+    return " ".join(task_title.lower().split())[:100]
+
+
+class CooccurrenceIndex:
+    """
+    Sparse user x title incidence matrix for item-item recommendations.
+
+    Stored both row-wise (user -> titles, the CSR rows) and column-wise
+    (title -> users, the CSC columns), so the similarity row for one title is a
+    sparse product touching only the users who have that title instead of a dense
+    titles x titles matrix. Similarity is the cosine between binary title columns.
+
+    Rows of very popular titles are estimated from a sample of max_neighbour_users
+    users, and rankings are memoized for result_ttl seconds (dropped early when the
+    title's own column changes). Only titles at least min_users distinct users have
+    are ever recommended, so one user's own wording never reaches anyone else.
+    """
+
+    def __init__(self, max_neighbour_users=128, result_ttl=300, min_users=1):
+        self.max_neighbour_users = max_neighbour_users
+        self.result_ttl = result_ttl
+        self.min_users = min_users
+        self._titles_by_user = defaultdict(set)
+        self._users_by_title = defaultdict(set)
+        self._display = {}
+        self._results = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return sum(len(users) for users in self._users_by_title.values())
+
+    def add(self, user_id, title_key, title=None):
+        with self._lock:
+            self._titles_by_user[user_id].add(title_key)
+            self._users_by_title[title_key].add(user_id)
+            self._display.setdefault(title_key, title or title_key)
+            self._results.pop(title_key, None)
+
+    def remove(self, user_id, title_key):
+        with self._lock:
+            titles = self._titles_by_user.get(user_id)
+            if titles is not None:
+                titles.discard(title_key)
+                if not titles:
+                    del self._titles_by_user[user_id]
+            users = self._users_by_title.get(title_key)
+            if users is not None:
+                users.discard(user_id)
+                if not users:
+                    del self._users_by_title[title_key]
+                    self._display.pop(title_key, None)
+            self._results.pop(title_key, None)
+
+    def replace_user(self, user_id, titles):
+        """Make user_id's row exactly titles ({title_key: title})."""
+        with self._lock:
+            for title_key in set(self._titles_by_user.get(user_id, ())) - titles.keys():
+                self.remove(user_id, title_key)
+            for title_key, title in titles.items():
+                if title_key not in self._titles_by_user.get(user_id, ()):
+                    self.add(user_id, title_key, title)
+
+    def clear(self):
+        with self._lock:
+            self._titles_by_user.clear()
+            self._users_by_title.clear()
+            self._display.clear()
+            self._results.clear()
+
+    def similar(self, title_key, top_n=3, exclude_user=None):
+        """Top-N (title, score) pairs co-occurring with title_key, best first, skipping exclude_user's own titles."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._results.get(title_key)
+            if cached is None or cached[0] <= now or cached[1] < top_n:
+                cached = (now + self.result_ttl, top_n, self._rank(title_key, top_n))
+                self._results[title_key] = cached
+            own = self._titles_by_user.get(exclude_user, ())
+            # Popularity is checked again here: a title may have lost users since it was ranked
+            return [
+                (title, score) for other, title, score in cached[2]
+                if other not in own and len(self._users_by_title.get(other, ())) >= self.min_users
+            ][:top_n]
+
+    def _rank(self, title_key, top_n):
+        """(title_key, title, score) candidates for title_key, best first. Call with _lock held."""
+        users = self._users_by_title.get(title_key)
+        if not users:
+            return []
+        counts = Counter()
+        for user_id in itertools.islice(users, self.max_neighbour_users):
+            counts.update(self._titles_by_user[user_id])
+        counts.pop(title_key, None)
+
+        # Rank by raw co-occurrence first, then cosine-normalize the short list. The
+        # list is kept longer than top_n so callers' own titles can be skipped from it.
+        norm = len(users)
+        scored = [
+            (count / math.sqrt(norm * len(self._users_by_title[other])), other)
+            for other, count in counts.most_common(top_n * 10)
+            if len(self._users_by_title[other]) >= self.min_users
+        ]
+        return [(other, self._display[other], score) for score, other in sorted(scored, reverse=True)]
+
+_index = CooccurrenceIndex(min_users=MIN_USERS)
+_loaded = False
+_versions = {}  # user_id -> the User.data_version _index holds that user's row at
+_checked_at = 0.0
+_load_lock = threading.Lock()  # Also held while this process's commits are applied to _index
+
+
+def _ensure_loaded():
+    """
+    Load the persisted matrix into this process on first use.
+
+    Other worker processes write task_title_index too. At most every REFRESH_SECONDS
+    the users' data_versions are compared with the ones _index was loaded at, and the
+    rows of the users whose version moved are read again.
+    """
+    global _loaded, _checked_at
+    if _loaded and time.monotonic() - _checked_at < REFRESH_SECONDS:
+        return
+    with _load_lock:
+        now = time.monotonic()
+        if _loaded and now - _checked_at < REFRESH_SECONDS:
+            return
+        # Versions first: rows read afterwards are at least as new as the versions recorded for them
+        versions = dict(db.session.query(User.id, User.data_version))
+        columns = (TaskTitleIndex.user_id, TaskTitleIndex.title_key, TaskTitleIndex.title)
+        if not _loaded:
+            for user_id, title_key, title in db.session.query(*columns).yield_per(10000):
+                _index.add(user_id, title_key, title)
+        else:
+            stale = [user_id for user_id, version in versions.items() if _versions.get(user_id) != version]
+            stale += [user_id for user_id in _versions if user_id not in versions]
+            for start in range(0, len(stale), REFRESH_CHUNK):
+                chunk = stale[start:start + REFRESH_CHUNK]
+                rows = defaultdict(dict)
+                for user_id, title_key, title in db.session.query(*columns).filter(TaskTitleIndex.user_id.in_(chunk)):
+                    rows[user_id][title_key] = title
+                for user_id in chunk:
+                    _index.replace_user(user_id, rows[user_id])
+        _versions.clear()
+        _versions.update(versions)
+        _loaded, _checked_at = True, now
+
+
+def versions_committed(versions):
+    """
+    This process committed {user_id: (data_version before, after)} and has applied
+    those changes to _index: users it held at `before` are current at `after`.
+    """
+    with _load_lock:
+        for user_id, (before, after) in versions.items():
+            if _versions.get(user_id) == before:
+                _versions[user_id] = after
+
+
+def index_tasks(pairs):
+    """Count new (user_id, title) occurrences in one pass. Call before the tasks' commit."""
+    from app.utils.task_hooks import after_commit
+
+    counts = Counter()
+    display = {}
+    for user_id, task_title in pairs:
+        key = (int(user_id), normalize_title(task_title))
+        counts[key] += 1
+        display.setdefault(key, task_title)
+
+    add_counts(
+        TaskTitleIndex,
+        [
+            {"user_id": user_id, "title_key": title_key, "title": display[(user_id, title_key)], "task_count": count}
+            for (user_id, title_key), count in sorted(counts.items())
+        ],
+        keys=("user_id", "title_key"),
+        counters=("task_count",),
+    )
+
+    def apply():
+        with _load_lock:
+            for (user_id, title_key), title in display.items():
+                _index.add(user_id, title_key, title)
+    after_commit(apply)
+
+
+def index_task(user_id, task_title):
+    """Count a new (user, title) occurrence. Call before the task's commit."""
+    index_tasks([(user_id, task_title)])
+
+
+def unindex_task(user_id, task_title):
+    """Drop one (user, title) occurrence. Call before the task's commit."""
+    from app.utils.task_hooks import after_commit
+
+    user_id, title_key = int(user_id), normalize_title(task_title)
+    cell = (TaskTitleIndex.user_id == user_id, TaskTitleIndex.title_key == title_key)
+    # Decrement and drop-at-zero as two single statements, so concurrent writers can't lose counts
+    db.session.execute(update(TaskTitleIndex).where(*cell).values(task_count=TaskTitleIndex.task_count - 1))
+    emptied = db.session.execute(delete(TaskTitleIndex).where(*cell, TaskTitleIndex.task_count <= 0)).rowcount
+    if emptied:
+        def apply():
+            with _load_lock:
+                _index.remove(user_id, title_key)
+        after_commit(apply)
+
+
+def rebuild_index():
+    """
+    Recompute task_title_index from the task table (cold start / repair). Returns the cell count.
+    Bumps every user's data_version, so running workers reload the index too.
+    """
+    global _loaded, _checked_at
+    counts = Counter()
+    display = {}
+    for user_id, title in db.session.query(Task.user_id, Task.title).yield_per(10000):
+        key = (int(user_id), normalize_title(title))
+        counts[key] += 1
+        display.setdefault(key, title)
+
+    TaskTitleIndex.query.delete()
+    db.session.bulk_insert_mappings(TaskTitleIndex, [
+        {"user_id": user_id, "title_key": title_key, "title": display[(user_id, title_key)], "task_count": count}
+        for (user_id, title_key), count in counts.items()
+    ])
+    bump_data_versions(db.session, true())
+    db.session.commit()
+
+    with _load_lock:
+        _index.clear()
+        for (user_id, title_key), _ in counts.items():
+            _index.add(user_id, title_key, display[(user_id, title_key)])
+        _versions.clear()
+        _versions.update(db.session.query(User.id, User.data_version))
+        _loaded, _checked_at = True, time.monotonic()
+    return len(counts)
+
+
+@timed("similar")
 def get_similar_tasks(user_id, task_title, top_n=3):
-    matrix = build_user_task_matrix(user_id)
-    
-    if task_title not in matrix.columns:
-        return []  # Or fallback to AI suggestions
-    
-    similarity_matrix = cosine_similarity(matrix.T)
-    task_index = list(matrix.columns).index(task_title)
-    
-    similar_task_scores = similarity_matrix[task_index]
-    top_indices = similar_task_scores.argsort()[::-1][1:top_n+1]
-    
-    similar_tasks = [matrix.columns[i] for i in top_indices]
-    return similar_tasks
+    """
+    Titles that users who have task_title also have, ranked by cosine similarity.
+    Leaves out user_id's own titles and titles fewer than MIN_USERS users have.
+    """
+    _ensure_loaded()
+    return [title for title, _ in _index.similar(normalize_title(task_title), top_n, exclude_user=int(user_id))]
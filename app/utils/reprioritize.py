@@ -0,0 +1,180 @@
+"""
+Periodic job that recomputes stored priority and urgency, which go stale as due dates
+approach: open tasks are read in id-ordered chunks, scored with NumPy, and only changed rows written.
+"""
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import or_, select, update
+from app import db
+from app.models import Task, User
+from app.utils.lazy import get_numpy
+from app.utils.priority import NO_DUE_DATE_DAYS, title_sentiment
+from app.utils import task_hooks
+from app.utils.response_cache import bump_data_versions
+
+CHUNK_SIZE = 100000
+
+
+EPOCH = datetime(1970, 1, 1)
+SECONDS_PER_DAY = 86400
+
+
+def _seconds(moment):
+    return (moment - EPOCH).total_seconds()
+
+
+def compute(due, sentiment, today, now):
+    """
+    Vectorized priority_for() and the creation-time urgency rule.
+
+    due holds naive due datetimes as seconds since 1970-01-01 (NaN when there is no
+    due date) and sentiment the title polarities. Returns (priority, urgent):
+    priority as calculate_priority would give it on `today`, urgent where the
+    due date is at most one day after `now`.
+    """
+    np = get_numpy()
+    has_due = ~np.isnan(due)
+    today_day = (today - EPOCH.date()).days
+    days_left = np.where(has_due, np.floor(due / SECONDS_PER_DAY) - today_day, NO_DUE_DATE_DAYS)
+    priority = np.select(
+        [(days_left <= 1) & (sentiment < 0), days_left <= 3, days_left <= 7],
+        [1, 2, 3],
+        4,
+    )
+    with np.errstate(invalid="ignore"):
+        urgent = due - _seconds(now) <= SECONDS_PER_DAY  # False for NaN
+    return priority, urgent
+
+
+def recompute_chunk(rows, today, now):
+    """
+    Rows of (id, due_date, sentiment, priority, status) -> UPDATE parameter dicts for the changed ones.
+
+    Priority follows the due date both ways. 'pending' (or unset) tasks due within a day
+    become 'urgent', as TasksList.post does at creation, and 'urgent' tasks that no
+    longer are (their due date moved out) go back to 'pending'. Other statuses are kept.
+    """
+    np = get_numpy()
+    ids, due_dates, sentiments, priorities, statuses = zip(*rows)
+    # datetime -> float seconds in Python is several times faster than numpy's datetime64 conversion
+    due = np.array([_seconds(due_date) if due_date else np.nan for due_date in due_dates])
+    sentiment = np.nan_to_num(np.array(sentiments, dtype=np.float64))  # NULL -> 0.0
+    old_priority = np.nan_to_num(np.array(priorities, dtype=np.float64))
+    status = np.array(statuses, dtype=object)
+    pending = (status == "pending") | (status == None)  # noqa: E711  elementwise NULL check
+
+    priority, urgent = compute(due, sentiment, today, now)
+    promote = pending & urgent
+    demote = (status == "urgent") & ~urgent
+    changed = np.flatnonzero((priority != old_priority) | promote | demote)
+    return [
+        {
+            "id": ids[i],
+            "priority": int(priority[i]),
+            "status": "urgent" if promote[i] else "pending" if demote[i] else statuses[i],
+        }
+        for i in changed.tolist()
+    ]
+
+
+def _open_tasks():
+    return or_(Task.status.is_(None), Task.status != "completed")
+
+
+def backfill_sentiment(chunk_size=CHUNK_SIZE):
+    """Compute Task.sentiment where it is missing on open tasks. Returns the number of rows filled."""
+    filled, last_id = 0, 0
+    while True:
+        rows = (
+            db.session.query(Task.id, Task.title)
+            .filter(_open_tasks(), Task.sentiment.is_(None), Task.id > last_id)
+            .order_by(Task.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            return filled
+        db.session.execute(update(Task), [
+            {"id": task_id, "sentiment": title_sentiment(title or "")} for task_id, title in rows
+        ])
+        db.session.commit()
+        filled += len(rows)
+        last_id = rows[-1][0]
+
+
+def reprioritize(chunk_size=CHUNK_SIZE):
+    """Recompute priority/urgency of every open task and store what changed. Returns run statistics."""
+    start = time.perf_counter()
+    sentiments = backfill_sentiment(chunk_size)
+    today, now = datetime.utcnow().date(), datetime.now()
+
+    scanned, updated, last_id = 0, 0, 0
+    while True:
+        rows = (
+            db.session.query(Task.id, Task.due_date, Task.sentiment, Task.priority, Task.status, Task.user_id)
+            .filter(_open_tasks(), Task.id > last_id)
+            .order_by(Task.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            break
+        changes = recompute_chunk([row[:5] for row in rows], today, now)
+        if changes:
+            db.session.execute(update(Task), changes)
+            # Bulk UPDATEs skip the flush hooks; bump every owner in the chunk's id range instead
+            owners = select(Task.user_id).where(_open_tasks(), Task.id > last_id, Task.id <= rows[-1][0])
+            bump_data_versions(db.session, User.id.in_(owners))
+            # ...and tell the owners whose tasks changed to refetch (one event per owner and chunk, sent on commit)
+            owner_of = {row[0]: row[5] for row in rows}
+            task_hooks.tasks_changed(Counter(owner_of[change["id"]] for change in changes))
+            db.session.commit()
+        scanned += len(rows)
+        updated += len(changes)
+        last_id = rows[-1][0]
+
+    return {
+        "open_tasks": scanned,
+        "sentiments_computed": sentiments,
+        "updated": updated,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+class Reprioritizer:
+    """
+    Runs reprioritize() every REPRIORITIZE_INTERVAL seconds on a daemon thread.
+
+    Disabled by default (REPRIORITIZE_INTERVAL = 0). With several worker processes
+    each one would run the job, so there prefer scheduling
+    `flask tasks reprioritize` from cron instead.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('REPRIORITIZE_INTERVAL', 0)
+        interval = app.config['REPRIORITIZE_INTERVAL']
+        if interval:
+            thread = threading.Thread(target=self._loop, args=(app, interval), name='reprioritize', daemon=True)
+            app.extensions['reprioritizer'] = thread
+            thread.start()
+
+    @staticmethod
+    def _loop(app, interval):
+        while True:
+            time.sleep(interval)
+            with app.app_context():
+                try:
+                    stats = reprioritize()
+                    app.logger.info("Reprioritized open tasks: %s", stats)
+                except Exception as e:
+                    db.session.rollback()
+                    app.logger.exception("Reprioritize job failed: %s", e)
+
+
+reprioritizer = Reprioritizer()
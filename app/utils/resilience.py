@@ -0,0 +1,195 @@
+"""
+Guards for calls to a slow or rate-limited remote service (the Gemini client): a token
+bucket, a circuit breaker, and a deadline with optional hedging. A call that can't go out
+raises a ResilienceError right away, so callers can fall back to the local suggester.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class ResilienceError(Exception):
+    pass
+
+
+class CircuitOpen(ResilienceError):
+    pass
+
+
+class RateLimited(ResilienceError):
+    pass
+
+
+class DeadlineExceeded(ResilienceError):
+    pass
+
+
+class TokenBucket:
+    """rate tokens per second, holding at most capacity; one token per call."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, timeout=0.0):
+        """Take a token, waiting up to timeout seconds for one. Returns False if none came."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_for = (1 - self._tokens) / self.rate if self.rate > 0 else float("inf")
+            if now + wait_for > deadline:
+                return False
+            time.sleep(wait_for)
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after failure_threshold consecutive failures, where a call slower
+    than slow_call_seconds counts as a failure even if it succeeded.
+    Open -> half-open after reset_seconds; one trial call then closes or reopens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold=5, slow_call_seconds=None, reset_seconds=30.0):
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+        self.short_circuited = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self):
+        """Whether a call may go out now; in half-open state only one trial at a time."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self._state = self.HALF_OPEN
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.short_circuited += 1
+            return False
+
+    def release(self):
+        """End a permitted call that never reached the service; state and failure count stay as they are."""
+        with self._lock:
+            self._trial_running = False
+
+    def record(self, ok, seconds=None):
+        if ok and self.slow_call_seconds is not None and seconds is not None and seconds > self.slow_call_seconds:
+            ok = False
+        with self._lock:
+            self._trial_running = False
+            if ok:
+                self._state = self.CLOSED
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self):
+        return {"state": self.state, "consecutive_failures": self._failures, "short_circuited": self.short_circuited}
+
+
+def call_with_deadline(executor, fn, timeout, hedge_after=None, may_hedge=None):
+    """
+    fn() on executor, waiting at most timeout seconds for a result.
+
+    With hedge_after, a second fn() is started if the first hasn't finished by then
+    (and may_hedge() allows it, e.g. a rate-limit token is available); the first
+    successful result wins. Calls still running at the deadline are abandoned, not
+    cancelled. Raises DeadlineExceeded, or the last attempt's exception.
+    """
+    deadline = time.monotonic() + timeout
+    pending = {executor.submit(fn)}
+    hedged = hedge_after is None
+    error = None
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        wait_for = remaining if hedged else min(remaining, hedge_after)
+        done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                return future.result()
+            except Exception as e:
+                error = e
+        if not hedged and (not done or error is not None):
+            hedged = True
+            if may_hedge is None or may_hedge():
+                pending.add(executor.submit(fn))
+    if error is not None and not pending:
+        raise error
+    raise DeadlineExceeded(f"No response within {timeout}s")
+
+
+class ResilientClient:
+    """
+    generate_content() in front of a model object, with a rate limit, a circuit
+    breaker, a deadline and optional hedging.
+
+    get_model is called for every request, so the model can be swapped at runtime
+    (e.g. for a fake one).
+    """
+
+    def __init__(self, get_model, rate_per_minute=15, burst=5, rate_wait=0.5, timeout=10.0,
+                 hedge_after=None, max_concurrency=8, breaker=None):
+        self.get_model = get_model
+        self.bucket = TokenBucket(rate_per_minute / 60.0, burst)
+        self.rate_wait = rate_wait
+        self.timeout = timeout
+        self.hedge_after = hedge_after
+        self.breaker = breaker or CircuitBreaker()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm-calls")
+        self.rate_limited = 0
+
+    def generate_content(self, prompt):
+        if not self.breaker.allow():
+            raise CircuitOpen("Circuit open after repeated failures")
+        if not self.bucket.try_acquire(self.rate_wait):
+            self.breaker.release()  # Not the service's fault, nor a sign it recovered
+            self.rate_limited += 1
+            raise RateLimited("Request rate limit reached")
+
+        model = self.get_model()
+        started = time.monotonic()
+        try:
+            response = call_with_deadline(
+                self._executor, lambda: model.generate_content(prompt), self.timeout,
+                self.hedge_after, lambda: self.bucket.try_acquire(0),
+            )
+        except Exception:
+            self.breaker.record(False)
+            raise
+        self.breaker.record(True, time.monotonic() - started)
+        return response
+
+    def stats(self):
+        return {**self.breaker.stats(), "rate_limited": self.rate_limited}
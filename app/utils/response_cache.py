@@ -0,0 +1,147 @@
+"""
+Conditional GETs and a serialized-response cache for per-user read endpoints. The ETag
+and cache key include the user's data_version, which every write to their tasks bumps
+(see task_hooks), so an unchanged poll costs one counter lookup.
+"""
+import functools
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from flask import Response, current_app, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import update
+from app import db
+from app.models import User
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+
+
+class ResponseCache:
+    """LRU of (body, status, mimetype, headers) tuples, at most maxsize entries."""
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.not_modified = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "not_modified": self.not_modified,
+                "misses": self.misses,
+            }
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE)
+
+
+def data_version(user_id):
+    """The user's current data_version, or None for an unknown user."""
+    return db.session.query(User.data_version).filter(User.id == int(user_id)).scalar()
+
+
+def bump_data_versions(session, user_filter):
+    """
+    Increment data_version of the users matching user_filter (a set of ids or a
+    SQL expression on User.id) inside session's current transaction.
+
+    Where the database supports UPDATE ... RETURNING, session.info["data_versions"]
+    also records {user_id: (version before the transaction, version now)}, so the
+    in-process indexes can tell their own commits from other processes' (see task_hooks).
+    """
+    if isinstance(user_filter, (set, frozenset, list, tuple)):
+        if not user_filter:
+            return
+        user_filter = User.id.in_(sorted(int(user_id) for user_id in user_filter))
+    statement = update(User).where(user_filter).values(data_version=User.data_version + 1)
+    options = {"synchronize_session": False}
+    if not session.connection().dialect.update_returning:
+        session.execute(statement, execution_options=options)
+        return
+    moved = session.info.setdefault("data_versions", {})
+    for user_id, version in session.execute(statement.returning(User.id, User.data_version), execution_options=options):
+        moved[user_id] = (moved.get(user_id, (version - 1,))[0], version)
+
+
+def _etag(user_id, version, extra=None):
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.args.items(multi=True)))
+    identity = f"{request.endpoint}\x00{user_id}\x00{version}\x00{query}\x00{extra}"
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+
+def time_bucket(seconds):
+    """A vary= key for cached_response that changes every `seconds` seconds."""
+    return lambda: int(time.time() // seconds)
+
+
+def cached_response(view=None, *, vary=None):
+    """
+    Serve a GET view from the response cache while the user's data_version is unchanged.
+
+    Goes below @jwt_required() and above the flask-smorest decorators, so cache hits
+    skip argument parsing, the queries and serialization. Only 200 responses are stored.
+    The version is read before the view's queries, so a body is never older than its key.
+
+    A view whose output also depends on something else (e.g. the current time) passes
+    vary, a callable whose result becomes part of the key:
+    @cached_response(vary=time_bucket(60)).
+    """
+    if view is None:
+        return functools.partial(cached_response, vary=vary)
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        user_id = get_jwt_identity()
+        version = data_version(user_id) if user_id else None
+        if version is None:
+            return view(*args, **kwargs)
+
+        etag = _etag(user_id, version, vary() if vary is not None else None)
+        if request.if_none_match.contains(etag):
+            response_cache.not_modified += 1
+            response = Response(status=304)
+        else:
+            entry = response_cache.get(etag)
+            if entry is not None:
+                body, status, mimetype, headers = entry
+                response = Response(body, status=status, mimetype=mimetype, headers=headers)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    headers = [(k, v) for k, v in response.headers.items() if k.startswith("X-")]
+                    response_cache.put(etag, (response.get_data(), response.status_code, response.mimetype, headers))
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+    return wrapper
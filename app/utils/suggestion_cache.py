@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_title(task_title):
+    """'  Draft   Report!' and 'draft report' share a cache entry."""
+    lowered = _PUNCTUATION_RE.sub(" ", task_title.lower())
+    return _WHITESPACE_RE.sub(" ", lowered).strip()
+
+
+def cache_key(task_title, namespace="suggestions"):
+    """Content address for a task title: sha256 of the namespace and normalized title."""
+    return hashlib.sha256(f"{namespace}\x00{normalize_title(task_title)}".encode("utf-8")).hexdigest()
+
+
+class SuggestionCache:
+    """
+    Two-tier cache for LLM suggestions keyed by normalized task title.
+
+    Tier 1 is an in-process LRU (maxsize entries). Tier 2 is an optional SQLite file
+    shared by every worker on the host. Every trim_interval seconds a put drops its
+    expired rows and evicts the least recently used ones beyond db_max_entries.
+    Entries in both tiers expire after ttl seconds, or the ttl given to put.
+    """
+
+    def __init__(self, maxsize=1024, ttl=7 * 24 * 3600, db_path=None, db_max_entries=100000, trim_interval=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.db_path = db_path
+        self.db_max_entries = db_max_entries
+        self.trim_interval = trim_interval
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_trim = 0.0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS suggestion_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_suggestion_cache_accessed ON suggestion_cache (accessed_at)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+        if self.db_path:
+            try:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT value, expires_at FROM suggestion_cache WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE suggestion_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    with self._lock:
+                        self.disk_hits += 1
+                    return value
+            except sqlite3.Error as e:
+                print(f"Suggestion cache read error: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value, ttl=None):
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        self._remember(key, value, expires_at)
+        if not self.db_path:
+            return
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO suggestion_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now),
+            )
+            with self._lock:
+                due = now >= self._next_trim
+                if due:
+                    self._next_trim = now + self.trim_interval
+            if due:
+                self._trim(conn, now)
+        except sqlite3.Error as e:
+            print(f"Suggestion cache write error: {e}")
+
+    def _trim(self, conn, now):
+        conn.execute("DELETE FROM suggestion_cache WHERE expires_at <= ?", (now,))
+        overflow = conn.execute("SELECT COUNT(*) FROM suggestion_cache").fetchone()[0] - self.db_max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM suggestion_cache WHERE key IN "
+                "(SELECT key FROM suggestion_cache ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+            with self._lock:
+                self.evictions += overflow
+
+    def _remember(self, key, value, expires_at):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+        if self.db_path:
+            self._connection().execute("DELETE FROM suggestion_cache")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "size": len(self._memory),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "disk_tier": bool(self.db_path),
+            }
+
+
+suggestion_cache = SuggestionCache(
+    maxsize=int(os.getenv("SUGGESTION_CACHE_SIZE", "1024")),
+    ttl=int(os.getenv("SUGGESTION_CACHE_TTL", str(7 * 24 * 3600))),
+    db_path=os.getenv("SUGGESTION_CACHE_DB") or None,
+    db_max_entries=int(os.getenv("SUGGESTION_CACHE_DB_MAX_ENTRIES", "100000")),
+    trim_interval=float(os.getenv("SUGGESTION_CACHE_TRIM_INTERVAL", "60")),
+)
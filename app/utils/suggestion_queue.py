@@ -0,0 +1,157 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from flask import current_app
+from app import db
+from app.models import Task
+from app.utils import embedding_index
+from app.utils.gemini_suggester import get_combined_suggestions
+from app.utils.local_suggester import get_local_suggestions
+from app.utils.metrics import bind, timed
+from app.utils.recommendation_engine import get_similar_tasks
+from app.utils.suggestion_cache import cache_key
+
+
+def _in_app_context(app, fn, *args):
+    with app.app_context():
+        return fn(*args)
+
+
+def _stage_result(app, future, deadline, stage):
+    """The stage's result, or None if it failed or is still running at deadline."""
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FuturesTimeout:
+        app.logger.warning("Suggestion stage %r missed its deadline; using the fallback", stage)
+    except Exception as e:
+        app.logger.warning("Suggestion stage %r failed (%s); using the fallback", stage, e)
+    return None
+
+
+@timed("suggestions")
+def build_suggestions(user_id, task_title):
+    """
+    Produce (suggestions, complimentary_tasks) for a task title.
+
+    The Gemini call, the co-occurrence lookup and (when enabled) the embedding
+    lookup run concurrently on the shared stage pool, each against its own
+    deadline (SUGGESTION_LLM_TIMEOUT, SUGGESTION_SIMILAR_TIMEOUT and
+    SUGGESTION_EMBEDDING_TIMEOUT seconds from the start), so latency is that of
+    the slowest stage rather than the sum. A stage that fails or misses its
+    deadline counts as empty: subtasks then come from the local suggester and
+    complementary tasks from the next stage that did answer, in the order
+    co-occurrence, embedding, Gemini. A timed-out Gemini call keeps running and
+    still fills the suggestion cache.
+    """
+    app = current_app._get_current_object()
+    pool = app.extensions['suggestion_stages']
+    started = time.monotonic()
+    # bind() lets the stages' spans show up in this request's Server-Timing
+    combined = pool.submit(bind(get_combined_suggestions), task_title)
+    similar = pool.submit(bind(_in_app_context), app, get_similar_tasks, user_id, task_title)
+    embedded = None
+    if embedding_index.enabled():
+        embedded = pool.submit(bind(_in_app_context), app, embedding_index.similar_tasks, user_id, task_title)
+
+    combined = _stage_result(app, combined, started + app.config['SUGGESTION_LLM_TIMEOUT'], 'gemini') or {}
+    similar = _stage_result(app, similar, started + app.config['SUGGESTION_SIMILAR_TIMEOUT'], 'similar')
+    if embedded is not None:
+        embedded = _stage_result(app, embedded, started + app.config['SUGGESTION_EMBEDDING_TIMEOUT'], 'embedding')
+
+    suggestions = combined.get("subtasks") or get_local_suggestions(task_title)
+    complimentary_tasks = similar or embedded or combined.get("similar_tasks") or None
+    return suggestions, complimentary_tasks
+
+
+def build_suggestions_batch(user_id, task_titles, max_workers=8):
+    """
+    build_suggestions for many titles of one user.
+
+    Titles that normalize to the same cache key share one Gemini prompt, and the
+    distinct prompts run concurrently on at most max_workers threads.
+    Returns a list of (suggestions, complimentary_tasks) in input order.
+    """
+    titles_by_key = {}
+    for task_title in task_titles:
+        titles_by_key.setdefault(cache_key(task_title), task_title)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(titles_by_key))),
+                            thread_name_prefix='bulk-suggestions') as pool:
+        combined = dict(zip(titles_by_key, pool.map(bind(get_combined_suggestions), titles_by_key.values())))
+
+    results = []
+    for task_title in task_titles:
+        result = combined[cache_key(task_title)] or {}
+        suggestions = result.get("subtasks") or get_local_suggestions(task_title)
+        complimentary_tasks = (
+            get_similar_tasks(user_id, task_title)
+            or (embedding_index.similar_tasks(user_id, task_title) if embedding_index.enabled() else None)
+            or result.get("similar_tasks")
+            or None
+        )
+        results.append((suggestions, complimentary_tasks))
+    return results
+
+
+class SuggestionQueue:
+    """
+    In-process worker pool that fills in task suggestions after the task is committed.
+
+    Enabled with ASYNC_SUGGESTIONS = True; SUGGESTION_WORKERS sets the pool size.
+    No external broker is involved, so jobs still queued when the process exits are
+    lost and those tasks stay 'pending'.
+
+    init_app also creates the stage pool build_suggestions fans out on, shared by
+    all requests and jobs (SUGGESTION_STAGE_WORKERS threads).
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('ASYNC_SUGGESTIONS', False)
+        app.config.setdefault('SUGGESTION_WORKERS', 4)
+        app.config.setdefault('SUGGESTION_STAGE_WORKERS', 16)
+        app.config.setdefault('SUGGESTION_LLM_TIMEOUT', 8.0)
+        app.config.setdefault('SUGGESTION_SIMILAR_TIMEOUT', 2.0)
+        app.config.setdefault('SUGGESTION_EMBEDDING_TIMEOUT', 1.0)
+        app.extensions['suggestion_queue'] = ThreadPoolExecutor(
+            max_workers=app.config['SUGGESTION_WORKERS'],
+            thread_name_prefix='suggestions',
+        )
+        app.extensions['suggestion_stages'] = ThreadPoolExecutor(
+            max_workers=app.config['SUGGESTION_STAGE_WORKERS'],
+            thread_name_prefix='suggestion-stages',
+        )
+
+    @property
+    def enabled(self):
+        return current_app.config.get('ASYNC_SUGGESTIONS', False)
+
+    def enqueue(self, task_id):
+        """Schedule suggestion generation for a committed task."""
+        app = current_app._get_current_object()
+        return app.extensions['suggestion_queue'].submit(self._run, app, task_id)
+
+    @staticmethod
+    def _run(app, task_id):
+        with app.app_context():
+            task = db.session.get(Task, task_id)
+            if task is None:
+                return  # Deleted before the job ran
+            try:
+                suggestions, complimentary_tasks = build_suggestions(task.user_id, task.title)
+                task.suggestions = suggestions
+                task.complimentary_tasks = complimentary_tasks
+                task.suggestions_status = 'ready'
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                app.logger.exception("Suggestion job failed for task %s: %s", task_id, e)
+                task = db.session.get(Task, task_id)
+                if task is not None:
+                    task.suggestions_status = 'failed'
+                    db.session.commit()
+
+
+suggestion_queue = SuggestionQueue()
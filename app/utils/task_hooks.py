@@ -0,0 +1,131 @@
+"""
+Keeps derived data in step with task writes. Routes call task_created / task_updated /
+task_deleted before committing; work that needs the data durable goes through after_commit.
+Flush listeners bump User.data_version, sync the search index and queue change-feed events.
+"""
+from itertools import chain
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import db
+from app.models import Task
+from app.utils import analytics_rollup, content_recommender, recommendation_engine, task_search
+from app.utils.events import event_hub
+from app.utils.response_cache import bump_data_versions
+
+SNAPSHOT_FIELDS = ("id", "user_id", "title", "status", "due_date", "created_at", "completed_at", "priority")
+EVENT_FIELDS = SNAPSHOT_FIELDS + ("suggestions_status",)
+BULK_EVENT_THRESHOLD = 100  # More changes than this for one user in a transaction -> one tasks.changed event
+
+
+def snapshot(task):
+    """Copy of a task's fields, taken before a PUT mutates it."""
+    return {field: getattr(task, field) for field in SNAPSHOT_FIELDS}
+
+
+def after_commit(callback):
+    """Run callback() once the current transaction commits; dropped on rollback."""
+    db.session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session):
+    callbacks = session.info.pop("after_commit", [])
+    versions = session.info.pop("data_versions", {})
+    for callback in callbacks:
+        callback()
+    # The callbacks applied this transaction to the in-process indexes; let them know which versions that covers
+    recommendation_engine.versions_committed(versions)
+    content_recommender.versions_committed(versions)
+    _publish_task_events(session.info.pop("task_events", []))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session):
+    session.info.pop("after_commit", None)
+    session.info.pop("data_versions", None)
+    session.info.pop("task_events", None)
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_data_versions(session, flush_context, instances):
+    user_ids = {
+        task.user_id for task in chain(session.new, session.dirty, session.deleted)
+        if isinstance(task, Task) and task.user_id is not None
+        and (task not in session.dirty or session.is_modified(task))
+    }
+    bump_data_versions(session, user_ids)
+
+
+def _event_payload(kind, task):
+    payload = {"type": kind}
+    for field in EVENT_FIELDS if kind != "task.deleted" else ("id", "user_id"):
+        value = getattr(task, field)
+        payload[field] = value.isoformat() if hasattr(value, "isoformat") else value
+    payload["user_id"] = int(payload["user_id"])  # Routes set it from the JWT identity string
+    return payload
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_task_events(session, flush_context):
+    # Ids are assigned by now; published only once the transaction commits
+    events = session.info.setdefault("task_events", [])
+    for kind, objects in (("task.created", session.new), ("task.updated", session.dirty), ("task.deleted", session.deleted)):
+        for task in objects:
+            if isinstance(task, Task) and (kind != "task.updated" or session.is_modified(task)):
+                events.append(_event_payload(kind, task))
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_search_index(session, flush_context):
+    task_search.sync_index(session)
+
+
+def _publish_task_events(events):
+    by_user = {}
+    for payload in events:
+        by_user.setdefault(payload["user_id"], []).append(payload)
+    for user_id, payloads in by_user.items():
+        if len(payloads) > BULK_EVENT_THRESHOLD:
+            payloads = [{"type": "tasks.changed", "user_id": user_id, "count": len(payloads)}]
+        try:
+            for payload in payloads:
+                event_hub.publish(user_id, payload)
+        except Exception as e:  # The write is committed; a lost event only delays clients until their next fetch
+            print(f"Task event publish failed for user {user_id}: {e}")
+
+
+def tasks_changed(counts):
+    """
+    Queue one tasks.changed event per owner, published once the transaction commits,
+    for writes that bypass the flush. counts: {user_id: number of tasks changed}.
+    """
+    events = db.session.info.setdefault("task_events", [])
+    events.extend(
+        {"type": "tasks.changed", "user_id": int(user_id), "count": count} for user_id, count in counts.items()
+    )
+
+
+def tasks_created(tasks):
+    """Batch form of task_created: derived rows are read and written once per distinct key."""
+    recommendation_engine.index_tasks([(task.user_id, task.title) for task in tasks])
+    for task in tasks:
+        content_recommender.task_added(task)
+    analytics_rollup.tasks_created(tasks)
+
+
+def task_created(task):
+    tasks_created([task])
+
+
+def task_updated(task, previous):
+    analytics_rollup.task_updated(task, previous)
+    if previous["title"] != task.title:
+        recommendation_engine.unindex_task(previous["user_id"], previous["title"])
+        recommendation_engine.index_task(task.user_id, task.title)
+        content_recommender.task_added(task)
+
+
+def task_deleted(task):
+    analytics_rollup.task_deleted(task)
+    recommendation_engine.unindex_task(task.user_id, task.title)
+    content_recommender.task_removed(task.user_id, task.id)
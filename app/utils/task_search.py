@@ -0,0 +1,155 @@
+"""
+Full-text search over task titles: an FTS5 table of owner-prefixed terms on SQLite
+(migration ecde5c872df0), a title_tsv GIN index on PostgreSQL, ILIKE otherwise.
+Every query term must match; the last one also matches as a prefix.
+"""
+import re
+from sqlalchemy import inspect, text
+from app import db
+from app.models import Task
+
+_TERM_RE = re.compile(r"[^\W_]+")
+_backends = {}  # Database URL -> "fts5" | "tsvector" | "like", checked once per database
+
+# Also in migration ecde5c872df0; kept here for databases made with db.create_all()
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5("
+    "terms, tokenize=\"unicode61 remove_diacritics 2 tokenchars '_'\")"
+)
+
+FTS5_SEARCH_SQL = (
+    "SELECT rowid FROM task_fts WHERE task_fts MATCH :match "
+    "ORDER BY bm25(task_fts), rowid DESC LIMIT :limit OFFSET :offset"
+)
+
+
+def search_terms(query):
+    """Lowercased word terms of a query or title; punctuation and FTS operators are dropped."""
+    return _TERM_RE.findall(query.lower())
+
+
+def index_terms(user_id, title):
+    """The task_fts.terms value of a task."""
+    return " ".join(f"u{int(user_id)}_{term}" for term in search_terms(title))
+
+
+def fts5_match(user_id, terms):
+    """FTS5 MATCH expression: every term of the user's, the last one as a prefix."""
+    return " AND ".join(
+        f'"u{int(user_id)}_{term}"' + ("*" if i == len(terms) - 1 else "") for i, term in enumerate(terms)
+    )
+
+
+def _backend(connection):
+    url = str(connection.engine.url)
+    cached = _backends.get(url)
+    if cached is None:
+        dialect = connection.dialect.name
+        if dialect == "sqlite":
+            found = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_fts'")
+            ).scalar()
+            cached = "fts5" if found else "like"
+        elif dialect == "postgresql":
+            found = connection.execute(text(
+                "SELECT 1 FROM information_schema.columns WHERE table_name = 'task' AND column_name = 'title_tsv'"
+            )).scalar()
+            cached = "tsvector" if found else "like"
+        else:
+            cached = "like"
+        _backends[url] = cached
+    return cached
+
+
+def sync_index(session):
+    """
+    Write task_fts rows for the tasks in session's current flush.
+    Called from an after_flush listener, when task ids are assigned.
+    """
+    changed = [
+        task for task in session.dirty
+        if isinstance(task, Task) and any(
+            inspect(task).attrs[field].history.has_changes() for field in ("title", "user_id")
+        )
+    ]
+    added = [task for task in session.new if isinstance(task, Task)]
+    removed = [task.id for task in session.deleted if isinstance(task, Task)]
+    if not (changed or added or removed):
+        return
+    connection = session.connection()
+    if _backend(connection) != "fts5":
+        return
+    removed += [task.id for task in changed]
+    if removed:
+        connection.execute(text("DELETE FROM task_fts WHERE rowid = :id"), [{"id": task_id} for task_id in removed])
+    rows = [{"id": task.id, "terms": index_terms(task.user_id, task.title)} for task in added + changed]
+    if rows:
+        connection.execute(text("INSERT INTO task_fts (rowid, terms) VALUES (:id, :terms)"), rows)
+
+
+def _fts5_ids(user_id, terms, limit, offset):
+    return db.session.execute(
+        text(FTS5_SEARCH_SQL), {"match": fts5_match(user_id, terms), "limit": limit, "offset": offset}
+    ).scalars().all()
+
+
+def _tsvector_ids(user_id, terms, limit, offset):
+    tsquery = " & ".join(term + (":*" if i == len(terms) - 1 else "") for i, term in enumerate(terms))
+    return db.session.execute(text(
+        "SELECT id FROM task, to_tsquery('simple', :tsquery) AS query "
+        "WHERE user_id = :user_id AND title_tsv @@ query "
+        "ORDER BY ts_rank_cd(title_tsv, query) DESC, id DESC LIMIT :limit OFFSET :offset"
+    ), {"tsquery": tsquery, "user_id": int(user_id), "limit": limit, "offset": offset}).scalars().all()
+
+
+def _like_ids(user_id, terms, limit, offset):
+    query = db.session.query(Task.id).filter(Task.user_id == int(user_id))
+    for term in terms:
+        query = query.filter(Task.title.ilike(f"%{term}%"))
+    rows = query.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit).offset(offset)
+    return [task_id for (task_id,) in rows]
+
+
+def search_tasks(user_id, query, page=1, per_page=20):
+    """
+    The user's tasks matching query, best match first: (tasks, has_more).
+    Returns ([], False) when query has no searchable terms.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return [], False
+    find = {"fts5": _fts5_ids, "tsvector": _tsvector_ids, "like": _like_ids}[_backend(db.session.connection())]
+    ids = find(user_id, terms, per_page + 1, (page - 1) * per_page)
+    has_more = len(ids) > per_page
+    ids = ids[:per_page]
+    if not ids:
+        return [], has_more
+    tasks = Task.query.filter(Task.id.in_(ids)).options(db.undefer_group("suggestions")).all()
+    by_id = {task.id: task for task in tasks}
+    return [by_id[task_id] for task_id in ids if task_id in by_id], has_more
+
+
+def rebuild_index(batch_size=10000):
+    """(Re)create the SQLite FTS table and reindex every task. Returns the number of tasks indexed."""
+    connection = db.session.connection()
+    if connection.dialect.name != "sqlite":
+        raise RuntimeError("Only the SQLite FTS5 index needs rebuilding; PostgreSQL keeps title_tsv itself.")
+    connection.execute(text(SQLITE_FTS_DDL))
+    connection.execute(text("DELETE FROM task_fts"))
+    indexed, last_id = 0, 0
+    while True:
+        rows = (
+            db.session.query(Task.id, Task.user_id, Task.title)
+            .filter(Task.id > last_id).order_by(Task.id).limit(batch_size).all()
+        )
+        if not rows:
+            break
+        connection.execute(text("INSERT INTO task_fts (rowid, terms) VALUES (:id, :terms)"), [
+            {"id": task_id, "terms": index_terms(user_id, title)} for task_id, user_id, title in rows
+        ])
+        indexed += len(rows)
+        last_id = rows[-1][0]
+    connection.execute(text("INSERT INTO task_fts (task_fts) VALUES ('optimize')"))
+    db.session.commit()
+    _backends.pop(str(connection.engine.url), None)
+    return indexed
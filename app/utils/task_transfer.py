@@ -0,0 +1,157 @@
+"""
+Streaming NDJSON/CSV export and batched import of a user's tasks, in TaskSchema's field
+names and formats so an export imports as-is. CSV cells hold lists as JSON; empty means null.
+"""
+import csv
+import io
+import json
+import logging
+import time
+from datetime import datetime
+from marshmallow import ValidationError
+from app import db
+from app.models import Task
+from app.schemas import TaskSchema, TaskImportSchema
+
+EXPORT_FIELDS = (
+    "id", "title", "due_date", "status", "priority", "suggestions", "complimentary_tasks",
+    "suggestions_status", "created_at", "completed_at",
+)
+LIST_FIELDS = ("suggestions", "complimentary_tasks")
+EXPORT_CHUNK_ROWS = 1000  # Rows fetched per round-trip of the server-side cursor
+MAX_REPORTED_ERRORS = 100
+
+logger = logging.getLogger(__name__)
+
+_export_schema = TaskSchema(only=EXPORT_FIELDS)
+_import_schema = TaskImportSchema()
+
+
+def _export_rows(user_id):
+    query = (
+        Task.query.filter_by(user_id=user_id)
+        .options(db.undefer_group("suggestions"))
+        .order_by(Task.id)
+        .yield_per(EXPORT_CHUNK_ROWS)
+    )
+    for task in query:
+        yield _export_schema.dump(task)
+
+
+def export_ndjson(user_id):
+    """Generator of NDJSON lines, one per task; memory use doesn't grow with the task count."""
+    for row in _export_rows(user_id):
+        yield json.dumps(row, separators=(",", ":")) + "\n"
+
+
+def export_csv(user_id):
+    """Generator of CSV lines (header first), one per task."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for row in _export_rows(user_id):
+        writer.writerow([
+            json.dumps(row[field]) if field in LIST_FIELDS and row[field] is not None
+            else "" if row[field] is None else row[field]
+            for field in EXPORT_FIELDS
+        ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_records(stream):
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, ValidationError("Invalid JSON.")
+
+
+def _csv_records(stream):
+    reader = csv.DictReader(stream)
+    for record in reader:
+        row = {}
+        try:
+            for field, value in record.items():
+                if field is None or value in ("", None):
+                    continue
+                row[field] = json.loads(value) if field in LIST_FIELDS else value
+        except ValueError:
+            yield reader.line_num, ValidationError("Invalid JSON in a list column.")
+            continue
+        yield reader.line_num, row
+
+
+def import_tasks(user_id, stream, fmt="ndjson", batch_size=500):
+    """
+    Create tasks for user_id from a binary stream of NDJSON or CSV, reading it incrementally.
+
+    Rows are validated with TaskImportSchema and committed batch_size at a time, so
+    a failure (database or derived-data hooks) only loses the batch in flight, which
+    is rolled back and reported. No NLP parsing or LLM calls happen:
+    titles, dates and suggestions are taken as they are in the file.
+    Returns a summary with per-line errors and the throughput in rows per second.
+    """
+    from app.utils import task_hooks
+
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="" if fmt == "csv" else None)
+    records = _csv_records(text) if fmt == "csv" else _ndjson_records(text)
+
+    imported, failed, errors = 0, 0, []
+    batch, batch_start_line = [], None
+
+    def report(line, messages):
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"line": line, "errors": messages})
+
+    def flush():
+        nonlocal imported, failed
+        try:
+            db.session.add_all(batch)
+            task_hooks.tasks_created(batch)
+            db.session.commit()
+            imported += len(batch)
+        except Exception as e:
+            db.session.rollback()
+            logger.exception("Import batch starting at line %s failed", batch_start_line)
+            failed += len(batch)
+            report(batch_start_line, {"_batch": [f"{len(batch)} rows from this line on were not saved: {e}"]})
+        batch.clear()
+
+    start = time.perf_counter()
+    for line_number, record in records:
+        try:
+            if isinstance(record, ValidationError):
+                raise record
+            if not isinstance(record, dict):
+                raise ValidationError("Expected an object.")
+            data = _import_schema.load(record)
+        except ValidationError as e:
+            failed += 1
+            report(line_number, e.messages)
+            continue
+        data["created_at"] = data["created_at"] or datetime.utcnow()
+        data["priority"] = data["priority"] or 0
+        if data["status"] == "completed" and not data["completed_at"]:
+            data["completed_at"] = data["created_at"]
+        if not batch:
+            batch_start_line = line_number
+        batch.append(Task(user_id=user_id, suggestions_status="ready", **data))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    seconds = time.perf_counter() - start
+
+    return {
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(imported / seconds, 1) if seconds else None,
+    }
@@ -0,0 +1,72 @@
+"""
+Top-3 searches over a user's history and over every row of an int8 embedding index filled
+with random vectors (no model loaded).
+
+Usage: python -m benchmarks.bench_embedding_index [--rows N] [--dim D] [--history H]
+"""
+import argparse
+import json
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from app.utils.embedding_index import EmbeddingIndex
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--history", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    def fake_embed(titles):
+        vectors = rng.standard_normal((len(titles), args.dim)).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    titles = [f"task title {i}" for i in range(args.rows)]
+    with tempfile.TemporaryDirectory() as path:
+        index = EmbeddingIndex(path, args.dim, fake_embed)
+        start = time.perf_counter()
+        for offset in range(0, args.rows, 10000):
+            index.rows(titles[offset:offset + 10000])
+        build_seconds = time.perf_counter() - start
+
+        picker = random.Random(args.seed)
+        history = picker.sample(titles, args.history)
+        queries = picker.sample(titles, args.queries)
+        user_ms, all_ms = [], []
+        for title in queries:
+            start = time.perf_counter()
+            index.search(title, 3, history)
+            user_ms.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            index.search(title, 3)
+            all_ms.append((time.perf_counter() - start) * 1000)
+
+        print(json.dumps({
+            "benchmark": "embedding_index",
+            "rows": len(index),
+            "dim": args.dim,
+            "index_mb": round(len(index) * (args.dim + 4) / 2 ** 20, 1),
+            "float32_mb": round(len(index) * args.dim * 4 / 2 ** 20, 1),
+            "build_seconds": round(build_seconds, 2),
+            "user_history": args.history,
+            "user_search_ms": {"p50": round(_percentile(user_ms, 50), 3), "p95": round(_percentile(user_ms, 95), 3)},
+            "all_users_search_ms": {"p50": round(_percentile(all_ms, 50), 3), "p95": round(_percentile(all_ms, 95), 3)},
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Times get_local_suggestions' keyword automaton against growing rule sets.
+
+Usage: python -m benchmarks.bench_local_suggester [--sizes 10,1000,10000,100000]
+"""
+import argparse
+import json
+import time
+
+from app.utils.local_suggester import LOCAL_SUGGESTIONS_FILE, RuleSet
+
+TITLES = [
+    "Prepare slides for the quarterly presentation",
+    "Email the team about the meeting notes",
+    "Book flight and hotel for the conference trip",
+    "Something with no keyword at all in it",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10,1000,10000,100000")
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(LOCAL_SUGGESTIONS_FILE, encoding="utf-8") as f:
+        shipped = json.load(f)
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        data = dict(shipped, suggestions=shipped["suggestions"] + [
+            {"keywords": [f"keyword{i} topic{i % 97}"], "suggestions": [f"Step {i}"]} for i in range(size)
+        ])
+        start = time.perf_counter()
+        rules = RuleSet(data)
+        compile_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for title in TITLES:
+                rules.suggestion_matcher.matches(title)
+        match_us = (time.perf_counter() - start) * 1e6 / (args.rounds * len(TITLES))
+        results.append({
+            "rules": len(data["suggestions"]),
+            "compile_seconds": round(compile_seconds, 3),
+            "match_us_per_title": round(match_us, 2),
+        })
+
+    print(json.dumps({"benchmark": "local_suggester", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+parse_user_input parses/sec: forced dateparser, fast path with a cold cache, and cache hits.
+
+Usage: python -m benchmarks.bench_nlp_parser [--rounds N]
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from unittest import mock
+
+from app.utils import nlp_parser
+from benchmarks.nlp_parser_corpus import CORPUS_PATH
+
+
+def _rate(titles, rounds, before_each=None):
+    base = datetime.now()
+    count = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for title in titles:
+            if before_each:
+                before_each()
+            nlp_parser.parse_user_input(title, relative_base=base)
+            count += 1
+    elapsed = time.perf_counter() - start
+    return round(count / elapsed, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with open(CORPUS_PATH) as f:
+        titles = [case["text"] for case in json.load(f)]
+
+    # calculate_priority prints debug lines; keep the benchmark output clean
+    with mock.patch("builtins.print"):
+        with mock.patch.object(nlp_parser, "_fast_scan", return_value=None):
+            dateparser_rate = _rate(titles, args.rounds, nlp_parser.clear_parse_cache)
+        fast_rate = _rate(titles, args.rounds, nlp_parser.clear_parse_cache)
+        nlp_parser.clear_parse_cache()
+        _rate(titles, 1)  # warm the cache
+        cached_rate = _rate(titles, args.rounds)
+
+    print(json.dumps({
+        "benchmark": "parse_user_input",
+        "titles": len(titles),
+        "rounds": args.rounds,
+        "parses_per_sec": {
+            "dateparser": dateparser_rate,
+            "fast_path": fast_rate,
+            "cached": cached_rate,
+        },
+        "cache": nlp_parser.parse_cache_info(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Threaded parse_user_input throughput in-process vs. with NLP worker pools of each size.
+
+Usage: python -m benchmarks.bench_nlp_workers [--titles N] [--threads T] [--workers 0,1,2,4]
+"""
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from app.utils import nlp_parser
+from app.utils.nlp_workers import NLPWorkerPool
+from benchmarks.synthetic import task_input
+
+
+def _tag(i):
+    """A unique letters-only word, so titles miss the cache without adding date candidates (digits)."""
+    letters = ""
+    while True:
+        letters += "kqxz"[i % 4]
+        i //= 4
+        if not i:
+            return "ref" + letters
+
+
+def _run(pool, titles, threads):
+    nlp_parser.clear_parse_cache()
+    base = datetime.now()
+    latencies = []
+
+    def parse(title):
+        start = time.perf_counter()
+        nlp_parser.parse_user_input(title, relative_base=base)
+        latencies.append(time.perf_counter() - start)
+
+    original, nlp_parser.nlp_pool = nlp_parser.nlp_pool, pool
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(parse, titles))
+        elapsed = time.perf_counter() - start
+    finally:
+        nlp_parser.nlp_pool = original
+    latencies.sort()
+    return {
+        "parses_per_sec": round(len(titles) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--titles", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--workers", default="0,1,2,4", help="Comma-separated pool sizes; 0 parses in-process")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    titles = [f"{task_input(rng)} ({_tag(i)})" for i in range(args.titles)]
+    nlp_parser.parse_user_input("warm up the parser tomorrow at 5pm")  # Load the models in this process too
+
+    results = {}
+    for workers in (int(value) for value in args.workers.split(",")):
+        pool = NLPWorkerPool()
+        pool.workers = workers
+        pool.max_pending = 4 * max(workers, 1)
+        pool.timeout = 60.0
+        pool.queue_wait = 60.0
+        if workers:
+            _, _, ready = pool._pool()
+            ready.wait(300)
+        try:
+            results[f"workers={workers}"] = _run(pool, titles, args.threads)
+        finally:
+            pool.shutdown()
+
+    print(json.dumps({
+        "cpus": os.cpu_count(),
+        "titles": args.titles,
+        "threads": args.threads,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
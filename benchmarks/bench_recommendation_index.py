@@ -0,0 +1,82 @@
+"""
+In-memory benchmark of CooccurrenceIndex add/remove and top-N queries over a Zipf-like title mix.
+
+Usage: python -m benchmarks.bench_recommendation_index [--users N] [--tasks-per-user M]
+"""
+import argparse
+import json
+import random
+import time
+
+from app.utils.recommendation_engine import CooccurrenceIndex
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--tasks-per-user", type=int, default=100)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    titles = [f"task title {i}" for i in range(args.vocabulary)]
+    weights = [1.0 / (rank + 1) for rank in range(args.vocabulary)]
+
+    index = CooccurrenceIndex()
+    start = time.perf_counter()
+    for user_id in range(args.users):
+        for title in rng.choices(titles, weights=weights, k=args.tasks_per_user):
+            index.add(user_id, title, title)
+    build_seconds = time.perf_counter() - start
+
+    query_titles = rng.choices(titles, weights=weights, k=args.queries)
+    cold = []
+    for title in query_titles:
+        index._results.clear()
+        start = time.perf_counter()
+        index.similar(title, top_n=3)
+        cold.append((time.perf_counter() - start) * 1000)
+
+    warm = []
+    for title in query_titles:
+        start = time.perf_counter()
+        index.similar(title, top_n=3)
+        warm.append((time.perf_counter() - start) * 1000)
+
+    updates = []
+    for _ in range(args.queries):
+        user_id, title = rng.randrange(args.users), rng.choice(titles)
+        start = time.perf_counter()
+        index.add(user_id, title, title)
+        index.remove(user_id, title)
+        updates.append((time.perf_counter() - start) * 1000)
+
+    print(json.dumps({
+        "benchmark": "cooccurrence_index",
+        "users": args.users,
+        "tasks": args.users * args.tasks_per_user,
+        "nonzero_cells": len(index),
+        "build_seconds": round(build_seconds, 2),
+        "query_ms_uncached": {
+            "p50": round(_percentile(cold, 50), 4),
+            "p95": round(_percentile(cold, 95), 4),
+            "p99": round(_percentile(cold, 99), 4),
+        },
+        "query_ms_memoized": {
+            "p50": round(_percentile(warm, 50), 4),
+            "p95": round(_percentile(warm, 95), 4),
+            "p99": round(_percentile(warm, 99), 4),
+        },
+        "add_remove_ms_p50": round(_percentile(updates, 50), 4),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Startup time and per-worker memory, each run in a fresh interpreter: cold (lazy), warm
+(after warmup()), and forked workers with and without preloading in the parent.
+
+Usage: python -m benchmarks.bench_startup [--runs N] [--workers N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def _smaps_rollup():
+    """Resident and private (unshared) memory of this process in MB, from /proc/self/smaps_rollup."""
+    values = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    values[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    except OSError:
+        return None
+    return {
+        "rss_mb": round(values.get("Rss", 0), 1),
+        "private_mb": round(values.get("Private_Clean", 0) + values.get("Private_Dirty", 0), 1),
+    }
+
+
+def _probe_startup(warm):
+    started = time.perf_counter()
+    from app import create_app
+    from app.utils.lazy import load_report, warmup
+
+    app = create_app()
+    create_seconds = time.perf_counter() - started
+    report = warmup() if warm else load_report()
+    return {
+        "startup_seconds": round(create_seconds, 3),
+        "total_seconds": round(time.perf_counter() - started, 3),
+        "max_rss_mb": report["max_rss_mb"],
+        "loaded": report["loaded"],
+        "errors": report["errors"],
+        "app_report": app.extensions["startup_report"],
+    }
+
+
+def _probe_workers(preload, workers):
+    from app import create_app
+    from app.utils.lazy import warmup
+
+    create_app()
+    if preload:
+        warmup(freeze=True)
+
+    results = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            warmup()  # What a worker's first requests would load
+            os.write(write_fd, json.dumps(_smaps_rollup()).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            results.append(json.loads(pipe.read()))
+        os.waitpid(pid, 0)
+    return results
+
+
+def _run_probe(*probe, workers=1):
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--workers", str(workers), "--probe", *probe],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--probe", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        kind = args.probe[0]
+        if kind == "workers":
+            result = _probe_workers(args.probe[1] == "preload", args.workers)
+        else:
+            result = _probe_startup(kind == "warm")
+        print(json.dumps(result))
+        return
+
+    result = {"benchmark": "startup"}
+    for kind in ("cold", "warm"):
+        runs = [_run_probe(kind) for _ in range(args.runs)]
+        result[kind] = {
+            "startup_seconds_median": statistics.median(r["startup_seconds"] for r in runs),
+            "total_seconds_median": statistics.median(r["total_seconds"] for r in runs),
+            "max_rss_mb": max(r["max_rss_mb"] or 0 for r in runs),
+            "loaded": runs[-1]["loaded"],
+            "errors": runs[-1]["errors"],
+        }
+
+    if hasattr(os, "fork") and _smaps_rollup() is not None:
+        for mode in ("preload", "no-preload"):
+            workers = _run_probe("workers", mode, workers=args.workers)
+            result[f"workers_{mode.replace('-', '_')}"] = {
+                "workers": len(workers),
+                "private_mb_per_worker": round(statistics.mean(w["private_mb"] for w in workers), 1),
+                "rss_mb_per_worker": round(statistics.mean(w["rss_mb"] for w in workers), 1),
+            }
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Offline benchmark suite for the request hot paths, on a seeded SQLite database with a fake Gemini model.
+
+Usage: python -m benchmarks.bench_suite [--users N] [--tasks-per-user M] [--iterations I]
+                                        [--llm-latency S] [--seed N] [--output FILE]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Keep the Gemini quota and circuit breaker out of the way of the fake model's latency
+os.environ.setdefault("GEMINI_RATE_PER_MINUTE", "1000000")
+os.environ.setdefault("GEMINI_BURST", "1000")
+os.environ.setdefault("GEMINI_BREAKER_FAILURES", "1000000")
+
+
+def _summary(samples):
+    ordered = sorted(samples)
+
+    def pct(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": pct(0.5),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def _time(iterations, fn, before=None):
+    """Call before() (untimed) then fn() (timed) iterations times; return the summary."""
+    samples = []
+    for i in range(iterations):
+        if before is not None:
+            before(i)
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return _summary(samples)
+
+
+def _expect(response, status):
+    if response.status_code != status:
+        raise RuntimeError(f"{response.request.method} {response.request.path}: {response.status_code} {response.data[:200]!r}")
+    return response
+
+
+def run(args, db_path):
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from app.utils import gemini_suggester, nlp_parser
+    from app.utils.content_recommender import recommend_similar_tasks
+    from app.utils.fake_gemini import FakeGeminiModel
+    from app.utils.priority import calculate_priority
+    from app.utils.recommendation_engine import get_similar_tasks
+    from app.utils.response_cache import response_cache
+    from app.utils.suggestion_cache import suggestion_cache
+    from benchmarks.synthetic import seed_database, task_input, title
+
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "ASYNC_SUGGESTIONS": False,
+    })
+    fake = FakeGeminiModel(latency=args.llm_latency, seed=args.seed)
+    gemini_suggester.model = fake
+    rng = random.Random(args.seed)
+    n = args.iterations
+    results = {}
+
+    with app.app_context():
+        start = time.perf_counter()
+        user_ids = seed_database(args.users, args.tasks_per_user, seed=args.seed)
+        seed_seconds = time.perf_counter() - start
+
+        inputs = [task_input(rng) for _ in range(n)]
+        titles = [title(rng) for _ in range(n)]
+        users = [rng.choice(user_ids) for _ in range(n)]
+        dates = [None if rng.random() < 0.3 else (datetime.now() + timedelta(days=rng.randrange(14))).date()
+                 for _ in range(n)]
+        tokens = {user_id: create_access_token(identity=str(user_id)) for user_id in set(users)}
+
+        results["parse_user_input.cold"] = _time(
+            n, lambda i: nlp_parser.parse_user_input(inputs[i]), before=lambda i: nlp_parser.clear_parse_cache()
+        )
+        for text in inputs:
+            nlp_parser.parse_user_input(text)
+        results["parse_user_input.cached"] = _time(n, lambda i: nlp_parser.parse_user_input(inputs[i]))
+        results["calculate_priority"] = _time(n, lambda i: calculate_priority(titles[i], dates[i]))
+        results["get_similar_tasks"] = _time(n, lambda i: get_similar_tasks(users[i], titles[i]))
+        results["recommend_similar_tasks"] = _time(n, lambda i: recommend_similar_tasks(users[i], titles[i]))
+
+    client = app.test_client()
+
+    def headers(i, **extra):
+        return {"Authorization": f"Bearer {tokens[users[i]]}", **extra}
+
+    etags = {}
+
+    def get_tasks(i):
+        etags[i] = _expect(client.get("/tasks/", headers=headers(i)), 200).headers.get("ETag")
+
+    results["GET /tasks/.uncached"] = _time(n, get_tasks, before=lambda i: response_cache.clear())
+    results["GET /tasks/.cached"] = _time(n, get_tasks)
+    results["GET /tasks/.not_modified"] = _time(
+        n, lambda i: _expect(client.get("/tasks/", headers=headers(i, **{"If-None-Match": etags[i]})), 304)
+    )
+    results["GET /analytics/overview"] = _time(
+        n, lambda i: _expect(client.get("/analytics/overview", headers=headers(i)), 200),
+        before=lambda i: response_cache.clear(),
+    )
+    calls_before = fake.calls
+    results["POST /tasks/"] = _time(
+        n, lambda i: _expect(client.post("/tasks/", json={"title": inputs[i]}, headers=headers(i)), 201),
+        before=lambda i: suggestion_cache.clear(),
+    )
+
+    return {
+        "config": {
+            "users": args.users,
+            "tasks_per_user": args.tasks_per_user,
+            "iterations": n,
+            "llm_latency_s": args.llm_latency,
+            "seed": args.seed,
+        },
+        "seed_seconds": round(seed_seconds, 2),
+        "llm_calls": fake.calls - calls_before,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tasks-per-user", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds per fake Gemini call")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = run(args, os.path.join(tmp, "bench.db"))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
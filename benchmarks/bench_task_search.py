@@ -0,0 +1,104 @@
+"""
+Times GET /tasks/search's FTS5 lookup against the LIKE fallback on a large SQLite database.
+
+Usage: python -m benchmarks.bench_task_search [--tasks N] [--users U] [--queries Q]
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from app.utils.task_search import FTS5_SEARCH_SQL, SQLITE_FTS_DDL, fts5_match, index_terms, search_terms
+from benchmarks.synthetic import OBJECTS, VERBS, title as _title
+
+HEAVY_USER = 1
+
+
+def _owner(rng, users):
+    return HEAVY_USER if rng.random() < 0.05 else rng.randrange(2, users + 1)
+
+
+def _build(path, tasks, users, rng):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE task (id INTEGER PRIMARY KEY, title VARCHAR(100) NOT NULL, user_id INTEGER NOT NULL)")
+    conn.execute("CREATE INDEX ix_task_user_id ON task (user_id)")
+    conn.execute(SQLITE_FTS_DDL)
+    start = time.perf_counter()
+    batch = 50000
+    for offset in range(0, tasks, batch):
+        rows = [(offset + i + 1, _title(rng), _owner(rng, users)) for i in range(min(batch, tasks - offset))]
+        conn.executemany("INSERT INTO task (id, title, user_id) VALUES (?, ?, ?)", rows)
+        conn.executemany(
+            "INSERT INTO task_fts (rowid, terms) VALUES (?, ?)",
+            [(task_id, index_terms(user_id, title)) for task_id, title, user_id in rows],
+        )
+    conn.execute("INSERT INTO task_fts (task_fts) VALUES ('optimize')")
+    conn.commit()
+    return conn, time.perf_counter() - start
+
+
+def _time(fn, queries):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(*query)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn, build_seconds = _build(os.path.join(tmp, "search.db"), args.tasks, args.users, rng)
+        sql = FTS5_SEARCH_SQL.replace(":match", "?").replace(":limit", "?").replace(":offset", "?")
+
+        def fts(user_id, query):
+            conn.execute(sql, (fts5_match(user_id, search_terms(query)), 21, 0)).fetchall()
+
+        def like(user_id, query):
+            where = " AND ".join("title LIKE ?" for _ in search_terms(query))
+            conn.execute(
+                f"SELECT id FROM task WHERE user_id = ? AND {where} ORDER BY id DESC LIMIT 21",
+                [user_id] + [f"%{term}%" for term in search_terms(query)],
+            ).fetchall()
+
+        def user():
+            return rng.randrange(2, args.users + 1)
+
+        kinds = {
+            "word": [(user(), rng.choice(OBJECTS).split()[0]) for _ in range(args.queries)],
+            "two_words": [(user(), f"{rng.choice(VERBS)} {rng.choice(OBJECTS).split()[0]}") for _ in range(args.queries)],
+            "prefix": [(user(), rng.choice(OBJECTS)[:3]) for _ in range(args.queries)],
+            "common_word": [(user(), "report") for _ in range(args.queries)],
+            "heavy_user": [(HEAVY_USER, rng.choice(OBJECTS).split()[0]) for _ in range(args.queries)],
+        }
+        result = {
+            "benchmark": "task_search",
+            "tasks": args.tasks,
+            "users": args.users,
+            "build_seconds": round(build_seconds, 1),
+            "fts5": {kind: _time(fts, queries) for kind, queries in kinds.items()},
+            "like_scan": {kind: _time(like, queries[:50]) for kind, queries in kinds.items()},
+        }
+        conn.close()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Open-loop load test for a running API server: requests go out on a fixed (or --poisson)
+schedule from --users virtual users, and latency counts from the scheduled send time.
+Run the server with GEMINI_FAKE=1 so the Gemini quota doesn't apply.
+
+Usage: python -m benchmarks.loadtest [--url URL] [--users N] [--rate R] [--duration S]
+                                     [--mix create=4,list=4,update=1,analytics=1]
+                                     [--concurrency C] [--poisson] [--seed N] [--output FILE]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+from benchmarks.synthetic import OBJECTS, task_input, title
+
+DEFAULT_MIX = "create=4,list=4,update=1,analytics=1"
+ENDPOINTS = {
+    "create": "POST /tasks/",
+    "list": "GET /tasks/",
+    "update": "PUT /tasks/<id>",
+    "analytics": "GET /analytics/overview",
+    "search": "GET /tasks/search",
+}
+
+
+def parse_mix(value):
+    """"create=4,list=4" -> {"create": 4.0, "list": 4.0}"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}; choose from {', '.join(ENDPOINTS)}")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"bad weight in {part!r}")
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("the mix needs at least one positive weight")
+    return mix
+
+
+class VirtualUser:
+    def __init__(self, token):
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.task_ids = []
+
+
+class Recorder:
+    """Latency samples and outcomes per endpoint."""
+
+    def __init__(self):
+        self.latency = defaultdict(list)
+        self.service = defaultdict(list)
+        self.errors = defaultdict(Counter)
+
+    def record(self, endpoint, scheduled, sent, status):
+        finished = time.perf_counter()
+        self.latency[endpoint].append(finished - scheduled)
+        self.service[endpoint].append(finished - sent)
+        if not isinstance(status, int) or status >= 400:
+            self.errors[endpoint][str(status)] += 1
+
+    def report(self, elapsed):
+        def summary(latency, service, errors):
+            ordered = sorted(latency)
+            served = sorted(service)
+
+            def pct(samples, q):
+                return round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 2)
+
+            total_errors = sum(errors.values())
+            return {
+                "requests": len(ordered),
+                "throughput_rps": round(len(ordered) / elapsed, 2),
+                "errors": total_errors,
+                "error_rate": round(total_errors / len(ordered), 4),
+                "error_statuses": dict(errors),
+                "p50_ms": pct(ordered, 0.5),
+                "p90_ms": pct(ordered, 0.9),
+                "p99_ms": pct(ordered, 0.99),
+                "max_ms": round(ordered[-1] * 1000, 2),
+                "service_p50_ms": pct(served, 0.5),
+                "service_p99_ms": pct(served, 0.99),
+            }
+
+        endpoints = {
+            endpoint: summary(samples, self.service[endpoint], self.errors[endpoint])
+            for endpoint, samples in sorted(self.latency.items())
+        }
+        everything = [sample for samples in self.latency.values() for sample in samples]
+        overall = summary(
+            everything,
+            [sample for samples in self.service.values() for sample in samples],
+            sum(self.errors.values(), Counter()),
+        ) if everything else {"requests": 0}
+        return {"overall": overall, "endpoints": endpoints}
+
+
+async def _sign_in(client, index, run_id, password):
+    username = f"load-{run_id}-{index}"
+    email = f"{username}@example.com"
+    response = await client.post("/auth/register", json={"username": username, "email": email, "password": password})
+    if response.status_code == 400:
+        response = await client.post("/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return VirtualUser(response.json()["token"])
+
+
+async def setup(client, args, rng):
+    """Sign in the virtual users (a few at a time) and create a first task for each, so updates have a target."""
+    limit = asyncio.Semaphore(min(args.concurrency, 16))
+
+    async def prepare(index):
+        async with limit:
+            user = await _sign_in(client, index, args.run_id, args.password)
+            response = await client.post("/tasks/", json={"title": title(rng)}, headers=user.headers)
+            response.raise_for_status()
+            user.task_ids.append(response.json()["id"])
+            return user
+
+    return await asyncio.gather(*(prepare(i) for i in range(args.users)))
+
+
+async def _send(client, operation, user, rng):
+    """Issue one request; returns the status code."""
+    if operation == "create":
+        response = await client.post("/tasks/", json={"title": task_input(rng)}, headers=user.headers)
+        if response.status_code == 201:
+            user.task_ids.append(response.json()["id"])
+    elif operation == "list":
+        response = await client.get("/tasks/", params={"limit": 50, "order": "desc"}, headers=user.headers)
+    elif operation == "update":
+        task_id = rng.choice(user.task_ids)
+        body = {"status": "completed"} if rng.random() < 0.5 else {"title": title(rng)}
+        response = await client.put(f"/tasks/{task_id}", json=body, headers=user.headers)
+    elif operation == "analytics":
+        response = await client.get("/analytics/overview", headers=user.headers)
+    else:
+        response = await client.get(
+            "/tasks/search", params={"q": rng.choice(OBJECTS).split()[0]}, headers=user.headers
+        )
+    return response.status_code
+
+
+async def drive(client, args, users, rng, recorder):
+    operations = list(args.mix)
+    weights = [args.mix[name] for name in operations]
+    in_flight = asyncio.Semaphore(args.concurrency)
+    pending = set()
+
+    async def one(operation, user, scheduled):
+        async with in_flight:
+            sent = time.perf_counter()
+            try:
+                status = await _send(client, operation, user, rng)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            recorder.record(ENDPOINTS[operation], scheduled, sent, status)
+
+    started = time.perf_counter()
+    scheduled = started
+    deadline = started + args.duration
+    while scheduled < deadline:
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        operation = rng.choices(operations, weights)[0]
+        task = asyncio.create_task(one(operation, rng.choice(users), scheduled))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        scheduled += rng.expovariate(args.rate) if args.poisson else 1 / args.rate
+    if pending:
+        await asyncio.gather(*pending)
+    return time.perf_counter() - started
+
+
+async def main_async(args):
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        setup_started = time.perf_counter()
+        users = await setup(client, args, rng)
+        setup_seconds = time.perf_counter() - setup_started
+        recorder = Recorder()
+        elapsed = await drive(client, args, users, rng, recorder)
+    return {
+        "config": {
+            "url": args.url,
+            "users": args.users,
+            "target_rps": args.rate,
+            "duration_s": args.duration,
+            "mix": args.mix,
+            "concurrency": args.concurrency,
+            "arrivals": "poisson" if args.poisson else "uniform",
+            "seed": args.seed,
+        },
+        "setup_seconds": round(setup_seconds, 2),
+        "elapsed_seconds": round(elapsed, 2),
+        **recorder.report(elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--rate", type=float, default=20.0, help="Requests per second to send, across all users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to send requests for")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--concurrency", type=int, default=100, help="Maximum requests in flight")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--poisson", action="store_true", help="Exponential gaps between requests")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--run-id", default=None, help="Username prefix; reuse one to log existing users back in")
+    parser.add_argument("--password", default="load-test-password")
+    parser.add_argument("--output", help="Write the JSON here instead of stdout")
+    args = parser.parse_args()
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+    args.run_id = args.run_id or str(int(time.time()))
+
+    report = asyncio.run(main_async(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
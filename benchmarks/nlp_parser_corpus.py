@@ -0,0 +1,69 @@
+"""
+Checks parse_user_input due dates against plain dateparser, and cleaned titles where
+given, over data/nlp_parser_corpus.json. "diverge" entries are known dateparser misreads.
+
+Usage: python -m benchmarks.nlp_parser_corpus
+"""
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+from dateparser.search import search_dates
+
+from app.utils.nlp_parser import parse_user_input, clear_parse_cache
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "data", "nlp_parser_corpus.json")
+
+# One base per weekday so weekday arithmetic is exercised from every starting day
+BASES = [datetime(2026, 10, 12, 15, 30, 12, 123456) + timedelta(days=i) for i in range(7)]
+
+
+def dateparser_due_date(text, base):
+    text = re.sub(r'\bcoming\s+(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',
+                  r'next \1', text, flags=re.IGNORECASE)
+    settings = {
+        'PREFER_DATES_FROM': 'future',
+        'RELATIVE_BASE': base,
+        'RETURN_AS_TIMEZONE_AWARE': False,
+        'STRICT_PARSING': False,
+    }
+    for _, date_obj in search_dates(text, settings=settings) or []:
+        if date_obj:
+            return date_obj.isoformat()
+    return None
+
+
+def main():
+    with open(CORPUS_PATH) as f:
+        corpus = json.load(f)
+
+    failures = 0
+    divergences = 0
+    for base in BASES:
+        clear_parse_cache()
+        for case in corpus:
+            expected = dateparser_due_date(case["text"], base)
+            result = parse_user_input(case["text"], relative_base=base)
+            if "title" in case and result["cleaned_task"] != case["title"]:
+                failures += 1
+                print(f"TITLE base={base:%a %Y-%m-%d} text={case['text']!r} "
+                      f"expected={case['title']!r} fast={result['cleaned_task']!r}")
+            actual = result["due_date"]
+            if expected == actual:
+                continue
+            if case.get("expect") == "diverge":
+                divergences += 1
+                continue
+            failures += 1
+            print(f"MISMATCH base={base:%a %Y-%m-%d} text={case['text']!r} "
+                  f"dateparser={expected} fast={actual}")
+
+    checked = len(corpus) * len(BASES)
+    print(json.dumps({"checked": checked, "failures": failures, "known_divergences": divergences}))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
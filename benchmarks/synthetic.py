@@ -0,0 +1,87 @@
+"""
+Synthetic users, task titles and due dates for the benchmarks, from a small grammar so
+titles repeat across users the way real task lists do.
+"""
+import random
+from datetime import datetime, timedelta
+
+VERBS = ["write", "review", "call", "email", "plan", "fix", "prepare", "book", "update", "clean", "schedule", "read"]
+OBJECTS = [
+    "report", "budget", "dentist", "invoice", "presentation", "meeting notes", "garage", "parser bug",
+    "flight", "newsletter", "quarterly plan", "tax return", "client proposal", "team lunch", "kitchen",
+]
+QUALIFIERS = ["", "", "for monday", "before friday", "with anna", "draft", "v2", "again", "for the board"]
+DATE_PHRASES = [
+    "", "", "", "today", "tomorrow", "next friday", "coming monday", "in 3 days", "next week",
+    "by 2026-11-03", "on 12/24", "this weekend",
+]
+
+
+def title(rng):
+    return " ".join(part for part in (rng.choice(VERBS), rng.choice(OBJECTS), rng.choice(QUALIFIERS)) if part)
+
+
+def task_input(rng):
+    """A title as typed into POST /tasks/, sometimes with a due date phrase."""
+    phrase = rng.choice(DATE_PHRASES)
+    return f"{title(rng)} {phrase}".strip()
+
+
+def task_rows(rng, user_ids, tasks_per_user, now=None):
+    """Task column dicts for bulk inserts: created over the last 60 days, ~30% completed, ~30% without due date."""
+    from app.utils.priority import NO_DUE_DATE_DAYS, priority_for
+
+    now = now or datetime.now()
+    for user_id in user_ids:
+        for _ in range(tasks_per_user):
+            created_at = now - timedelta(minutes=rng.randrange(60 * 24 * 60))
+            due_date = None if rng.random() < 0.3 else created_at + timedelta(hours=rng.randrange(1, 24 * 30))
+            completed = rng.random() < 0.3
+            sentiment = round(rng.uniform(-0.5, 0.8), 3)
+            days_left = (due_date.date() - created_at.date()).days if due_date else NO_DUE_DATE_DAYS
+            yield {
+                "title": title(rng),
+                "user_id": user_id,
+                "created_at": created_at,
+                "due_date": due_date,
+                "status": "completed" if completed else "pending",
+                "completed_at": created_at + timedelta(hours=rng.randrange(1, 24 * 7)) if completed else None,
+                "priority": priority_for(sentiment, days_left),
+                "sentiment": sentiment,
+                "suggestions_status": "ready",
+            }
+
+
+def seed_database(users, tasks_per_user, seed=7, batch_size=10000):
+    """
+    Create the schema and N users x M tasks in the app's database, then build the
+    derived data (co-occurrence index, analytics rollups, search index) the way the
+    maintenance commands do. Call inside an app context. Returns the user ids.
+    """
+    from app import db
+    from app.models import Task, User
+    from app.utils import analytics_rollup, recommendation_engine, task_search
+
+    rng = random.Random(seed)
+    db.create_all()
+    db.session.bulk_insert_mappings(User, [
+        {"username": f"bench{i}", "email": f"bench{i}@example.com", "password_hash": "-"}
+        for i in range(users)
+    ])
+    db.session.commit()
+    user_ids = [user_id for (user_id,) in db.session.query(User.id).order_by(User.id)]
+
+    batch = []
+    for row in task_rows(rng, user_ids, tasks_per_user):
+        batch.append(row)
+        if len(batch) == batch_size:
+            db.session.bulk_insert_mappings(Task, batch)
+            batch = []
+    if batch:
+        db.session.bulk_insert_mappings(Task, batch)
+    db.session.commit()
+
+    recommendation_engine.rebuild_index()
+    analytics_rollup.backfill()
+    task_search.rebuild_index()
+    return user_ids
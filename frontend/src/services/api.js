@@ -19,10 +19,22 @@ api.interceptors.request.use(
 );
 
 // Task APIs
-export const fetchTasks = () => api.get("tasks/");
+// GET /tasks/ is paginated; follow X-Next-Cursor until every page is loaded
+export const fetchTasks = async (params = {}) => {
+  const tasks = [];
+  let after;
+  let response;
+  do {
+    response = await api.get("tasks/", { params: { ...params, after } });
+    tasks.push(...response.data);
+    after = response.headers["x-next-cursor"];
+  } while (after);
+  return { ...response, data: tasks };
+};
 export const createTask = (data) => api.post("tasks/", data);
 export const updateTask = (id, data) => api.put(`tasks/${id}`, data);
 export const deleteTask = (id) => api.delete(`tasks/${id}`);
+export const fetchTaskSuggestions = (id) => api.get(`tasks/${id}/suggestions`);
 // Analytics APIs
 export const fetchAnalyticsOverview = () => api.get("analytics/overview");
 export const fetchWeeklyTaskDistribution = () => api.get("analytics/weekly_task_distribution");
@@ -0,0 +1,39 @@
+"""
+Production server config: gunicorn -c gunicorn.conf.py
+
+gevent workers, so an open /tasks/stream is a parked greenlet rather than a pinned thread.
+The local event backend only reaches one worker's streams, so it refuses to start more.
+"""
+import os
+
+from config import Config
+
+SSE_BACKEND = getattr(Config, "SSE_BACKEND", "local")
+
+wsgi_app = "app:create_app()"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2" if SSE_BACKEND == "redis" else "1"))
+worker_class = "gevent"
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+# Streams send a heartbeat every SSE_HEARTBEAT seconds; the timeout only watches the worker's main loop
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 10  # Open streams never finish on their own
+keepalive = 5
+
+
+def on_starting(server):
+    # gunicorn reports a RuntimeError from here and exits instead of starting
+    if server.cfg.workers > 1 and SSE_BACKEND != "redis":
+        raise RuntimeError(
+            f"{server.cfg.workers} workers with SSE_BACKEND={SSE_BACKEND!r}: streams would miss other workers' "
+            "changes. Set SSE_BACKEND = \"redis\" in Config or run a single worker."
+        )
+
+
+def post_fork(server, worker):
+    # psycopg2 blocks the whole worker on every query unless it's told to yield to gevent
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        return
+    patch_psycopg()
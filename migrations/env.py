@@ -43,8 +43,20 @@ def get_metadata():
     Import the db object and return its metadata.
     Import inside function to avoid circular imports.
     """
-    db = current_app.extensions['sqlalchemy'].db
-    return db.metadata
+    db = current_app.extensions['sqlalchemy']
+    # Flask-SQLAlchemy < 3 registered a state object wrapping the extension
+    return getattr(db, 'db', db).metadata
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Leave the full-text search objects out of autogenerate. They are created with
+    raw SQL in migration ecde5c872df0 and aren't in the models (see app/utils/task_search.py).
+    """
+    if type_ == "table" and name.startswith("task_fts"):
+        return False
+    if name in ("title_tsv", "ix_task_title_tsv"):
+        return False
+    return True
 
 def run_migrations_offline():
     """Run migrations in 'offline' mode."""
@@ -52,6 +64,7 @@ def run_migrations_offline():
     context.configure(
         url=url,
         target_metadata=get_metadata(),
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -76,6 +89,7 @@ def run_migrations_online():
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
+            include_object=include_object,
         )
 
         with context.begin_transaction():
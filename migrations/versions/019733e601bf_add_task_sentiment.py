@@ -0,0 +1,27 @@
+"""add task sentiment
+
+Revision ID: 019733e601bf
+Revises: 78e507711835
+Create Date: 2026-10-18 18:05:41.208337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '019733e601bf'
+down_revision = '78e507711835'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Left NULL for existing rows; `flask tasks reprioritize` fills it in on its first run
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sentiment', sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_column('sentiment')
@@ -0,0 +1,33 @@
+"""add task_daily_rollup
+
+Revision ID: 2cf23c35e44e
+Revises: 990fe4f8307e
+Create Date: 2026-10-18 16:31:02.556931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2cf23c35e44e'
+down_revision = '990fe4f8307e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_daily_rollup',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('created', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('overdue', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    # Existing tasks are rolled up with `flask analytics backfill`
+
+
+def downgrade():
+    op.drop_table('task_daily_rollup')
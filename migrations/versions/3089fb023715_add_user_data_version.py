@@ -0,0 +1,26 @@
+"""add user data_version
+
+Revision ID: 3089fb023715
+Revises: 019733e601bf
+Create Date: 2026-10-18 19:12:07.554210
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3089fb023715'
+down_revision = '019733e601bf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('data_version')
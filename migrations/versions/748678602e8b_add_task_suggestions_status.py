@@ -0,0 +1,26 @@
+"""add task suggestions_status
+
+Revision ID: 748678602e8b
+Revises: 6be2d8db6734
+Create Date: 2026-10-18 15:52:37.918402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '748678602e8b'
+down_revision = '6be2d8db6734'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('suggestions_status', sa.String(length=20), nullable=True, server_default='ready'))
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_column('suggestions_status')
@@ -0,0 +1,89 @@
+"""store task suggestions as JSON instead of pickles
+
+Revision ID: 78e507711835
+Revises: 802b304fbe72
+Create Date: 2026-10-18 17:20:06.731590
+
+"""
+import pickle
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '78e507711835'
+down_revision = '802b304fbe72'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def _copy(source_type, target_type, convert):
+    """Rewrite suggestions/complimentary_tasks into the *_new columns, converting each value."""
+    task = sa.table(
+        'task',
+        sa.column('id', sa.Integer),
+        sa.column('suggestions', source_type),
+        sa.column('complimentary_tasks', source_type),
+        sa.column('suggestions_new', target_type),
+        sa.column('complimentary_tasks_new', target_type),
+    )
+    conn = op.get_bind()
+    update = task.update().where(task.c.id == sa.bindparam('task_id')).values(
+        suggestions_new=sa.bindparam('suggestions_value'),
+        complimentary_tasks_new=sa.bindparam('complimentary_value'),
+    )
+    page = (
+        sa.select(task.c.id, task.c.suggestions, task.c.complimentary_tasks)
+        .where(
+            task.c.id > sa.bindparam('last_id'),
+            sa.or_(task.c.suggestions.isnot(None), task.c.complimentary_tasks.isnot(None)),
+        )
+        .order_by(task.c.id)
+        .limit(BATCH_SIZE)
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(page, {'last_id': last_id}).all()
+        if not rows:
+            break
+        conn.execute(update, [
+            {
+                'task_id': row.id,
+                'suggestions_value': convert(row.suggestions),
+                'complimentary_value': convert(row.complimentary_tasks),
+            }
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+
+def _swap(new_type):
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_column('suggestions')
+        batch_op.drop_column('complimentary_tasks')
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.alter_column('suggestions_new', new_column_name='suggestions', existing_type=new_type)
+        batch_op.alter_column('complimentary_tasks_new', new_column_name='complimentary_tasks', existing_type=new_type)
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('suggestions_new', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('complimentary_tasks_new', sa.JSON(), nullable=True))
+
+    def unpickle(value):
+        return pickle.loads(value) if value is not None else None
+    _copy(sa.LargeBinary, sa.JSON, unpickle)
+    _swap(sa.JSON())
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('suggestions_new', sa.PickleType(), nullable=True))
+        batch_op.add_column(sa.Column('complimentary_tasks_new', sa.PickleType(), nullable=True))
+
+    _copy(sa.JSON, sa.LargeBinary, lambda value: pickle.dumps(value) if value is not None else None)
+    _swap(sa.LargeBinary())
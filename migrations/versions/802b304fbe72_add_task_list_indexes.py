@@ -0,0 +1,30 @@
+"""add composite indexes for task listing
+
+Revision ID: 802b304fbe72
+Revises: 2cf23c35e44e
+Create Date: 2026-10-18 16:58:44.019327
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '802b304fbe72'
+down_revision = '2cf23c35e44e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index('ix_task_user_id_status', ['user_id', 'status'], unique=False)
+        batch_op.create_index('ix_task_user_id_due_date', ['user_id', 'due_date'], unique=False)
+        batch_op.create_index('ix_task_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_user_id_created_at_id')
+        batch_op.drop_index('ix_task_user_id_due_date')
+        batch_op.drop_index('ix_task_user_id_status')
@@ -0,0 +1,37 @@
+"""add task_title_index
+
+Revision ID: 990fe4f8307e
+Revises: 748678602e8b
+Create Date: 2026-10-18 16:05:19.472810
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '990fe4f8307e'
+down_revision = '748678602e8b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_title_index',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title_key', sa.String(length=100), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=False),
+    sa.Column('task_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'title_key')
+    )
+    with op.batch_alter_table('task_title_index', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_task_title_index_title_key'), ['title_key'], unique=False)
+    # Existing tasks are indexed with `flask recommendations rebuild`
+
+
+def downgrade():
+    with op.batch_alter_table('task_title_index', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_task_title_index_title_key'))
+
+    op.drop_table('task_title_index')
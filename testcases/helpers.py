@@ -0,0 +1,60 @@
+"""Shared test setup: an app on a throwaway SQLite database, with two registered users."""
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+os.environ.setdefault("GEMINI_FAKE", "1")  # Never call the real Gemini API from tests
+os.environ.setdefault("GEMINI_RATE_PER_MINUTE", "100000")  # Task-creating tests would drain the default quota
+
+try:
+    import config  # noqa: F401  The deployment's config.py, when there is one
+except ImportError:
+    config = types.ModuleType("config")
+    config.Config = type("Config", (), {"SECRET_KEY": "testcases-secret-key-0123456789abcdef"})
+    sys.modules["config"] = config
+
+from app import create_app, db  # noqa: E402
+
+
+class AppTestCase(unittest.TestCase):
+    """A fresh app and database per test; self.headers / self.other_headers authenticate two users."""
+
+    config = {}
+
+    def setUp(self):
+        from app.utils.suggestion_cache import suggestion_cache
+
+        self._tmp = tempfile.TemporaryDirectory()
+        self.app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{self._tmp.name}/test.db",
+            **self.config,
+        })
+        self._ctx = self.app.app_context()
+        self._ctx.push()
+        db.create_all()
+        suggestion_cache.clear()
+        self.client = self.app.test_client()
+        self.headers, self.user_id = self.register("alice")
+        self.other_headers, self.other_user_id = self.register("bob")
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self._ctx.pop()
+        self._tmp.cleanup()
+
+    def register(self, username):
+        response = self.client.post("/auth/register", json={
+            "username": username, "email": f"{username}@example.com", "password": "password",
+        })
+        self.assertIn(response.status_code, (200, 201), response.get_data(as_text=True))
+        body = response.get_json()
+        return {"Authorization": f"Bearer {body['token']}"}, body["user"]["id"]
+
+    def create_task(self, title, headers=None, **fields):
+        response = self.client.post("/tasks/", json={"title": title, **fields}, headers=headers or self.headers)
+        self.assertEqual(response.status_code, 201, response.get_data(as_text=True))
+        return response.get_json()
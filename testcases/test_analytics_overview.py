@@ -0,0 +1,36 @@
+import unittest
+
+from helpers import AppTestCase
+
+
+class OverviewTest(AppTestCase):
+    def test_counts(self):
+        first = self.create_task("plan sprint")
+        self.create_task("write notes")
+        self.client.put(f"/tasks/{first['id']}", json={"status": "completed"}, headers=self.headers)
+        body = self.client.get("/analytics/overview", headers=self.headers).get_json()
+        self.assertEqual((body["total_tasks"], body["completed_tasks"], body["pending_tasks"]), (2, 1, 1))
+        self.assertNotIn("tasks", body)
+
+    def test_task_list_pages_by_cursor_newest_first(self):
+        ids = [self.create_task(f"task {i}")["id"] for i in range(5)]
+        seen, after = [], None
+        while True:
+            query = "include_tasks=true&limit=2" + (f"&after={after}" if after else "")
+            response = self.client.get(f"/analytics/overview?{query}", headers=self.headers)
+            body = response.get_json()
+            seen += [task["id"] for task in body["tasks"]]
+            after = body["tasks_pagination"]["next_cursor"]
+            self.assertEqual(response.headers.get("X-Next-Cursor"), after)
+            if not after:
+                break
+        self.assertEqual(seen, ids[::-1])
+
+    def test_invalid_cursor(self):
+        self.create_task("plan sprint")
+        response = self.client.get("/analytics/overview?include_tasks=true&after=bogus", headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
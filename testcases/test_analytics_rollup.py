@@ -0,0 +1,67 @@
+import unittest
+from datetime import date, datetime, timedelta
+
+from helpers import AppTestCase
+from app.models import TaskDailyRollup
+from app.utils import analytics_rollup
+
+
+def rollups(user_id):
+    rows = TaskDailyRollup.query.filter_by(user_id=user_id).order_by(TaskDailyRollup.day)
+    return {(row.day, field): getattr(row, field) for row in rows for field in analytics_rollup.ROLLUP_FIELDS
+            if getattr(row, field)}
+
+
+class RollupTest(AppTestCase):
+    def test_completing_with_a_utc_suffixed_due_date(self):
+        task = self.create_task("send invoice")
+        response = self.client.put(f"/tasks/{task['id']}", json={
+            "status": "completed", "due_date": "2020-01-01T00:00:00Z",
+        }, headers=self.headers)
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        self.assertEqual(response.get_json()["due_date"], "2020-01-01T00:00:00")
+
+    def test_offset_due_dates_are_stored_as_utc(self):
+        task = self.create_task("call supplier")
+        response = self.client.put(f"/tasks/{task['id']}", json={"due_date": "2030-05-01T02:00:00+02:00"},
+                                   headers=self.headers)
+        self.assertEqual(response.get_json()["due_date"], "2030-05-01T00:00:00")
+
+    def test_live_rollups_match_a_backfill(self):
+        first = self.create_task("plan sprint")
+        self.create_task("write notes")
+        self.client.put(f"/tasks/{first['id']}", json={"status": "completed", "due_date": "2020-01-01T00:00:00"},
+                        headers=self.headers)
+        second = self.create_task("archive files")
+        self.client.delete(f"/tasks/{second['id']}", headers=self.headers)
+        live = rollups(self.user_id)
+        analytics_rollup.backfill()
+        self.assertEqual(live, rollups(self.user_id))
+
+    def test_series_leaves_out_overdue_days_not_yet_passed(self):
+        today = datetime.utcnow().date()
+        analytics_rollup.apply(self.user_id, {(today, "overdue"): 2, (today - timedelta(days=1), "overdue"): 1})
+        buckets = analytics_rollup.series(self.user_id, today - timedelta(days=1), today)
+        self.assertEqual([bucket["overdue"] for bucket in buckets], [1, 0])
+
+    def test_weekly_buckets_start_on_monday_and_are_clipped(self):
+        analytics_rollup.apply(self.user_id, {(date(2026, 3, 2), "created"): 1, (date(2026, 3, 10), "created"): 2})
+        buckets = analytics_rollup.series(self.user_id, date(2026, 3, 4), date(2026, 3, 12), "week")
+        self.assertEqual([(b["period"], b["created"]) for b in buckets], [("2026-03-04", 0), ("2026-03-09", 2)])
+
+    def test_buckets_are_summed_by_the_database(self):
+        # Monday, Sunday of the same week, the following Monday, and the next month
+        days = [date(2026, 3, 9), date(2026, 3, 15), date(2026, 3, 16), date(2026, 4, 1)]
+        analytics_rollup.apply(self.user_id, {(day, "created"): n for n, day in enumerate(days, 1)})
+        bucket = analytics_rollup._bucket_column("sqlite", "week").label("bucket")
+        grouped = TaskDailyRollup.query.with_entities(bucket).group_by(bucket).order_by(bucket).all()
+        self.assertEqual([row.bucket for row in grouped], [date(2026, 3, 9), date(2026, 3, 16), date(2026, 3, 30)])
+
+        weeks = analytics_rollup.series(self.user_id, date(2026, 3, 9), date(2026, 3, 22), "week")
+        self.assertEqual([(b["period"], b["created"]) for b in weeks], [("2026-03-09", 3), ("2026-03-16", 3)])
+        months = analytics_rollup.series(self.user_id, date(2026, 3, 1), date(2026, 4, 30), "month")
+        self.assertEqual([(b["period"], b["created"]) for b in months], [("2026-03-01", 6), ("2026-04-01", 4)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from helpers import AppTestCase
+from app.models import Task
+from app.utils import gemini_suggester
+
+
+class BulkCreateTest(AppTestCase):
+    config = {"BULK_MAX_TASKS": 3}
+
+    def test_mixed_items_report_per_index(self):
+        items = ["Buy milk tomorrow", {"title": "Walk dog"}, {"title": "  "}]
+        response = self.client.post("/tasks/bulk", json=items, headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        body = response.get_json()
+        self.assertEqual((body["created"], body["failed"]), (2, 1))
+        self.assertEqual([r["status"] for r in body["results"]], ["created", "created", "error"])
+        self.assertEqual(body["results"][0]["task"]["title"], "Buy milk")
+        self.assertEqual(Task.query.filter_by(user_id=self.user_id).count(), 2)
+
+    def test_ndjson_body(self):
+        body = "\n".join(json.dumps(item) for item in ["Buy milk", {"title": "Walk dog"}]) + "\n"
+        response = self.client.post("/tasks/bulk", data=body, content_type="application/x-ndjson",
+                                    headers=self.headers)
+        self.assertEqual(response.get_json()["created"], 2)
+
+    def test_duplicate_titles_share_one_suggestion_prompt(self):
+        prompts = []
+
+        def generate_content(prompt):
+            prompts.append(prompt)
+            return SimpleNamespace(text='{"subtasks": ["step"], "similar_tasks": []}')
+        with mock.patch.object(gemini_suggester, "model", SimpleNamespace(generate_content=generate_content)):
+            self.client.post("/tasks/bulk", json=["Buy milk", "buy  milk!", "Walk dog"], headers=self.headers)
+        self.assertEqual(len(prompts), 2)
+
+    def test_limits(self):
+        response = self.client.post("/tasks/bulk", json=["a", "b", "c", "d"], headers=self.headers)
+        self.assertEqual(response.status_code, 413)
+        response = self.client.post("/tasks/bulk", json={"title": "not a list"}, headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from sqlalchemy import update
+
+from helpers import AppTestCase
+from app import db
+from app.models import User
+from app.utils import content_recommender
+from app.utils.content_recommender import TfidfModel, recommend_similar_tasks
+
+TITLES = {
+    1: "write project report",
+    2: "review project budget",
+    3: "buy groceries for dinner",
+    4: "write blog post",
+    5: "plan dinner party",
+}
+
+
+class TfidfModelTest(unittest.TestCase):
+    def test_ranking_matches_scikit_learn(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        model = TfidfModel()
+        for task_id, title in TITLES.items():
+            model.add(task_id, title)
+        query = "write the project plan"
+        vectorizer = TfidfVectorizer(stop_words="english")
+        matrix = vectorizer.fit_transform(list(TITLES.values()))
+        scores = cosine_similarity(vectorizer.transform([query]), matrix)[0]
+        expected = [title for score, title in sorted(zip(scores, TITLES.values()), reverse=True) if score > 0]
+        self.assertEqual(model.most_similar(query, top_n=len(TITLES)), expected)
+
+    def test_incremental_updates_match_a_fresh_model(self):
+        model = TfidfModel()
+        for task_id, title in TITLES.items():
+            model.add(task_id, title)
+        model.remove(3)
+        model.add(1, "write quarterly report")
+
+        fresh = TfidfModel()
+        for task_id, title in {**TITLES, 1: "write quarterly report"}.items():
+            if task_id != 3:
+                fresh.add(task_id, title)
+        self.assertEqual(model.most_similar("write report", 5), fresh.most_similar("write report", 5))
+        self.assertNotIn("groceries", model.df)
+
+
+class RecommendSimilarTasksTest(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        content_recommender._models.clear()  # User ids and versions repeat across test databases
+
+    def test_model_is_kept_up_to_date_without_a_rebuild(self):
+        self.create_task("write project report")
+        self.assertEqual(recommend_similar_tasks(self.user_id, "project report"), ["write project report"])
+        model = content_recommender._models[self.user_id]
+
+        self.create_task("review project budget")
+        self.assertEqual(recommend_similar_tasks(self.user_id, "project budget")[0], "review project budget")
+        self.assertIs(content_recommender._models[self.user_id], model)
+
+    def test_other_processes_writes_trigger_a_rebuild(self):
+        self.create_task("write project report")
+        recommend_similar_tasks(self.user_id, "project")
+        model = content_recommender._models[self.user_id]
+        # A write by another process: its version bump is not recorded in this session
+        db.session.execute(update(User).where(User.id == self.user_id).values(data_version=User.data_version + 1))
+        db.session.commit()
+        recommend_similar_tasks(self.user_id, "project")
+        self.assertIsNot(content_recommender._models[self.user_id], model)
+
+    def test_recommendations_only_come_from_the_users_own_tasks(self):
+        self.create_task("write project report", headers=self.other_headers)
+        self.assertEqual(recommend_similar_tasks(self.user_id, "project report"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
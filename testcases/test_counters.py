@@ -0,0 +1,41 @@
+import unittest
+from datetime import date
+from unittest import mock
+
+from helpers import AppTestCase
+from app import db
+from app.models import TaskDailyRollup
+from app.utils import counters
+from app.utils.counters import add_counts
+
+
+class AddCountsTest(AppTestCase):
+    def add(self, day, created):
+        add_counts(
+            TaskDailyRollup,
+            [{"user_id": self.user_id, "day": day, "created": created, "completed": 0, "overdue": 0}],
+            keys=("user_id", "day"),
+            counters=("created", "completed", "overdue"),
+        )
+
+    def created(self):
+        return {row.day: row.created for row in TaskDailyRollup.query.filter_by(user_id=self.user_id)}
+
+    def test_inserts_then_increments(self):
+        self.add(date(2026, 3, 4), 2)
+        self.add(date(2026, 3, 4), 3)
+        self.add(date(2026, 3, 5), -1)
+        db.session.commit()
+        self.assertEqual(self.created(), {date(2026, 3, 4): 5, date(2026, 3, 5): -1})
+
+    def test_update_then_insert_fallback(self):
+        # Dialects without ON CONFLICT take the UPDATE, then INSERT path
+        with mock.patch.dict(counters._UPSERTS, clear=True):
+            self.add(date(2026, 3, 4), 2)
+            self.add(date(2026, 3, 4), 3)
+        db.session.commit()
+        self.assertEqual(self.created(), {date(2026, 3, 4): 5})
+
+
+if __name__ == "__main__":
+    unittest.main()
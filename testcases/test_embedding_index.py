@@ -0,0 +1,79 @@
+import tempfile
+import threading
+import unittest
+import zlib
+
+import helpers  # noqa: F401
+from app.utils.embedding_index import EmbeddingIndex
+from app.utils.lazy import get_numpy
+
+DIM = 8
+
+
+def fake_embed(titles):
+    """Deterministic unit vectors; titles sharing a first word point the same way."""
+    np = get_numpy()
+    vectors = np.array([
+        np.random.default_rng(zlib.crc32(title.split()[0].encode())).standard_normal(DIM)
+        + 0.1 * np.random.default_rng(zlib.crc32(title.encode())).standard_normal(DIM)
+        for title in titles
+    ], dtype=np.float32).reshape(len(titles), DIM)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class EmbeddingIndexTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.embedded = []
+
+        def embed(titles):
+            self.embedded.extend(titles)
+            return fake_embed(titles)
+        self.index = EmbeddingIndex(self._tmp.name, DIM, embed_fn=embed, initial_capacity=2, row_cache_size=3)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_titles_are_embedded_once_and_the_files_grow(self):
+        titles = [f"task {i}" for i in range(10)]
+        rows = self.index.rows(titles + titles[:2])
+        self.assertEqual(rows, list(range(10)) + [0, 1])
+        self.assertEqual(len(self.embedded), 10)
+        self.assertEqual(self.index.rows(titles), list(range(10)))
+        self.assertEqual(len(self.embedded), 10)
+
+    def test_row_cache_is_bounded(self):
+        self.index.rows([f"task {i}" for i in range(10)])
+        self.assertEqual(list(self.index._row_by_title), ["task 7", "task 8", "task 9"])
+
+    def test_other_processes_rows_are_picked_up(self):
+        self.index.rows(["buy milk", "buy eggs"])
+        other = EmbeddingIndex(self._tmp.name, DIM, embed_fn=fake_embed)
+        self.assertEqual(other.rows(["buy eggs"]), [1])
+        other.rows(["walk dog"])
+        self.assertEqual(self.index.rows(["walk dog"]), [2])
+        self.assertEqual(self.embedded, ["buy milk", "buy eggs"])
+
+    def test_search_ranks_candidates_and_skips_the_query(self):
+        candidates = ["buy eggs", "walk dog", "buy bread"]
+        results = self.index.search("buy milk", top_n=2, candidate_titles=candidates + ["buy milk"])
+        self.assertEqual(sorted(results), ["buy bread", "buy eggs"])
+
+    def test_concurrent_lookups_agree(self):
+        titles = [f"task {i}" for i in range(50)]
+        results = []
+
+        def lookup():
+            results.append(self.index.rows(titles))
+        threads = [threading.Thread(target=lookup) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.index), 50)
+        self.assertTrue(all(rows == results[0] for rows in results))
+        self.assertLessEqual(len(self.index._row_by_title), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
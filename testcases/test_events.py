@@ -0,0 +1,73 @@
+import unittest
+
+from helpers import AppTestCase
+from app.utils.events import EventHub, LocalBackend
+
+
+def first_chunks(response, count):
+    chunks = response.response
+    try:
+        return [next(chunks) for _ in range(count)]
+    finally:
+        response.close()
+
+
+class LocalBackendTest(unittest.TestCase):
+    def test_resume_after_a_known_id(self):
+        backend = LocalBackend(buffer_size=3)
+        first = backend.publish("1", {"type": "task.created"})
+        backend.publish("1", {"type": "task.updated"})
+        cursor, gap = backend.resume("1", first)
+        self.assertEqual((cursor, gap), (first, False))
+        self.assertEqual([data["type"] for _, data in backend.read("1", cursor, 0)], ["task.updated"])
+
+    def test_evicted_or_unknown_ids_are_a_gap(self):
+        backend = LocalBackend(buffer_size=2)
+        first = backend.publish("1", {"type": "a"})
+        backend.publish("1", {"type": "b"})
+        backend.publish("1", {"type": "c"})
+        self.assertFalse(backend.resume("1", first)[1])  # Only "a" was dropped, and the client has it
+        backend.publish("1", {"type": "d"})
+        self.assertTrue(backend.resume("1", first)[1])
+        self.assertTrue(backend.resume("1", "999")[1])
+        self.assertTrue(backend.resume("1", "not-an-id")[1])
+
+    def test_subscribe_sends_a_reset_then_new_events(self):
+        hub = EventHub(LocalBackend(buffer_size=1))
+        hub.publish(1, {"type": "a"})
+        hub.publish(1, {"type": "b"})
+        stream = hub.subscribe(1, last_event_id="0", heartbeat=0)
+        self.assertEqual(next(stream), "retry: 3000\n\n")
+        self.assertIn("event: reset", next(stream))
+        hub.publish(1, {"type": "task.deleted"})
+        self.assertIn("event: task.deleted", next(stream))
+
+
+class StreamAuthTest(AppTestCase):
+    config = {"SSE_HEARTBEAT": 0.01}
+
+    def test_header_token(self):
+        response = self.client.get("/tasks/stream", headers=self.headers, buffered=False)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(first_chunks(response, 1), [b"retry: 3000\n\n"])
+
+    def test_stream_token_in_the_query_string(self):
+        body = self.client.post("/tasks/stream/token", headers=self.headers).get_json()
+        self.assertEqual(body["expires_in"], 60)
+        response = self.client.get(f"/tasks/stream?jwt={body['token']}", buffered=False)
+        self.assertEqual(response.status_code, 200)
+        first_chunks(response, 1)
+
+    def test_regular_tokens_stay_out_of_urls(self):
+        token = self.headers["Authorization"].split()[1]
+        self.assertEqual(self.client.get(f"/tasks/stream?jwt={token}").status_code, 401)
+
+    def test_stream_tokens_only_open_the_stream(self):
+        token = self.client.post("/tasks/stream/token", headers=self.headers).get_json()["token"]
+        response = self.client.get("/tasks/", headers={"Authorization": f"Bearer {token}"})
+        self.assertNotEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(f"/tasks/?jwt={token}").status_code, 401)
+
+
+if __name__ == "__main__":
+    unittest.main()
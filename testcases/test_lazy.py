@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import unittest
+
+import helpers  # noqa: F401
+from app.utils import lazy as lazy_module
+from app.utils.lazy import lazy, load_report, warmup
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HEAVY = ["spacy", "dateparser", "textblob", "sklearn", "google.generativeai", "transformers", "torch"]
+
+
+class LazyTest(unittest.TestCase):
+    def tearDown(self):
+        for name in ("test-once", "test-broken"):
+            lazy_module._loaders.pop(name, None)
+            lazy_module._load_seconds.pop(name, None)
+            lazy_module._load_errors.pop(name, None)
+
+    def test_loader_runs_once_across_threads(self):
+        calls = []
+
+        @lazy("test-once")
+        def load():
+            calls.append(1)
+            return object()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(load())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(set(map(id, results))), 1)
+        self.assertIn("test-once", load_report()["loaded"])
+
+    def test_warmup_reports_failures_instead_of_raising(self):
+        @lazy("test-broken")
+        def load():
+            raise ImportError("no such model")
+        report = warmup(["test-broken"])
+        self.assertEqual(report["errors"]["test-broken"], "ImportError: no such model")
+        self.assertIn("test-broken", report["not_loaded"])
+
+
+class StartupTest(unittest.TestCase):
+    def test_create_app_leaves_heavy_dependencies_unloaded(self):
+        script = (
+            "import json, sys\n"
+            "import helpers\n"
+            "from app import create_app\n"
+            "create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})\n"
+            f"print(json.dumps([name for name in {HEAVY!r} if name in sys.modules]))\n"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([HERE, os.path.dirname(HERE)]))
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env,
+                                cwd=os.path.dirname(HERE), check=True).stdout
+        self.assertEqual(json.loads(output.strip().splitlines()[-1]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import argparse
+import unittest
+
+import helpers  # noqa: F401
+from benchmarks.loadtest import Recorder, parse_mix
+
+
+class ParseMixTest(unittest.TestCase):
+    def test_weights(self):
+        self.assertEqual(parse_mix("create=4, list, search=0"), {"create": 4.0, "list": 1.0, "search": 0.0})
+        for bad in ("delete=1", "create=x", "create=0"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_mix(bad)
+
+
+class RecorderTest(unittest.TestCase):
+    def test_report(self):
+        recorder = Recorder()
+        for i, status in enumerate([200] * 8 + [503, "ConnectError"]):
+            recorder.latency["GET /tasks/"].append((i + 1) / 1000)
+            recorder.service["GET /tasks/"].append((i + 1) / 2000)
+            if status != 200:
+                recorder.errors["GET /tasks/"][str(status)] += 1
+        report = recorder.report(elapsed=2.0)
+        tasks = report["endpoints"]["GET /tasks/"]
+        self.assertEqual((tasks["requests"], tasks["throughput_rps"]), (10, 5.0))
+        self.assertEqual((tasks["errors"], tasks["error_rate"]), (2, 0.2))
+        self.assertEqual(tasks["error_statuses"], {"503": 1, "ConnectError": 1})
+        self.assertEqual((tasks["p50_ms"], tasks["max_ms"], tasks["service_p50_ms"]), (6.0, 10.0, 3.0))
+        self.assertEqual(report["overall"]["requests"], 10)
+
+    def test_empty_run(self):
+        self.assertEqual(Recorder().report(elapsed=1.0), {"overall": {"requests": 0}, "endpoints": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import unittest
+
+import helpers  # noqa: F401
+from app.utils.local_suggester import KeywordMatcher, _Rules, extra_suggestions, get_local_suggestions
+
+
+class KeywordMatcherTest(unittest.TestCase):
+    def test_every_keyword_is_found_in_one_pass(self):
+        matcher = KeywordMatcher([("code review", "review"), ("review", "any review"), ("team", "team"),
+                                  ("team code", "pairing")])
+        self.assertEqual(matcher.matches("Schedule team code review"), ["review", "any review", "team", "pairing"])
+
+    def test_whole_words_and_plurals(self):
+        matcher = KeywordMatcher([("report", "report")])
+        self.assertEqual(matcher.matches("Send the reports"), ["report"])
+        self.assertEqual(matcher.matches("Reporting lines"), [])
+
+
+class ShippedRulesTest(unittest.TestCase):
+    def test_baseline_keywords(self):
+        self.assertEqual(get_local_suggestions("Team meeting"),
+                         ["Prepare agenda", "Send calendar invite", "Book conference room"])
+        self.assertEqual(get_local_suggestions("Quarterly report and email"),
+                         ["Gather data", "Draft report", "Review with team",
+                          "Draft email", "Send follow-up", "Attach documents"])
+        self.assertEqual(get_local_suggestions("Water plants"), ["No specific suggestions available."])
+        self.assertEqual(extra_suggestions("Finish assignment"),
+                         "1. Research topic\n2. Draft answers\n3. Proofread\n4. Submit")
+
+
+class ReloadTest(unittest.TestCase):
+    def write(self, keyword, mtime):
+        with open(self.path, "w") as f:
+            json.dump({
+                "suggestions": [{"keywords": [keyword], "suggestions": [f"about {keyword}"]}],
+                "extras": [], "default_extra": "", "no_match": ["nothing"],
+            }, f)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_changed_files_are_reloaded_and_broken_ones_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.path = os.path.join(tmp, "rules.json")
+            self.write("garden", 1000)
+            rules = _Rules(self.path, reload_interval=0)
+            self.assertEqual(rules.get().suggestion_matcher.matches("garden party"), [["about garden"]])
+
+            self.write("party", 2000)
+            self.assertEqual(rules.get().suggestion_matcher.matches("garden party"), [["about party"]])
+
+            with open(self.path, "w") as f:
+                f.write("{not json")
+            os.utime(self.path, (3000, 3000))
+            self.assertEqual(rules.get().suggestion_matcher.matches("garden party"), [["about party"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from helpers import AppTestCase
+from app.utils.metrics import Registry, server_timing
+
+
+class ServerTimingTest(unittest.TestCase):
+    def test_repeated_spans_are_summed(self):
+        value = server_timing([("parse", 0.001), ("llm", 0.2), ("parse", 0.002)], db=(3, 0.004), total=0.25)
+        self.assertEqual(value, 'parse;desc="x2";dur=3.00, llm;dur=200.00, db;desc="3 queries";dur=4.00, '
+                                'total;dur=250.00')
+
+    def test_histograms_render_cumulative_buckets(self):
+        registry = Registry()
+        for seconds in (0.002, 0.002, 0.3):
+            registry.observe("stage_seconds", (("stage", "parse"),), seconds, buckets=(0.01, 1.0), window=10)
+        text = registry.render()
+        self.assertIn('stage_seconds_bucket{stage="parse",le="0.01"} 2', text)
+        self.assertIn('stage_seconds_bucket{stage="parse",le="+Inf"} 3', text)
+        self.assertIn('stage_seconds_quantile{stage="parse",quantile="0.5"} 0.002', text)
+
+
+class MetricsEndpointTest(AppTestCase):
+    config = {"METRICS_TOKEN": "scrape-secret"}
+
+    def test_requests_carry_server_timing(self):
+        response = self.client.get("/tasks/", headers=self.headers)
+        self.assertRegex(response.headers["Server-Timing"], r'db;desc="\d+ queries";dur=[\d.]+, total;dur=[\d.]+$')
+
+    def test_scrapes_need_the_token(self):
+        self.client.get("/tasks/", headers=self.headers)
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        self.assertEqual(self.client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code, 403)
+        response = self.client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        self.assertEqual(response.status_code, 200)
+        text = response.get_data(as_text=True)
+        self.assertIn('app_requests_total{endpoint="tasks.TasksList",method="GET",status="200"}', text)
+        self.assertIn("app_response_cache_lookups_total", text)
+
+
+class MetricsWithoutTokenTest(AppTestCase):
+    def test_no_token_hides_the_endpoint(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
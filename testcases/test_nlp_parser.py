@@ -0,0 +1,76 @@
+import unittest
+from datetime import datetime, timedelta
+
+import helpers  # noqa: F401
+from app.utils import nlp_parser
+from app.utils.nlp_parser import parse_user_input, parse_user_inputs
+
+BASE = datetime(2026, 3, 4, 9, 30)  # A Wednesday
+
+
+class FastPathTest(unittest.TestCase):
+    def setUp(self):
+        nlp_parser.clear_parse_cache()
+
+    def test_relative_day(self):
+        result = parse_user_input("call the bank tomorrow", relative_base=BASE)
+        self.assertEqual(result["due_date"], (BASE + timedelta(days=1)).isoformat())
+        self.assertEqual(result["cleaned_task"], "call the bank")
+
+    def test_weekday_is_the_next_occurrence_at_midnight(self):
+        result = parse_user_input("team sync next monday", relative_base=BASE)
+        self.assertEqual(result["due_date"], "2026-03-09T00:00:00")
+        self.assertEqual(result["cleaned_task"], "team sync")
+
+    def test_in_n_days(self):
+        result = parse_user_input("renew passport in 3 days", relative_base=BASE)
+        self.assertEqual(result["due_date"], (BASE + timedelta(days=3)).isoformat())
+
+    def test_iso_date(self):
+        result = parse_user_input("file taxes on 2026-04-15", relative_base=BASE)
+        self.assertEqual(result["due_date"], "2026-04-15T00:00:00")
+        self.assertEqual(result["cleaned_task"], "file taxes")
+
+    def test_leading_on_is_part_of_the_phrase(self):
+        result = parse_user_input("call bob on monday", relative_base=BASE)
+        self.assertEqual(result["due_date"], "2026-03-09T00:00:00")
+        self.assertEqual(result["cleaned_task"], "call bob")
+        result = parse_user_input("submit report on tomorrow", relative_base=BASE)
+        self.assertEqual(result["cleaned_task"], "submit report")
+
+    def test_possessives_are_not_dates(self):
+        for text in ("Review today's PRs", "Review today’s PRs", "Monday's standup notes"):
+            with self.subTest(text=text):
+                self.assertIsNone(nlp_parser._fast_scan(text, BASE))
+                self.assertEqual(parse_user_input(text, relative_base=BASE)["cleaned_task"], text)
+
+    def test_no_date(self):
+        result = parse_user_input("water the plants", relative_base=BASE)
+        self.assertIsNone(result["due_date"])
+        self.assertEqual(result["cleaned_task"], "water the plants")
+
+
+class ParseCacheTest(unittest.TestCase):
+    def setUp(self):
+        nlp_parser.clear_parse_cache()
+
+    def test_repeated_input_hits_the_cache(self):
+        parse_user_input("buy milk tomorrow", relative_base=BASE)
+        parse_user_input("buy  milk tomorrow", relative_base=BASE)
+        info = nlp_parser.parse_cache_info()
+        self.assertEqual((info["hits"], info["misses"]), (1, 1))
+
+    def test_relative_dates_follow_the_callers_time(self):
+        parse_user_input("buy milk tomorrow", relative_base=BASE)
+        later = BASE + timedelta(hours=5)
+        result = parse_user_input("buy milk tomorrow", relative_base=later)
+        self.assertEqual(result["due_date"], (later + timedelta(days=1)).isoformat())
+
+    def test_batch_keeps_input_order_and_parses_duplicates_once(self):
+        results = parse_user_inputs(["a today", "b tomorrow", "a today"], relative_base=BASE)
+        self.assertEqual([r["cleaned_task"] for r in results], ["a", "b", "a"])
+        self.assertEqual(nlp_parser.parse_cache_info()["size"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest import mock
+
+import helpers  # noqa: F401
+from app.utils import nlp_workers
+from app.utils.nlp_parser import parse_entries
+from app.utils.nlp_workers import NLPBusy, NLPTimeout, NLPWorkerPool
+
+BASE = datetime(2026, 10, 14, 9, 30)
+TITLES = ["buy milk tomorrow", "call mom on friday", "ship release on 2026-11-02", "water plants"]
+
+
+def fallback(texts, relative_base):
+    raise AssertionError("parsed in-process")
+
+
+class WorkerPoolTest(unittest.TestCase):
+    def setUp(self):
+        # Spawned workers import app, and with it config; give them helpers' Config when there's no config.py
+        if getattr(sys.modules["config"], "__file__", None) is None:
+            tmp = tempfile.TemporaryDirectory()
+            self.addCleanup(tmp.cleanup)
+            with open(os.path.join(tmp.name, "config.py"), "w") as f:
+                f.write(f"class Config:\n    SECRET_KEY = {sys.modules['config'].Config.SECRET_KEY!r}\n")
+            sys.path.insert(0, tmp.name)
+            self.addCleanup(sys.path.remove, tmp.name)
+
+    def test_workers_parse_like_the_api_process(self):
+        pool = NLPWorkerPool()
+        pool.workers, pool.max_pending, pool.chunk_size = 2, 8, 1
+        try:
+            self.assertTrue(pool._pool()[2].wait(timeout=60), "workers didn't start")
+            self.assertEqual(pool.parse(TITLES, BASE, fallback), parse_entries(TITLES, BASE))
+        finally:
+            pool.shutdown()
+
+
+class BackpressureTest(unittest.TestCase):
+    """Batches go to a thread pool here, so a patched _parse_batch can stall them."""
+
+    def setUp(self):
+        self.pool = NLPWorkerPool()
+        self.pool.workers, self.pool.max_pending, self.pool.queue_wait, self.pool.timeout = 1, 1, 0.05, 0.2
+        self.pool._executor = ThreadPoolExecutor(max_workers=2)
+        self.pool._pid = os.getpid()
+        self.pool._slots = threading.BoundedSemaphore(1)
+        self.pool._ready.set()
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.pool._executor.shutdown(wait=True)
+
+    def stalled(self, texts, relative_base):
+        self.release.wait(5)
+        return parse_entries(texts, relative_base)
+
+    def test_slow_batches_time_out(self):
+        with mock.patch.object(nlp_workers, "_parse_batch", self.stalled):
+            started = time.monotonic()
+            with self.assertRaises(NLPTimeout):
+                self.pool.parse(TITLES[:1], BASE, fallback)
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_callers_get_busy_when_every_slot_is_taken(self):
+        with mock.patch.object(nlp_workers, "_parse_batch", self.stalled):
+            self.pool._executor.submit(lambda: None)
+            self.pool._slots.acquire()  # One batch already queued or running
+            with self.assertRaises(NLPBusy):
+                self.pool.parse(TITLES[:1], BASE, fallback)
+
+    def test_in_process_parsing_until_the_workers_are_ready(self):
+        self.pool._ready.clear()
+        self.assertEqual(self.pool.parse(TITLES, BASE, lambda texts, base: ["local"] * len(texts)),
+                         ["local"] * len(TITLES))
+
+
+if __name__ == "__main__":
+    unittest.main()
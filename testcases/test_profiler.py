@@ -0,0 +1,62 @@
+import threading
+import time
+import unittest
+from collections import Counter
+
+from helpers import AppTestCase
+from app.utils.profiler import Profiler, Sampler
+
+
+def spin(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class SamplerTest(unittest.TestCase):
+    def test_counts_the_registered_threads_stacks(self):
+        sampler = Sampler(interval=0.001)
+        stop = threading.Event()
+        started = threading.Event()
+        stacks = []
+
+        def work():
+            sampler.start(threading.get_ident())
+            started.set()
+            spin(stop)
+            stacks.append(sampler.stop(threading.get_ident()))
+        thread = threading.Thread(target=work)
+        thread.start()
+        started.wait()
+        time.sleep(0.05)
+        stop.set()
+        thread.join()
+        self.assertTrue(stacks[0])
+        self.assertTrue(any(stack.endswith("test_profiler:spin") for stack in stacks[0]))
+
+    def test_collapsed_output_is_rooted_at_the_endpoint(self):
+        profiles = [
+            {"endpoint": "tasks.TasksList", "stacks": Counter({"a;b": 2, "a": 1})},
+            {"endpoint": "tasks.TasksList", "stacks": Counter({"a;b": 3})},
+        ]
+        self.assertEqual(Profiler.collapsed(profiles), "tasks.TasksList;a;b 5\ntasks.TasksList;a 1\n")
+
+
+class ProfilerEndpointTest(AppTestCase):
+    config = {"PROFILE_ENABLED": True, "PROFILE_TOKEN": "profile-secret", "PROFILE_INTERVAL": 0.001}
+
+    def test_only_requests_with_the_token_are_profiled(self):
+        plain = self.client.get("/tasks/", headers=self.headers)
+        self.assertNotIn("X-Profile-Id", plain.headers)
+        profiled = self.client.get("/tasks/", headers={**self.headers, "X-Profile-Token": "profile-secret"})
+        profile_id = profiled.headers["X-Profile-Id"]
+
+        self.assertEqual(self.client.get("/admin/profiles").status_code, 403)
+        found = self.client.get("/admin/profiles", query_string={"format": "json", "endpoint": "tasks.TasksList"},
+                                headers={"X-Profile-Token": "profile-secret"}).get_json()
+        self.assertIn(profile_id, [record["id"] for record in found])
+        collapsed = self.client.get("/admin/profiles", headers={"X-Profile-Token": "profile-secret"})
+        self.assertEqual(collapsed.mimetype, "text/plain")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from helpers import AppTestCase
+from app.utils import recommendation_engine
+from app.utils.recommendation_engine import CooccurrenceIndex, get_similar_tasks
+
+
+class CooccurrenceIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = CooccurrenceIndex(min_users=2)
+        for user_id in (1, 2, 3):
+            self.index.add(user_id, "plan trip")
+            self.index.add(user_id, "book flights")
+        self.index.add(1, "call my landlord about the leak")
+        self.index.add(2, "pack bags")
+        self.index.add(3, "pack bags")
+
+    def test_ranks_titles_by_cosine(self):
+        self.assertEqual([t for t, _ in self.index.similar("plan trip")], ["book flights", "pack bags"])
+
+    def test_titles_too_few_users_have_are_never_recommended(self):
+        titles = [t for t, _ in self.index.similar("plan trip", top_n=10)]
+        self.assertNotIn("call my landlord about the leak", titles)
+
+    def test_skips_the_callers_own_titles(self):
+        self.assertEqual([t for t, _ in self.index.similar("plan trip", exclude_user=2)], [])
+        self.assertEqual([t for t, _ in self.index.similar("plan trip", exclude_user=1)], ["pack bags"])
+
+    def test_memoized_answer_drops_titles_that_lost_users(self):
+        self.index.similar("plan trip")
+        self.index.remove(3, "pack bags")
+        self.assertEqual([t for t, _ in self.index.similar("plan trip")], ["book flights"])
+
+
+class GetSimilarTasksTest(AppTestCase):
+    def test_only_other_users_shared_titles(self):
+        carol_headers, _ = self.register("carol")
+        for headers in (self.headers, self.other_headers, carol_headers):
+            self.create_task("Plan trip", headers=headers)
+            self.create_task("Book flights", headers=headers)
+        self.create_task("Email Dr. Jones my test results", headers=self.other_headers)
+        recommendation_engine.rebuild_index()
+
+        self.assertEqual(get_similar_tasks(str(self.user_id), "plan trip"), [])
+        self.assertEqual(get_similar_tasks(str(self.user_id), "book flights"), [])
+        _, dave_id = self.register("dave")
+        self.assertEqual(get_similar_tasks(str(dave_id), "plan trip"), ["Book flights"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from datetime import datetime, timedelta
+
+from helpers import AppTestCase
+from app import db
+from app.models import Task
+from app.utils.reprioritize import recompute_chunk, reprioritize
+
+NOW = datetime(2026, 3, 4, 9, 30)
+
+
+def changes(rows):
+    return {change["id"]: (change["priority"], change["status"]) for change in recompute_chunk(rows, NOW.date(), NOW)}
+
+
+class RecomputeChunkTest(unittest.TestCase):
+    def test_priority_follows_the_due_date_both_ways(self):
+        result = changes([
+            (1, NOW + timedelta(days=2), 0.0, 4, "in progress"),  # Closer: promoted
+            (2, NOW + timedelta(days=30), 0.0, 2, "in progress"),  # Moved out: demoted
+            (3, NOW + timedelta(days=30), 0.0, 4, "in progress"),  # Unchanged
+        ])
+        self.assertEqual(result, {1: (2, "in progress"), 2: (4, "in progress")})
+
+    def test_urgency_is_set_and_cleared(self):
+        result = changes([
+            (1, NOW + timedelta(hours=3), 0.0, 2, "pending"),
+            (2, NOW + timedelta(hours=3), 0.0, 2, None),
+            (3, NOW + timedelta(days=30), 0.0, 4, "urgent"),
+            (4, NOW + timedelta(hours=3), 0.0, 2, "in progress"),
+        ])
+        self.assertEqual(result, {1: (2, "urgent"), 2: (2, "urgent"), 3: (4, "pending")})
+
+
+class ReprioritizeTest(AppTestCase):
+    def test_tasks_without_a_status_are_open(self):
+        task = Task(title="file report", user_id=self.user_id, status=None, priority=4, sentiment=0.0,
+                    due_date=datetime.now() + timedelta(hours=2), created_at=datetime.now())
+        done = Task(title="old report", user_id=self.user_id, status="completed", priority=4, sentiment=0.0,
+                    due_date=datetime.now() + timedelta(hours=2), created_at=datetime.now())
+        db.session.add_all([task, done])
+        db.session.commit()
+
+        stats = reprioritize()
+        self.assertEqual((stats["open_tasks"], stats["updated"]), (1, 1))
+        db.session.expire_all()
+        self.assertEqual((task.status, task.priority), ("urgent", 2))
+        self.assertEqual((done.status, done.priority), ("completed", 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
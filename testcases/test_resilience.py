@@ -0,0 +1,93 @@
+import threading
+import time
+import unittest
+
+import helpers  # noqa: F401
+from app.utils.fake_gemini import FakeGeminiModel
+from app.utils.resilience import (CircuitBreaker, CircuitOpen, DeadlineExceeded, RateLimited, ResilientClient,
+                                  TokenBucket)
+
+PROMPT = 'Given the task: "write report":'
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_then_refill(self):
+        bucket = TokenBucket(rate=20, capacity=2)
+        self.assertTrue(bucket.try_acquire())
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        self.assertTrue(bucket.try_acquire(timeout=0.2))
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_failures_and_probes_once(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.05)
+        breaker.record(False)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        breaker.record(False)
+        self.assertFalse(breaker.allow())
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # Only one trial call while half-open
+        breaker.record(True)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = CircuitBreaker(failure_threshold=1, slow_call_seconds=0.1)
+        breaker.record(True, seconds=0.5)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+
+class ResilientClientTest(unittest.TestCase):
+    def client(self, model, **kwargs):
+        return ResilientClient(lambda: model, **{"rate_per_minute": 6000, "burst": 10, "rate_wait": 0, **kwargs})
+
+    def test_deadline(self):
+        client = self.client(FakeGeminiModel(latency=0.5), timeout=0.05)
+        started = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            client.generate_content(PROMPT)
+        self.assertLess(time.monotonic() - started, 0.3)
+
+    def test_rate_limit(self):
+        client = self.client(FakeGeminiModel(), rate_per_minute=1, burst=1)
+        client.generate_content(PROMPT)
+        with self.assertRaises(RateLimited):
+            client.generate_content(PROMPT)
+
+    def test_circuit_opens_after_failures(self):
+        model = FakeGeminiModel(failure_rate=1)
+        client = self.client(model, breaker=CircuitBreaker(failure_threshold=2))
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                client.generate_content(PROMPT)
+        with self.assertRaises(CircuitOpen):
+            client.generate_content(PROMPT)
+        self.assertEqual(model.calls, 2)
+
+    def test_hedged_request_wins_over_a_slow_one(self):
+        class FirstCallSlow:
+            calls = 0
+            lock = threading.Lock()
+
+            def generate_content(self, prompt):
+                with self.lock:
+                    self.calls += 1
+                    first = self.calls == 1
+                time.sleep(1 if first else 0)
+                return "slow" if first else "hedged"
+        model = FirstCallSlow()
+        client = self.client(model, timeout=0.5, hedge_after=0.05)
+        self.assertEqual(client.generate_content(PROMPT), "hedged")
+        self.assertEqual(model.calls, 2)
+
+
+class FakeGeminiTest(unittest.TestCase):
+    def test_answers_about_the_prompted_title(self):
+        text = FakeGeminiModel().generate_content(PROMPT).text
+        self.assertIn("Outline the steps for write report", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
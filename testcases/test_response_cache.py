@@ -0,0 +1,55 @@
+import unittest
+
+from helpers import AppTestCase
+from app.utils.response_cache import response_cache
+
+
+class ConditionalGetTest(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        response_cache.clear()
+
+    def get(self, etag=None, headers=None):
+        headers = dict(headers or self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        return self.client.get("/tasks/", headers=headers)
+
+    def test_unchanged_list_is_not_modified(self):
+        self.create_task("Write report")
+        first = self.get()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers["Cache-Control"], "private, no-cache")
+        again = self.get(first.headers["ETag"])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.headers["ETag"], first.headers["ETag"])
+
+    def test_writes_invalidate(self):
+        task_id = self.create_task("Write report")["id"]
+        etag = self.get().headers["ETag"]
+        self.client.put(f"/tasks/{task_id}", json={"status": "completed"}, headers=self.headers)
+        after_update = self.get(etag)
+        self.assertEqual(after_update.status_code, 200)
+        self.assertEqual(after_update.get_json()[0]["status"], "completed")
+
+        self.client.delete(f"/tasks/{task_id}", headers=self.headers)
+        after_delete = self.get(after_update.headers["ETag"])
+        self.assertEqual((after_delete.status_code, after_delete.get_json()), (200, []))
+
+    def test_other_users_writes_and_queries_keep_their_own_tags(self):
+        etag = self.get().headers["ETag"]
+        self.create_task("Someone else's task", headers=self.other_headers)
+        self.assertEqual(self.get(etag).status_code, 304)
+        self.assertNotEqual(self.get(etag, self.other_headers).status_code, 304)
+        paged = self.client.get("/tasks/?limit=5", headers={**self.headers, "If-None-Match": etag})
+        self.assertEqual(paged.status_code, 200)
+
+    def test_repeated_reads_are_served_from_the_cache(self):
+        self.get()
+        hits = response_cache.stats()["hits"]
+        self.assertEqual(self.get().status_code, 200)
+        self.assertEqual(response_cache.stats()["hits"], hits + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import helpers  # noqa: F401
+from app.utils import gemini_suggester
+from app.utils.suggestion_cache import SuggestionCache, cache_key, suggestion_cache
+
+
+class SuggestionCacheTest(unittest.TestCase):
+    def test_titles_share_a_key_once_normalized(self):
+        self.assertEqual(cache_key("  Draft   Report!"), cache_key("draft report"))
+        self.assertNotEqual(cache_key("draft report"), cache_key("draft report", namespace="embedding"))
+
+    def test_entries_expire(self):
+        cache = SuggestionCache(ttl=3600)
+        cache.put("a", {"subtasks": ["x"]})
+        cache.put("b", {}, ttl=0)
+        self.assertEqual(cache.get("a"), {"subtasks": ["x"]})
+        self.assertIsNone(cache.get("b"))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = SuggestionCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_disk_tier_is_shared_and_trimmed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.db")
+            writer = SuggestionCache(maxsize=0, db_path=path, db_max_entries=2, trim_interval=0)
+            for key in ("a", "b", "c"):
+                writer.put(key, key.upper())
+            reader = SuggestionCache(db_path=path)
+            self.assertEqual((reader.get("a"), reader.get("b"), reader.get("c")), (None, "B", "C"))
+            self.assertEqual(reader.stats()["disk_hits"], 2)
+
+
+class CombinedSuggestionsTest(unittest.TestCase):
+    def setUp(self):
+        suggestion_cache.clear()
+        self.prompts = []
+
+    def model(self, text):
+        def generate_content(prompt):
+            self.prompts.append(prompt)
+            return SimpleNamespace(text=text)
+        return mock.patch.object(gemini_suggester, "model", SimpleNamespace(generate_content=generate_content))
+
+    def test_one_prompt_per_normalized_title(self):
+        answer = '```json\n{"subtasks": ["outline", "draft", "edit"], "similar_tasks": ["book room"]}\n```'
+        with self.model(answer):
+            first = gemini_suggester.get_combined_suggestions("Write report")
+            again = gemini_suggester.get_combined_suggestions("write  report!")
+        self.assertEqual(first, {"subtasks": ["outline", "draft", "edit"], "similar_tasks": ["book room"]})
+        self.assertEqual(again, first)
+        self.assertEqual(len(self.prompts), 1)
+
+    def test_failures_are_cached_briefly(self):
+        with self.model("not json"):
+            self.assertIsNone(gemini_suggester.get_combined_suggestions("Write report"))
+            self.assertIsNone(gemini_suggester.get_combined_suggestions("Write report"))
+        self.assertEqual(len(self.prompts), 1)
+        self.assertEqual(suggestion_cache.get(cache_key("Write report")), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
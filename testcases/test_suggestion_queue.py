@@ -0,0 +1,44 @@
+import unittest
+from unittest import mock
+
+from helpers import AppTestCase
+from app.utils import suggestion_queue as suggestion_queue_module
+
+
+class SuggestionQueueTest(AppTestCase):
+    config = {"ASYNC_SUGGESTIONS": True, "SUGGESTION_WORKERS": 1}
+
+    def drain(self):
+        self.app.extensions["suggestion_queue"].shutdown(wait=True)
+
+    def suggestions(self, task_id):
+        return self.client.get(f"/tasks/{task_id}/suggestions", headers=self.headers).get_json()
+
+    def test_task_is_created_pending_then_filled_in(self):
+        with mock.patch.object(suggestion_queue_module, "build_suggestions",
+                               return_value=(["draft outline"], ["book a room"])) as build:
+            task = self.create_task("write the quarterly report")
+            self.assertEqual(task["suggestions_status"], "pending")
+            self.drain()
+        build.assert_called_once_with(self.user_id, "write the quarterly report")
+        body = self.suggestions(task["id"])
+        self.assertEqual(body["suggestions_status"], "ready")
+        self.assertEqual(body["suggestions"], ["draft outline"])
+        self.assertEqual(body["complimentary_tasks"], ["book a room"])
+
+    def test_a_failing_job_marks_the_task_failed(self):
+        with mock.patch.object(suggestion_queue_module, "build_suggestions", side_effect=RuntimeError("boom")):
+            task = self.create_task("write the quarterly report")
+            self.drain()
+        self.assertEqual(self.suggestions(task["id"])["suggestions_status"], "failed")
+
+
+class SynchronousSuggestionsTest(AppTestCase):
+    def test_suggestions_are_ready_on_create(self):
+        task = self.create_task("write the quarterly report")
+        self.assertEqual(task["suggestions_status"], "ready")
+        self.assertTrue(task["suggestions"])
+
+
+if __name__ == "__main__":
+    unittest.main()
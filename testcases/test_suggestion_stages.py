@@ -0,0 +1,50 @@
+import time
+import unittest
+from unittest import mock
+
+from helpers import AppTestCase
+from app.utils import suggestion_queue
+from app.utils.local_suggester import get_local_suggestions
+
+COMBINED = {"subtasks": ["outline"], "similar_tasks": ["from gemini"]}
+
+
+def slow(seconds, result):
+    def stage(*args):
+        time.sleep(seconds)
+        return result
+    return stage
+
+
+class BuildSuggestionsTest(AppTestCase):
+    config = {"SUGGESTION_LLM_TIMEOUT": 1.0, "SUGGESTION_SIMILAR_TIMEOUT": 1.0}
+
+    def build(self, combined, similar):
+        with mock.patch.object(suggestion_queue, "get_combined_suggestions", combined), \
+                mock.patch.object(suggestion_queue, "get_similar_tasks", similar):
+            started = time.monotonic()
+            result = suggestion_queue.build_suggestions(self.user_id, "write report")
+            return result, time.monotonic() - started
+
+    def test_stages_run_concurrently(self):
+        (suggestions, similar), elapsed = self.build(slow(0.3, COMBINED), slow(0.3, ["from history"]))
+        self.assertEqual((suggestions, similar), (["outline"], ["from history"]))
+        self.assertLess(elapsed, 0.55)
+
+    def test_a_late_stage_falls_back(self):
+        self.app.config["SUGGESTION_LLM_TIMEOUT"] = 0.1
+        local = get_local_suggestions("write report")  # Loads the local suggester's rules up front
+        (suggestions, similar), elapsed = self.build(slow(0.5, COMBINED), slow(0, []))
+        self.assertEqual(suggestions, local)
+        self.assertIsNone(similar)
+        self.assertLess(elapsed, 0.4)
+
+    def test_a_failing_stage_falls_back_to_the_next_source(self):
+        def broken(*args):
+            raise RuntimeError("index unavailable")
+        (suggestions, similar), _ = self.build(slow(0, COMBINED), broken)
+        self.assertEqual((suggestions, similar), (["outline"], ["from gemini"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import random
+import unittest
+from datetime import datetime
+
+from helpers import AppTestCase
+from app.models import Task
+from app.utils.task_search import search_tasks
+from benchmarks.synthetic import seed_database, task_rows
+
+NOW = datetime(2026, 10, 1, 12, 0)
+
+
+class SyntheticDataTest(AppTestCase):
+    def test_rows_are_reproducible_and_consistent(self):
+        rows = list(task_rows(random.Random(3), [1, 2], 50, now=NOW))
+        self.assertEqual(rows, list(task_rows(random.Random(3), [1, 2], 50, now=NOW)))
+        self.assertEqual(len(rows), 100)
+        for row in rows:
+            self.assertEqual(row["completed_at"] is not None, row["status"] == "completed")
+            self.assertLessEqual(row["created_at"], NOW)
+            if row["due_date"] is None:
+                self.assertEqual(row["priority"], 4)
+
+    def test_seeded_database_is_indexed(self):
+        user_ids = seed_database(users=3, tasks_per_user=20, batch_size=7)
+        self.assertEqual(user_ids[:2], [self.user_id, self.other_user_id])  # Every user gets tasks
+        self.assertEqual(Task.query.count(), 100)
+        title = Task.query.filter_by(user_id=user_ids[-1]).first().title
+        tasks, _ = search_tasks(user_ids[-1], title, per_page=100)
+        self.assertIn(title, [task.title for task in tasks])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from helpers import AppTestCase
+from app import db
+from app.models import TaskTitleIndex
+from app.utils import task_hooks
+
+
+def title_index(user_id):
+    return {row.title_key: row.task_count for row in TaskTitleIndex.query.filter_by(user_id=user_id)}
+
+
+class AfterCommitTest(AppTestCase):
+    def test_callbacks_run_on_commit_only(self):
+        ran = []
+        task_hooks.after_commit(lambda: ran.append("first"))
+        db.session.rollback()
+        task_hooks.after_commit(lambda: ran.append("second"))
+        db.session.commit()
+        self.assertEqual(ran, ["second"])
+
+
+class TitleIndexTest(AppTestCase):
+    def test_index_follows_creates_renames_and_deletes(self):
+        first = self.create_task("Buy milk")
+        self.create_task("buy  MILK")
+        self.assertEqual(title_index(self.user_id), {"buy milk": 2})
+
+        self.client.put(f"/tasks/{first['id']}", json={"title": "Walk dog"}, headers=self.headers)
+        self.assertEqual(title_index(self.user_id), {"buy milk": 1, "walk dog": 1})
+
+        self.client.delete(f"/tasks/{first['id']}", headers=self.headers)
+        self.assertEqual(title_index(self.user_id), {"buy milk": 1})
+
+    def test_bulk_creates_count_each_title_once_per_batch(self):
+        response = self.client.post("/tasks/bulk", json=["Buy milk", "buy milk", "Walk dog"], headers=self.headers)
+        self.assertEqual(response.status_code, 201, response.get_data(as_text=True))
+        self.assertEqual(title_index(self.user_id), {"buy milk": 2, "walk dog": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
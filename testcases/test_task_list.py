@@ -0,0 +1,62 @@
+import unittest
+from datetime import datetime, timedelta
+
+from helpers import AppTestCase
+from app import db
+from app.models import Task
+
+START = datetime(2026, 3, 1, 9, 0)
+
+
+class TaskListTest(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        # Due dates 3, 1, none, 2, none days out; statuses alternate
+        due_days = [3, 1, None, 2, None]
+        self.tasks = [
+            Task(title=f"task {i}", user_id=self.user_id, status="pending" if i % 2 else "completed", priority=4,
+                 created_at=START + timedelta(hours=i),
+                 due_date=START + timedelta(days=days) if days is not None else None)
+            for i, days in enumerate(due_days)
+        ]
+        db.session.add_all(self.tasks)
+        db.session.add(Task(title="not mine", user_id=self.other_user_id, status="pending", created_at=START))
+        db.session.commit()
+        self.ids = [task.id for task in self.tasks]
+
+    def walk(self, query):
+        ids, after = [], None
+        while True:
+            url = f"/tasks/?{query}" + (f"&after={after}" if after else "")
+            response = self.client.get(url, headers=self.headers)
+            self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+            ids += [task["id"] for task in response.get_json()]
+            after = response.headers.get("X-Next-Cursor")
+            if not after:
+                return ids
+
+    def test_pages_cover_every_task_once(self):
+        self.assertEqual(self.walk("limit=2"), self.ids)
+        self.assertEqual(self.walk("limit=2&order=desc"), self.ids[::-1])
+
+    def test_due_date_sort_puts_tasks_without_one_last(self):
+        i = self.ids
+        self.assertEqual(self.walk("limit=2&sort=due_date"), [i[1], i[3], i[0], i[2], i[4]])
+        self.assertEqual(self.walk("limit=2&sort=due_date&order=desc"), [i[0], i[3], i[1], i[4], i[2]])
+
+    def test_filters(self):
+        self.assertEqual(self.walk("status=pending"), [self.ids[1], self.ids[3]])
+        due_before = (START + timedelta(days=2, hours=12)).isoformat()
+        self.assertEqual(self.walk(f"due_before={due_before}"), [self.ids[1], self.ids[3]])
+
+    def test_cursors_are_tied_to_their_sort_order(self):
+        response = self.client.get("/tasks/?limit=1", headers=self.headers)
+        cursor = response.headers["X-Next-Cursor"]
+        response = self.client.get(f"/tasks/?limit=1&sort=due_date&after={cursor}", headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get("/tasks/?after=not-a-cursor", headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from helpers import AppTestCase
+from app.utils import task_search
+
+
+class TaskSearchTest(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        for title in ("Write quarterly report", "Report expenses", "Call the plumber", "Repaint the fence"):
+            self.create_task(title)
+        self.create_task("Write report for bob", headers=self.other_headers)
+
+    def search(self, q, **params):
+        response = self.client.get("/tasks/search", query_string={"q": q, **params}, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return [task["title"] for task in response.get_json()], response.headers.get("X-Next-Page")
+
+    def check_matches(self):
+        titles, _ = self.search("report")
+        self.assertEqual(sorted(titles), ["Report expenses", "Write quarterly report"])
+        self.assertEqual(self.search("write rep")[0], ["Write quarterly report"])  # Last term is a prefix
+        self.assertEqual(sorted(self.search("rep")[0]), ["Repaint the fence", "Report expenses",
+                                                          "Write quarterly report"])
+        self.assertEqual(self.search("\"*( -")[0], [])  # Nothing searchable once FTS operators are dropped
+
+    def test_fts5_index(self):
+        self.assertEqual(task_search.rebuild_index(), 5)
+        self.assertEqual(task_search._backend(task_search.db.session.connection()), "fts5")
+        self.check_matches()
+        task_id = self.create_task("Plumber invoice")["id"]
+        self.client.put(f"/tasks/{task_id}", json={"title": "Pay the electrician"}, headers=self.headers)
+        self.assertEqual(self.search("plumber")[0], ["Call the plumber"])
+        self.assertEqual(self.search("electrician")[0], ["Pay the electrician"])
+
+    def test_like_fallback_without_the_index(self):
+        self.check_matches()
+
+    def test_pages(self):
+        task_search.rebuild_index()
+        titles, next_page = self.search("rep", per_page=2)
+        self.assertEqual((len(titles), next_page), (2, "2"))
+        titles, next_page = self.search("rep", per_page=2, page=2)
+        self.assertEqual((len(titles), next_page), (1, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
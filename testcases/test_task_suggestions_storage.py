@@ -0,0 +1,54 @@
+import os
+import pickle
+import unittest
+
+import sqlalchemy as sa
+from flask_migrate import upgrade
+from sqlalchemy import inspect
+
+from helpers import AppTestCase
+from app import db
+from app.models import Task
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+
+class SuggestionColumnsTest(AppTestCase):
+    def test_lists_round_trip_and_stay_deferred(self):
+        created = self.create_task("plan the offsite")
+        task = db.session.get(Task, created["id"])
+        task.suggestions, task.complimentary_tasks = ["book venue", "send invites"], ["order food"]
+        db.session.commit()
+        db.session.expunge_all()
+
+        listed = Task.query.filter_by(id=created["id"]).one()
+        self.assertTrue({"suggestions", "complimentary_tasks"} <= inspect(listed).unloaded)
+        body = self.client.get(f"/tasks/{created['id']}/suggestions", headers=self.headers).get_json()
+        self.assertEqual(body["suggestions"], ["book venue", "send invites"])
+        self.assertEqual(body["complimentary_tasks"], ["order food"])
+
+
+class PickleMigrationTest(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        db.drop_all()
+        db.session.execute(sa.text("DROP TABLE IF EXISTS alembic_version"))
+        db.session.commit()
+
+    def test_pickled_lists_become_json(self):
+        upgrade(MIGRATIONS, revision="802b304fbe72")
+        db.session.execute(sa.text("INSERT INTO user (id, username, email, password_hash) VALUES (1, 'a', 'a@x', 'x')"))
+        db.session.execute(
+            sa.text("INSERT INTO task (id, title, user_id, suggestions, complimentary_tasks) VALUES (1, 't', 1, :s, :c)"),
+            {"s": pickle.dumps(["step one", "step two"]), "c": None},
+        )
+        db.session.commit()
+
+        upgrade(MIGRATIONS)
+        task = db.session.get(Task, 1)
+        self.assertEqual(task.suggestions, ["step one", "step two"])
+        self.assertIsNone(task.complimentary_tasks)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import unittest
+from unittest import mock
+
+from helpers import AppTestCase
+from app.models import Task
+from app.utils import task_hooks
+
+
+def ndjson(*rows):
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+
+class ImportExportTest(AppTestCase):
+    config = {"IMPORT_BATCH_SIZE": 2}
+
+    def upload(self, body, content_type="application/x-ndjson"):
+        return self.client.post("/tasks/import", data=body, content_type=content_type, headers=self.headers)
+
+    def test_export_round_trips_through_import(self):
+        self.create_task("draft blog post")
+        self.create_task("pay rent")
+        exports = {
+            fmt: self.client.get(f"/tasks/export?format={fmt}", headers=self.headers).get_data(as_text=True)
+            for fmt in ("ndjson", "csv")
+        }
+        for fmt, content_type in (("ndjson", "application/x-ndjson"), ("csv", "text/csv")):
+            response = self.upload(exports[fmt], content_type)
+            self.assertEqual(response.get_json()["imported"], 2, response.get_data(as_text=True))
+        self.assertEqual(Task.query.filter_by(user_id=self.user_id).count(), 6)
+
+    def test_timezone_aware_dates(self):
+        response = self.upload(ndjson({
+            "title": "x", "due_date": "2026-01-01T00:00:00Z", "status": "completed",
+            "completed_at": "2026-01-02T00:00:00",
+        }))
+        self.assertEqual(response.status_code, 201, response.get_data(as_text=True))
+        task = Task.query.filter_by(title="x").one()
+        self.assertIsNone(task.due_date.tzinfo)
+
+    def test_invalid_rows_are_reported_by_line(self):
+        response = self.upload(ndjson({"title": "ok"}) + "not json\n" + ndjson({"status": "pending"}))
+        summary = response.get_json()
+        self.assertEqual((summary["imported"], summary["failed"]), (1, 2))
+        self.assertEqual([error["line"] for error in summary["errors"]], [2, 3])
+
+    def test_a_failing_batch_is_rolled_back_and_reported(self):
+        original = task_hooks.tasks_created
+        calls = []
+
+        def flaky(batch):
+            calls.append(len(batch))
+            if len(calls) == 2:
+                raise RuntimeError("hook failed")
+            original(batch)
+
+        with mock.patch.object(task_hooks, "tasks_created", flaky):
+            response = self.upload(ndjson(*({"title": f"row {i}"} for i in range(5))))
+        summary = response.get_json()
+        self.assertEqual((summary["imported"], summary["failed"]), (3, 2))
+        self.assertEqual(summary["errors"][0]["line"], 3)
+        self.assertEqual(
+            sorted(task.title for task in Task.query.filter_by(user_id=self.user_id)), ["row 0", "row 1", "row 4"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()